@@ -0,0 +1,328 @@
+"""
+HTTP load test with per-endpoint latency percentiles and baseline comparison.
+
+Virtual users log in, then loop over a weighted mix of list, search,
+birthdays, create, update, refresh and login requests until the duration
+elapses. Results are written as JSON and compared against a baseline.
+
+Against a running deployment (local Postgres/Redis via docker-compose),
+given a confirmed user::
+
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 \\
+        --username alice --password secret --users 20 --duration 30
+
+In-process against a throwaway SQLite database and the in-memory cache::
+
+    python -m benchmarks.load_test --users 10 --duration 10 \\
+        --baseline benchmarks/baseline.json
+
+The process exits with status 1 when an endpoint's p95 latency or
+throughput regresses beyond ``--tolerance`` relative to the baseline.
+Baselines depend on the machine; regenerate with ``--write-baseline`` on
+the reference box before comparing.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+SCENARIO_WEIGHTS = {
+    "list": 30,
+    "search": 15,
+    "birthdays": 15,
+    "create": 10,
+    "update": 10,
+    "refresh": 10,
+    "login": 10,
+}
+DEFAULT_PASSWORD = "load-test-password"
+_unique = itertools.count()
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.latencies.append(seconds)
+        if not ok:
+            self.errors += 1
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, username: str, password: str, rng: random.Random):
+        self.client = client
+        self.username = username
+        self.password = password
+        self.rng = rng
+        self.access_token = ""
+        self.refresh_token = ""
+        self.contact_ids: list[int] = []
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/v1/auth/login",
+            data={"username": self.username, "password": self.password},
+        )
+        if response.status_code == 200:
+            tokens = response.json()
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens["refresh_token"]
+        return response
+
+    async def refresh(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": self.refresh_token}
+        )
+        if response.status_code == 200:
+            tokens = response.json()
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens["refresh_token"]
+        return response
+
+    async def list(self) -> httpx.Response:
+        offset = self.rng.choice((0, 0, 0, 10, 50))
+        return await self.client.get(
+            "/api/v1/contacts/", params={"limit": 20, "offset": offset}, headers=self.headers
+        )
+
+    async def search(self) -> httpx.Response:
+        query = self.rng.choice(("an", "Load", "example", "zz"))
+        return await self.client.get(
+            "/api/v1/contacts/search/", params={"query": query}, headers=self.headers
+        )
+
+    async def birthdays(self) -> httpx.Response:
+        return await self.client.get(
+            "/api/v1/contacts/birthdays/", params={"days": 7}, headers=self.headers
+        )
+
+    async def create(self) -> httpx.Response:
+        n = next(_unique)
+        response = await self.client.post(
+            "/api/v1/contacts/",
+            json={
+                "first_name": self.rng.choice(("Anna", "Load", "Ivan", "Olena")),
+                "last_name": f"Contact{n}",
+                "email": f"load-{os.getpid()}-{n}@example.com",
+                "phone": f"+38099{n:07d}"[-13:],
+                "birthday": f"19{self.rng.randint(50, 99)}-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}",
+            },
+            headers=self.headers,
+        )
+        if response.status_code == 201:
+            self.contact_ids.append(response.json()["id"])
+        return response
+
+    async def update(self) -> httpx.Response:
+        if not self.contact_ids:
+            return await self.create()
+        contact_id = self.rng.choice(self.contact_ids)
+        return await self.client.put(
+            f"/api/v1/contacts/{contact_id}",
+            json={"phone": f"+38050{self.rng.randint(0, 9999999):07d}"},
+            headers=self.headers,
+        )
+
+    async def run(self, deadline: float, stats: dict[str, EndpointStats]) -> None:
+        names = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        await self.login()
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, name)()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            stats[name].record(time.perf_counter() - start, ok)
+
+
+def summarize(stats: dict[str, EndpointStats], elapsed: float) -> dict[str, dict]:
+    report = {}
+    for name, endpoint in stats.items():
+        latencies = endpoint.latencies
+        report[name] = {
+            "requests": len(latencies),
+            "errors": endpoint.errors,
+            "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return report
+
+
+def compare(report: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Lists endpoints whose p95 latency or throughput regressed beyond ``tolerance``.
+
+    Args:
+        report: Endpoint summaries from this run.
+        baseline: Endpoint summaries from the baseline file.
+        tolerance: Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        Human-readable regression descriptions; empty when within tolerance.
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = report.get(name)
+        if current is None:
+            regressions.append(f"{name}: missing from this run")
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']} ms > baseline {base['p95_ms']} ms"
+            )
+        if base["rps"] and current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {current['rps']} rps < baseline {base['rps']} rps")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: {current['errors']} errors")
+    return regressions
+
+
+def configure_in_process() -> None:
+    db_path = Path(tempfile.mkdtemp()) / "load_test.db"
+    os.environ["DB_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["CACHE_BACKEND"] = "memory"
+    # SQLite allows one writer; a single pooled connection serializes
+    # transactions instead of failing them with "database is locked"
+    os.environ["DB_POOL_SIZE"] = "1"
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+
+
+async def seed_users(count: int, password: str) -> list[str]:
+    from src.database.db import sessionmanager
+    from src.entity.models import Base, User
+    from src.services.auth import AuthService
+
+    async with sessionmanager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    usernames = [f"load_user_{i}" for i in range(count)]
+    async with sessionmanager.session() as session:
+        hashed_password = AuthService(session)._hash_password(password)
+        session.add_all(
+            User(
+                username=username,
+                email=f"{username}@example.com",
+                hashed_password=hashed_password,
+                confirmed=True,
+            )
+            for username in usernames
+        )
+        await session.commit()
+    return usernames
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        usernames = [args.username] * args.users
+    else:
+        from main import app
+
+        usernames = await seed_users(args.users, args.password)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://loadtest",
+            timeout=30,
+        )
+
+    stats = {name: EndpointStats() for name in SCENARIO_WEIGHTS}
+    rng = random.Random(args.seed)
+    async with client:
+        users = [
+            VirtualUser(client, username, args.password, random.Random(rng.random()))
+            for username in usernames
+        ]
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(user.run(deadline, stats) for user in users))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "config": {
+            "target": args.base_url or "in-process",
+            "users": args.users,
+            "duration_s": args.duration,
+            "seed": args.seed,
+        },
+        "endpoints": summarize(stats, elapsed),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", help="Target server; runs in-process when omitted")
+    parser.add_argument("--username", help="Confirmed user to log in as with --base-url")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--write-baseline", action="store_true", help="Save results to --baseline"
+    )
+    args = parser.parse_args()
+    if args.base_url and not args.username:
+        parser.error("--username is required with --base-url")
+    if not args.base_url:
+        configure_in_process()
+
+    results = asyncio.run(run(args))
+    Path(args.output).write_text(json.dumps(results, indent=2))
+
+    print(f"{'endpoint':<12}{'requests':>10}{'errors':>8}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, row in results["endpoints"].items():
+        print(
+            f"{name:<12}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+
+    if args.baseline and args.write_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results["endpoints"], baseline["endpoints"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Micro-benchmarks for CPU hot paths in auth, response serialization and
+email rendering.
+
+Reports throughput and memory allocated per call for each case::
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter token --min-time 2 --output micro.json
+
+Allocation figures come from ``tracemalloc`` in a separate pass, so
+tracing overhead does not distort the timings. ``alloc/op`` is the peak
+traced memory during one call, ``blocks/op`` the number of memory blocks
+still alive per call afterwards (non-zero means something is retained).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from pydantic import TypeAdapter
+
+from src.entity.models import Contact, User, UserRole
+from src.schemas.contact import ContactResponse
+from src.services.auth import AuthService
+from src.services.email import TEMPLATE_FOLDER
+from src.services.email_templates import TemplateRenderer
+
+PAGE_SIZE = 500
+RENDERS = 10_000
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float
+    us_per_op: float
+    alloc_bytes_per_op: int
+    blocks_per_op: float
+
+
+def run_case(name: str, func: Callable[[], object], min_time: float) -> Result:
+    """
+    Times ``func`` for at least ``min_time`` seconds, then measures its allocations.
+
+    Args:
+        name: Case name used in the report.
+        func: Zero-argument callable performing one operation.
+        min_time: Minimum wall-clock seconds spent in the timed loop.
+
+    Returns:
+        The case's throughput and allocation figures.
+    """
+    func()  # warm caches and lazy imports
+    iterations = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            func()
+        iterations += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time and iterations >= 3:
+            break
+        batch = min(batch * 2, 10000)
+
+    alloc_iterations = max(1, min(iterations, 100))
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func()
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - baseline)
+        before = tracemalloc.take_snapshot()
+        for _ in range(alloc_iterations):
+            func()
+        after = tracemalloc.take_snapshot()
+        retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name=name,
+        ops_per_sec=round(iterations / elapsed, 1),
+        us_per_op=round(elapsed / iterations * 1e6, 2),
+        alloc_bytes_per_op=peak,
+        blocks_per_op=round(max(retained, 0) / alloc_iterations, 2),
+    )
+
+
+def contact_page() -> list[Contact]:
+    user = User(id=1, username="bench", email="bench@example.com", role=UserRole.USER)
+    return [
+        Contact(
+            id=n,
+            first_name=f"First{n}",
+            last_name=f"Last{n}",
+            email=f"contact{n}@example.com",
+            phone=f"+38099{n:07d}",
+            birthday=date(1960 + n % 40, n % 12 + 1, n % 28 + 1),
+            optional_data="Work" if n % 3 == 0 else None,
+            created_at=datetime(2026, 1, 1),
+            updated_at=datetime(2026, 1, 1),
+            user_id=user.id,
+            user=user,
+        )
+        for n in range(PAGE_SIZE)
+    ]
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    auth_service = AuthService(db=None)
+    password = "bench-password"
+    hashed_password = auth_service._hash_password(password)
+    refresh_token = "x" * 43
+    access_token = asyncio.run(auth_service.create_acces_token("bench"))
+    user_dict = {
+        "id": 1,
+        "username": "bench",
+        "email": "bench@example.com",
+        "avatar": "https://www.gravatar.com/avatar/0123456789abcdef",
+        "confirmed": True,
+        "role": UserRole.USER,
+    }
+    cached_user = json.dumps(user_dict)
+    contacts = contact_page()
+    page_adapter = TypeAdapter(list[ContactResponse])
+    # what each send did before: a template lookup through a reloading loader
+    jinja = Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER), autoescape=select_autoescape(["html"])
+    )
+    renderer = TemplateRenderer(TEMPLATE_FOLDER, ["verify_email.html"])
+    recipients = [
+        {"username": f"user{n}", "host": "https://contacts.example.com/", "token": "x" * 120}
+        for n in range(RENDERS)
+    ]
+
+    def create_access_token():
+        coro = auth_service.create_acces_token("bench")
+        try:
+            coro.send(None)
+        except StopIteration as done:
+            return done.value
+
+    return {
+        "hash_token": lambda: auth_service.hash_token(refresh_token),
+        "verify_password": lambda: auth_service._verify_password(password, hashed_password),
+        "create_access_token": create_access_token,
+        "decode_access_token": lambda: auth_service.decode_and_validate_access_token(
+            access_token
+        ),
+        "cached_user_dumps": lambda: json.dumps(user_dict),
+        "cached_user_loads": lambda: User(**json.loads(cached_user)),
+        f"contact_page_validate_{PAGE_SIZE}": lambda: page_adapter.validate_python(
+            contacts, from_attributes=True
+        ),
+        f"contact_page_dump_{PAGE_SIZE}": lambda: page_adapter.dump_json(
+            page_adapter.validate_python(contacts, from_attributes=True)
+        ),
+        f"email_render_jinja_{RENDERS}": lambda: [
+            jinja.get_template("verify_email.html").render(**context)
+            for context in recipients
+        ],
+        f"email_render_compiled_{RENDERS}": lambda: [
+            renderer.render("verify_email.html", context) for context in recipients
+        ],
+        f"email_render_batch_{RENDERS}": lambda: renderer.render_batch(
+            "verify_email.html", recipients
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--filter", default="", help="Run only cases containing this text")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per case")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'case':<30}{'ops/sec':>14}{'us/op':>12}{'alloc/op':>12}{'blocks/op':>11}")
+    for name, func in cases().items():
+        if args.filter not in name:
+            continue
+        result = run_case(name, func, args.min_time)
+        results.append(result)
+        print(
+            f"{name:<30}{result.ops_per_sec:>14,.1f}{result.us_per_op:>12,.2f}"
+            f"{result.alloc_bytes_per_op:>12,}{result.blocks_per_op:>11}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Count connection pool checkouts per request for common endpoints.
+
+Runs the app in-process against a throwaway SQLite database and the
+in-memory cache, so no Postgres or Redis is needed::
+
+    python -m benchmarks.pool_checkouts --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DB_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["CACHE_BACKEND"] = "memory"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+from src.database.db import sessionmanager  # noqa: E402
+from src.entity.models import Base, User, UserRole  # noqa: E402
+from src.routes.v1.users import Limiter  # noqa: E402
+from src.services.auth import AuthService  # noqa: E402
+
+USERNAME = "bench"
+PASSWORD = "bench-password"
+
+
+async def prepare() -> str:
+    async with sessionmanager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmanager.session() as session:
+        auth_service = AuthService(session)
+        session.add(
+            User(
+                username=USERNAME,
+                email="bench@example.com",
+                hashed_password=auth_service._hash_password(PASSWORD),
+                confirmed=True,
+                role=UserRole.ADMIN,
+            )
+        )
+        await session.commit()
+        return await auth_service.create_acces_token(USERNAME)
+
+
+def scenarios(token: str):
+    headers = {"Authorization": f"Bearer {token}"}
+    contact = {
+        "first_name": "Bench",
+        "last_name": "Contact",
+        "phone": "123",
+        "birthday": "1990-01-01",
+    }
+    counter = iter(range(10**9))
+    return {
+        "GET /health/": lambda c: c.get("/api/v1/health/"),
+        "GET /users/me": lambda c: c.get("/api/v1/users/me", headers=headers),
+        "GET /contacts/": lambda c: c.get("/api/v1/contacts/", headers=headers),
+        "GET /contacts/birthdays/": lambda c: c.get(
+            "/api/v1/contacts/birthdays/", headers=headers
+        ),
+        "POST /contacts/": lambda c: c.post(
+            "/api/v1/contacts/",
+            json={**contact, "email": f"bench{next(counter)}@example.com"},
+            headers=headers,
+        ),
+        "PUT /contacts/1": lambda c: c.put(
+            "/api/v1/contacts/1", json={"phone": "456"}, headers=headers
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    token = asyncio.run(prepare())
+    metrics = sessionmanager.pool_metrics
+    # /users/me is rate limited per client address
+    Limiter.enabled = False
+    with TestClient(app) as client:
+        print(f"{'endpoint':<26}{'checkouts/req':>14}{'ms/req':>10}")
+        for name, call in scenarios(token).items():
+            call(client)  # warm the auth cache
+            before = metrics.checkouts
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                response = call(client)
+                assert response.status_code < 400, response.text
+            elapsed = time.perf_counter() - start
+            per_request = (metrics.checkouts - before) / args.requests
+            print(f"{name:<26}{per_request:>14.2f}{elapsed * 1000 / args.requests:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
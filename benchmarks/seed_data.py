@@ -0,0 +1,322 @@
+"""
+Seed a database with a large synthetic dataset for scale testing.
+
+Creates ``--users`` confirmed users, ``--contacts`` contacts per user and
+``--tokens`` refresh tokens per user. Every value is drawn from generators
+seeded with ``--seed``, so two runs with the same arguments and ``--now``
+produce identical rows on any machine::
+
+    python -m benchmarks.seed_data --users 10000 --contacts 100 --tokens 5 \\
+        --seed 1 --now 2026-01-01T00:00:00+00:00
+
+Rows are inserted in batches of ``--batch-size``: with COPY on asyncpg,
+with a single executemany INSERT on other drivers. The target database
+defaults to ``DB_URL`` and its tables must already exist (``alembic
+upgrade head``); pass ``--create-tables`` for a scratch database.
+
+Seeded users are named ``seed<seed>_<n>`` and all share the password
+given with ``--password``, so the load test can log in as them.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import string
+import time
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Iterable, Iterator
+
+import bcrypt
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.entity.models import Base, Contact, RefreshToken, User, UserRole
+
+DEFAULT_PASSWORD = "seed-password"
+
+# Rank-weighted like real name frequencies: the first names are the most common.
+FIRST_NAMES = (
+    "Olena", "Andrii", "Maria", "Oleksandr", "Anna", "Dmytro", "Iryna", "Serhii",
+    "Natalia", "Ivan", "Kateryna", "Mykola", "Tetiana", "Yurii", "Oksana", "Petro",
+    "Sofia", "Taras", "Yulia", "Bohdan", "James", "Mary", "John", "Linda", "Robert",
+    "Emma", "Michael", "Olivia", "David", "Sarah", "Lukas", "Mia", "Jan", "Zofia",
+)
+LAST_NAMES = (
+    "Melnyk", "Shevchenko", "Kovalenko", "Bondarenko", "Boyko", "Tkachenko",
+    "Kravchenko", "Kovalchuk", "Koval", "Oliinyk", "Shevchuk", "Polishchuk",
+    "Tkachuk", "Savchenko", "Bondar", "Marchenko", "Rudenko", "Moroz", "Lysenko",
+    "Petrenko", "Smith", "Johnson", "Brown", "Miller", "Wilson", "Nowak", "Muller",
+    "Schmidt", "Kowalski", "Novak",
+)
+EMAIL_DOMAINS = ("gmail.com", "ukr.net", "i.ua", "outlook.com", "yahoo.com", "example.com")
+EMAIL_DOMAIN_WEIGHTS = (50, 20, 10, 10, 5, 5)
+OPTIONAL_NOTES = ("Work", "Family", "Gym", "University", "Neighbour")
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/126.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) Mobile/15E148",
+    "okhttp/4.12.0",
+)
+BCRYPT_SALT_ALPHABET = "./" + string.ascii_uppercase + string.ascii_lowercase + string.digits
+
+
+def _rank_weights(names: tuple[str, ...]) -> list[float]:
+    return [1 / rank for rank in range(1, len(names) + 1)]
+
+
+FIRST_NAME_WEIGHTS = _rank_weights(FIRST_NAMES)
+LAST_NAME_WEIGHTS = _rank_weights(LAST_NAMES)
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class DatasetGenerator:
+    """
+    Deterministic row generator for users, contacts and refresh tokens.
+
+    Each table draws from its own random stream derived from ``seed``, so
+    changing ``--contacts`` does not change the generated users or tokens.
+
+    Args:
+        seed: Seed for all random streams.
+        now: Reference time for token expiry and contact ages.
+        password: Plain-text password shared by all seeded users.
+    """
+
+    def __init__(self, seed: int, now: datetime, password: str = DEFAULT_PASSWORD):
+        self.seed = seed
+        self.now = now
+        self.password = password
+        self.prefix = f"seed{seed}"
+
+    def _rng(self, stream: str) -> random.Random:
+        return random.Random(f"{self.seed}:{stream}")
+
+    def _hashed_password(self) -> str:
+        rng = self._rng("password")
+        # 22 base64 characters encode 128 bits; the last one carries only two
+        salt = "$2b$12$" + "".join(rng.choices(BCRYPT_SALT_ALPHABET, k=21)) + rng.choice(".Oeu")
+        return bcrypt.hashpw(self.password.encode(), salt.encode()).decode()
+
+    def username(self, n: int) -> str:
+        return f"{self.prefix}_{n}"
+
+    def users(self, count: int) -> Iterator[dict]:
+        rng = self._rng("users")
+        hashed_password = self._hashed_password()
+        for n in range(count):
+            username = self.username(n)
+            yield {
+                "username": username,
+                "email": f"{username}@{rng.choices(EMAIL_DOMAINS, EMAIL_DOMAIN_WEIGHTS)[0]}",
+                "hashed_password": hashed_password,
+                "confirmed": True,
+                # roughly one admin per thousand users
+                "role": UserRole.ADMIN if rng.random() < 0.001 else UserRole.USER,
+            }
+
+    def _birthday(self, rng: random.Random) -> date:
+        # Adult ages cluster around the late thirties; the day of year is uniform.
+        age = min(max(int(rng.gauss(38, 14)), 16), 95)
+        start = date(self.now.year - age, 1, 1)
+        days_in_year = (date(start.year + 1, 1, 1) - start).days
+        return start + timedelta(days=rng.randrange(days_in_year))
+
+    def contacts(self, user_ids: list[int], per_user: int) -> Iterator[dict]:
+        rng = self._rng("contacts")
+        n = 0
+        for user_id in user_ids:
+            for _ in range(per_user):
+                first_name = rng.choices(FIRST_NAMES, FIRST_NAME_WEIGHTS)[0]
+                last_name = rng.choices(LAST_NAMES, LAST_NAME_WEIGHTS)[0]
+                domain = rng.choices(EMAIL_DOMAINS, EMAIL_DOMAIN_WEIGHTS)[0]
+                yield {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    # contact emails are unique across the table
+                    "email": f"{first_name}.{last_name}.{self.prefix}.{n}@{domain}".lower(),
+                    "phone": f"+380{rng.choice((50, 63, 66, 67, 68, 73, 93, 95, 96, 97, 98, 99))}"
+                    f"{rng.randrange(10**7):07d}",
+                    "birthday": self._birthday(rng),
+                    "optional_data": rng.choice(OPTIONAL_NOTES) if rng.random() < 0.3 else None,
+                    "created_at": self.now.replace(tzinfo=None),
+                    "updated_at": self.now.replace(tzinfo=None),
+                    "user_id": user_id,
+                }
+                n += 1
+
+    def refresh_tokens(self, user_ids: list[int], per_user: int) -> Iterator[dict]:
+        """
+        Yields refresh tokens with a mix of states.
+
+        About 30% are active, 50% expired and 20% revoked, matching a table
+        that the cleanup job has not pruned for a while.
+        """
+        rng = self._rng("tokens")
+        for user_id in user_ids:
+            for _ in range(per_user):
+                created_at = self.now - timedelta(seconds=rng.randrange(60 * 86400))
+                state = rng.random()
+                if state < 0.3:
+                    expired_at = self.now + timedelta(seconds=rng.randrange(1, 7 * 86400))
+                else:
+                    expired_at = created_at + timedelta(days=7)
+                    if expired_at > self.now:
+                        expired_at = self.now - timedelta(seconds=rng.randrange(1, 86400))
+                revoked_at = (
+                    created_at + timedelta(seconds=rng.randrange(1, 86400))
+                    if 0.8 <= state
+                    else None
+                )
+                yield {
+                    "user_id": user_id,
+                    "token_hash": hashlib.sha256(rng.randbytes(32)).hexdigest(),
+                    "created_at": created_at,
+                    "expired_at": expired_at,
+                    "revoked_at": revoked_at,
+                    "ip_address": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                    "user_agent": rng.choice(USER_AGENTS),
+                }
+
+
+async def insert_rows(
+    conn: AsyncConnection, model: type[Base], rows: Iterable[dict], batch_size: int
+) -> int:
+    """
+    Inserts rows in batches, using COPY when the driver is asyncpg.
+
+    Args:
+        conn: Connection inside an open transaction.
+        model: Mapped class of the target table.
+        rows: Column-name to value mappings, all with the same keys.
+        batch_size: Rows per COPY or executemany round trip.
+
+    Returns:
+        Number of rows inserted.
+    """
+    table = model.__table__
+    use_copy = conn.dialect.driver == "asyncpg"
+    total = 0
+    for batch in batched(rows, batch_size):
+        if use_copy:
+            columns = list(batch[0])
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                table.name,
+                records=[
+                    tuple(_copy_value(row[column]) for column in columns) for row in batch
+                ],
+                columns=columns,
+            )
+        else:
+            await conn.execute(insert(table), batch)
+        total += len(batch)
+    return total
+
+
+def _copy_value(value):
+    # COPY bypasses SQLAlchemy's Enum type, which stores member names
+    return value.name if isinstance(value, UserRole) else value
+
+
+async def seed(
+    url: str,
+    users: int,
+    contacts_per_user: int,
+    tokens_per_user: int,
+    seed_value: int,
+    now: datetime,
+    password: str = DEFAULT_PASSWORD,
+    batch_size: int = 5000,
+    create_tables: bool = False,
+) -> dict[str, int]:
+    """
+    Seeds the database at ``url`` and returns the number of rows per table.
+
+    Users are inserted first and their ids read back by username, so
+    contacts and tokens reference whatever ids the database assigned.
+    """
+    generator = DatasetGenerator(seed_value, now, password)
+    engine = create_async_engine(url)
+    counts = {}
+    try:
+        async with engine.begin() as conn:
+            if create_tables:
+                await conn.run_sync(Base.metadata.create_all)
+            counts["users"] = await insert_rows(
+                conn, User, generator.users(users), batch_size
+            )
+            user_ids = []
+            for start in range(0, users, batch_size):
+                usernames = [
+                    generator.username(n) for n in range(start, min(start + batch_size, users))
+                ]
+                result = await conn.execute(
+                    select(User.id, User.username).where(User.username.in_(usernames))
+                )
+                ids = {username: user_id for user_id, username in result}
+                user_ids.extend(ids[username] for username in usernames)
+            counts["contacts"] = await insert_rows(
+                conn, Contact, generator.contacts(user_ids, contacts_per_user), batch_size
+            )
+            counts["refresh_tokens"] = await insert_rows(
+                conn,
+                RefreshToken,
+                generator.refresh_tokens(user_ids, tokens_per_user),
+                batch_size,
+            )
+    finally:
+        await engine.dispose()
+    return counts
+
+
+def main() -> None:
+    from src.conf.config import settings
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--db-url", default=settings.DB_URL)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--contacts", type=int, default=100, help="Contacts per user")
+    parser.add_argument("--tokens", type=int, default=5, help="Refresh tokens per user")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--now",
+        type=datetime.fromisoformat,
+        default=datetime.now(timezone.utc),
+        help="Reference time (ISO 8601) for token expiry and ages; pin it for identical rows",
+    )
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--create-tables", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = asyncio.run(
+        seed(
+            args.db_url,
+            args.users,
+            args.contacts,
+            args.tokens,
+            args.seed,
+            args.now,
+            password=args.password,
+            batch_size=args.batch_size,
+            create_tables=args.create_tables,
+        )
+    )
+    elapsed = time.perf_counter() - start
+    for table, count in counts.items():
+        print(f"{table:<16}{count:>12}")
+    print(f"Seeded in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
+import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import text
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi import Request, status
@@ -12,29 +12,98 @@ from src.utils.healthchecker import router as healthchecker_router
 from src.routes.v1.contacts import router as contacts_router
 from src.routes.v1.auth import router as auth_router
 from src.routes.v1.users import router as users_router
+from src.routes.v1.admin import router as admin_router
+from src.routes.metrics import router as metrics_router
+from src.routes.avatars import router as avatars_router
+from src.middleware.body_limit import BodySizeLimitMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.query_stats import QueryStatsMiddleware
+from src.middleware.request_id import RequestIdMiddleware
+from src.middleware.tracing import TracingMiddleware
 from src.database.db import sessionmanager
+from src.repositories.email_job_repository import EmailJobRepository
+from src.repositories.password_reset_token_repository import (
+    PasswordResetTokenRepository,
+)
+from src.repositories.refresh_token_repository import RefreshTokenRepository
+from src.services.avatar import avatar_pipeline
+from src.services.birthday_digest import BirthdayDigestJob
+from src.services.cache import cache_client
+from src.conf.config import settings
+from src.utils.loop_monitor import loop_monitor
+from src.utils.log_config import setup_logging
+from src.utils.tracing import setup_tracing
+from src.utils.metrics import track_job
+
+logger = logging.getLogger("uvicorn.error")
 
 scheduler = AsyncIOScheduler()
 
 
+async def _delete_in_batches(delete_batch, batch_size: int) -> int:
+    # Short batches keep each DELETE's locks brief on large tables
+    deleted = 0
+    while (count := await delete_batch(batch_size)):
+        deleted += count
+        if count < batch_size:
+            break
+    return deleted
+
+
+@track_job("cleanup_expired_tokens")
 async def cleanup_expired_tokens():
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=7)
+    batch_size = settings.TOKEN_CLEANUP_BATCH_SIZE
     async with sessionmanager.session() as db:
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(days=7)
-        stmt = text(
-            "DELETE FROM refresh_tokens WHERE expired_at < now OR revoked_at IS NOT NULL AND revoked_at < :cutoff"
+        refresh_tokens = RefreshTokenRepository(db)
+        reset_tokens = PasswordResetTokenRepository(db)
+        email_jobs = EmailJobRepository(db)
+        deleted = await _delete_in_batches(
+            lambda limit: refresh_tokens.delete_expired(now, cutoff, limit), batch_size
         )
-        await db.execute(stmt, {"now": now, "cutoff": cutoff})
-        await db.commit()
-        print(f"Expire tokens cleaned up [{now.strftime('%Y-%m-%d %H:%M:%S')}]")
+        deleted += await _delete_in_batches(
+            lambda limit: reset_tokens.delete_expired(now, limit), batch_size
+        )
+        purged_jobs = await _delete_in_batches(
+            lambda limit: email_jobs.delete_finished(
+                now - timedelta(days=settings.EMAIL_JOB_RETENTION_DAYS), limit
+            ),
+            batch_size,
+        )
+    logger.info(
+        "Expired tokens cleaned up",
+        extra={"deleted": deleted, "email_jobs_deleted": purged_jobs},
+    )
+
+
+@track_job("birthday_digest")
+async def send_birthday_digests():
+    await BirthdayDigestJob().run()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    log_listener = setup_logging()
+    tracer_provider = setup_tracing()
     scheduler.add_job(cleanup_expired_tokens, trigger="interval", hours=1)
+    scheduler.add_job(
+        send_birthday_digests,
+        trigger="cron",
+        hour=settings.BIRTHDAY_DIGEST_HOUR,
+        timezone=timezone.utc,
+    )
     scheduler.start()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
     yield
+    await loop_monitor.stop()
     scheduler.shutdown()
+    await avatar_pipeline.close()
+    await cache_client.close()
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
+    log_listener.stop()
 
 
 app = FastAPI(
@@ -60,10 +129,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-routes = [healthchecker_router, contacts_router, auth_router, users_router]
+# multipart framing adds a little on top of the file itself
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={"/api/v1/users/avatar": settings.AVATAR_MAX_BYTES + 64 * 1024},
+)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
+routes = [
+    healthchecker_router,
+    contacts_router,
+    auth_router,
+    users_router,
+    admin_router,
+]
 for router in routes:
     app.include_router(router=router, prefix="/api/v1")
+app.include_router(router=metrics_router)
+app.include_router(router=avatars_router)
 
 
 if __name__ == "__main__":
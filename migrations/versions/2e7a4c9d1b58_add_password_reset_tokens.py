@@ -0,0 +1,53 @@
+"""move password reset tokens to a hashed password_reset_tokens table
+
+Revision ID: 2e7a4c9d1b58
+Revises: 9b3e5d7c2f41
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7a4c9d1b58'
+down_revision: Union[str, None] = '9b3e5d7c2f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'password_reset_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expired_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_hash'),
+    )
+    op.create_index(
+        'ix_password_reset_tokens_expired_at',
+        'password_reset_tokens',
+        ['expired_at'],
+        unique=False,
+    )
+    # Outstanding raw tokens are not migrated; users request a new link
+    op.drop_column('users', 'reset_password_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        'users', sa.Column('reset_password_token', sa.String(), nullable=True)
+    )
+    op.drop_index(
+        'ix_password_reset_tokens_expired_at', table_name='password_reset_tokens'
+    )
+    op.drop_table('password_reset_tokens')
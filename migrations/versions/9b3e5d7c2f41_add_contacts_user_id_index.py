@@ -0,0 +1,27 @@
+"""add index on contacts.user_id
+
+Revision ID: 9b3e5d7c2f41
+Revises: 4c1d2e8f9a10
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e5d7c2f41'
+down_revision: Union[str, None] = '4c1d2e8f9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contacts_user_id', 'contacts', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_id', table_name='contacts')
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,11 +11,50 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     DB_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # comma-separated read replica URLs; reads use the primary when empty
+    DB_REPLICA_URLS: str = ""
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    # query diagnostics
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    QUERY_REPEAT_THRESHOLD: int = 3
+    # logging: "json" or "text"; debug records are kept for this share of requests
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01
+    # tracing (OTLP/HTTP); span attributes named in TRACING_SCRUB_KEYS are redacted
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "contacts-api"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_SCRUB_KEYS: str = "email,password,token,secret,authorization,username"
+    # event loop lag monitor (opt-in)
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_LAG_INTERVAL_MS: float = 100.0
+    LOOP_LAG_THRESHOLD_MS: float = 100.0
     # redis
     REDIS_URL: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 0.5
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 0.5
+    REDIS_RETRIES: int = 1
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_TIMEOUT: float = 30.0
+    # cache: "redis" or "memory" (in-process, for single-node deployments)
+    CACHE_BACKEND: Literal["redis", "memory"] = "redis"
+    CACHE_MAX_SIZE: int = 10000
     # jwt
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    RESET_PASSWORD_TOKEN_EXPIRE_MINUTES: int = 60
+    TOKEN_CLEANUP_BATCH_SIZE: int = 1000
     ALGORITHM: str
     SECRET_KEY: str
     # email
@@ -27,12 +68,43 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = True
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    # email queue worker
+    SMTP_POOL_SIZE: int = 2
+    SMTP_TIMEOUT: float = 30.0
+    SMTP_MAX_IDLE_SECONDS: float = 30.0
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_POLL_INTERVAL_SECONDS: float = 2.0
+    EMAIL_MAX_ATTEMPTS: int = 6
+    # sent and failed jobs are purged by the hourly cleanup after this long
+    EMAIL_JOB_RETENTION_DAYS: int = 7
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_LEASE_SECONDS: float = 300.0
+    # public base URL used in links of emails sent outside a request
+    APP_BASE_URL: str = "http://localhost:8000/"
+    # birthday digest job
+    BIRTHDAY_DIGEST_HOUR: int = 8
+    BIRTHDAY_DIGEST_DAYS: int = 7
+    BIRTHDAY_DIGEST_BATCH_SIZE: int = 1000
+    BIRTHDAY_DIGEST_RATE: float = 200.0
 
     # Cloudinary
     CLD_NAME: str
     CLD_API_KEY: int
     CLD_API_SECRET: str
     CLD_URL: str
+    # avatar uploads
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_MAX_PIXELS: int = 40_000_000
+    AVATAR_CONTENT_TYPES: str = "image/jpeg,image/png,image/webp,image/gif"
+    AVATAR_WORKERS: int = 2
+    AVATAR_UPLOAD_TIMEOUT: float = 30.0
+    # pre-generated square sizes in pixels; the largest is the default
+    AVATAR_SIZES: str = "64,128,250"
+    # avatar storage: "cloudinary" or "local" (content-addressed files
+    # under AVATAR_STORAGE_DIR, served at /avatars)
+    STORAGE_BACKEND: Literal["cloudinary", "local"] = "cloudinary"
+    AVATAR_STORAGE_DIR: str = "media/avatars"
 
     class Config:
         env_file = ".env"
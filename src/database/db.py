@@ -1,20 +1,81 @@
 import contextlib
 import logging
+from typing import Any
+
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 
 from src.conf.config import settings
+from src.database.pool import MonitoredAsyncQueuePool, PoolMetrics, instrument_pool
+from src.database.instrumentation import instrument_engine
+from src.utils.metrics import registry
 
 logger = logging.getLogger("uvicorn.error")
 
 
+def pool_options(url: str) -> dict[str, Any]:
+    """
+    Builds connection pool arguments for ``create_async_engine`` from settings.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool,
+    since a queue pool would give each connection its own empty database.
+
+    Args:
+        url: Database URL the engine is created for.
+
+    Returns:
+        Keyword arguments for ``create_async_engine``.
+    """
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite" and db_url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": MonitoredAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self.engine: AsyncEngine | None = create_async_engine(url=url)
+    def __init__(self, url: str, **engine_options: Any):
+        options = pool_options(url)
+        options.update(engine_options)
+        self.engine: AsyncEngine | None = create_async_engine(url=url, **options)
+        # Sessions check out a connection on first execute, not on creation.
+        # Objects stay loaded after commit, so no refresh (and second
+        # checkout) is needed to serialize them.
         self.session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self.engine
+            autoflush=False, autocommit=False, expire_on_commit=False, bind=self.engine
         )
+        self.pool_metrics = PoolMetrics()
+        instrument_pool(self.engine.sync_engine, self.pool_metrics)
+        instrument_engine(self.engine.sync_engine)
+
+    def pool_status(self) -> dict[str, Any]:
+        """
+        Reports the current pool configuration and usage counters.
+
+        Returns:
+            Pool size and overflow settings with live and cumulative metrics.
+        """
+        pool = self.engine.pool
+        status = {"pool_class": type(pool).__name__}
+        if hasattr(pool, "size"):
+            status.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+                timeout=pool.timeout(),
+            )
+        status.update(self.pool_metrics.snapshot())
+        return status
 
     @contextlib.asynccontextmanager
     async def session(self):
@@ -37,6 +98,22 @@ class DatabaseSessionManager:
 
 sessionmanager = DatabaseSessionManager(settings.DB_URL)
 
+registry.gauge(
+    "db_pool_connections_in_use",
+    "Primary database connections currently checked out.",
+    callback=lambda: sessionmanager.pool_metrics.in_use,
+)
+registry.gauge(
+    "db_pool_checkout_timeouts",
+    "Primary database checkouts that timed out waiting for a connection.",
+    callback=lambda: sessionmanager.pool_metrics.timeouts,
+)
+registry.gauge(
+    "db_pool_checkout_wait_seconds_total",
+    "Total time spent waiting for primary database connections.",
+    callback=lambda: sessionmanager.pool_metrics.wait_time_total,
+)
+
 
 async def get_db():
     async with sessionmanager.session() as session:
@@ -0,0 +1,56 @@
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.conf.config import settings
+from src.database.query_stats import current_query_stats, statement_shape
+from src.utils.metrics import db_query_duration
+
+logger = logging.getLogger("uvicorn.error")
+
+OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def statement_operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Times every statement executed on ``engine``.
+
+    Durations go to ``db_query_duration`` and to the current request's
+    ``QueryStats``. Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are
+    logged with their parameters redacted.
+
+    Args:
+        engine: Sync engine (``AsyncEngine.sync_engine``) to listen on.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._query_start_time
+        db_query_duration.observe(duration, operation=statement_operation(statement))
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Query %.2f ms: %s",
+                duration * 1000,
+                statement_shape(statement),
+                extra={"duration_ms": round(duration * 1000, 2)},
+            )
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning(
+                "Slow query %.1f ms: %s [parameters redacted]",
+                duration * 1000,
+                statement_shape(statement),
+            )
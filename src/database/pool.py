@@ -0,0 +1,103 @@
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Counters for connection pool usage.
+
+    Wait time covers the whole checkout, including time spent queueing for
+    a free connection and opening a new one.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+        self.overflow_peak = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_time_total += seconds
+        if seconds > self.wait_time_max:
+            self.wait_time_max = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "timeouts": self.timeouts,
+            "in_use": self.in_use,
+            "in_use_peak": self.in_use_peak,
+            "overflow_peak": self.overflow_peak,
+            "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+            "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            "wait_time_avg_ms": (
+                round(self.wait_time_total * 1000 / self.checkouts, 3)
+                if self.checkouts
+                else 0.0
+            ),
+        }
+
+
+class MonitoredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that times every checkout into ``PoolMetrics``."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self) -> "MonitoredAsyncQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_pool(engine: Engine, metrics: PoolMetrics) -> None:
+    """
+    Attaches ``metrics`` to the engine's pool and subscribes to its events.
+
+    Args:
+        engine: Sync engine (``AsyncEngine.sync_engine``) owning the pool.
+        metrics: Counters to update.
+    """
+    pool = engine.pool
+    if isinstance(pool, MonitoredAsyncQueuePool):
+        pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        metrics.in_use += 1
+        metrics.in_use_peak = max(metrics.in_use_peak, metrics.in_use)
+        overflow = getattr(engine.pool, "overflow", None)
+        if overflow is not None:
+            metrics.overflow_peak = max(metrics.overflow_peak, overflow())
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+        metrics.in_use = max(metrics.in_use - 1, 0)
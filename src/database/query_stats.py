@@ -0,0 +1,58 @@
+import re
+from collections import Counter
+from contextvars import ContextVar
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|\$\d+|:\w+)\s*,)+\s*(?:\?|%s|\$\d+|:\w+)\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalizes a SQL statement so executions differing only in values compare equal.
+
+    Literals become ``?`` and placeholder lists of any length collapse to ``(?)``.
+    The result never contains parameter values, so it is safe to log.
+
+    Args:
+        statement: SQL text as sent to the driver.
+
+    Returns:
+        The normalized statement.
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Queries executed while serving a single request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        Finds statement shapes executed at least ``threshold`` times, the usual N+1 signature.
+
+        Args:
+            threshold: Minimum executions of one shape to report.
+
+        Returns:
+            Mapping of statement shape to execution count.
+        """
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
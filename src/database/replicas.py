@@ -0,0 +1,128 @@
+import contextlib
+import itertools
+import time
+from typing import Callable
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from src.conf.config import settings
+from src.database.db import DatabaseSessionManager
+from src.utils.circuit_breaker import CircuitBreaker
+
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to replicas in round-robin order.
+
+    A user who wrote within the last ``read_your_writes_seconds`` is routed
+    to the primary so they see their own changes. A replica that fails with
+    a connection error is skipped for ``retry_seconds``, after which one
+    trial request is routed to it again. ``choose`` returns ``None`` when
+    the primary should serve the read.
+
+    Args:
+        replicas: Session managers for the replica databases.
+        read_your_writes_seconds: How long reads stay on the primary after a user's write.
+        retry_seconds: How long an unhealthy replica is skipped.
+        clock: Monotonic time source, overridable in tests.
+    """
+
+    def __init__(
+        self,
+        replicas: list[DatabaseSessionManager],
+        read_your_writes_seconds: float = 5.0,
+        retry_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replicas = replicas
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.clock = clock
+        self.breakers = [
+            CircuitBreaker(failure_threshold=1, reset_timeout=retry_seconds, clock=clock)
+            for _ in replicas
+        ]
+        self._counter = itertools.count()
+        self._last_write: dict[int, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def mark_write(self, user_id: int) -> None:
+        now = self.clock()
+        self._last_write[user_id] = now
+        if len(self._last_write) > 10000:
+            cutoff = now - self.read_your_writes_seconds
+            self._last_write = {
+                uid: ts for uid, ts in self._last_write.items() if ts > cutoff
+            }
+
+    def recently_wrote(self, user_id: int | None) -> bool:
+        if user_id is None:
+            return False
+        last_write = self._last_write.get(user_id)
+        if last_write is None:
+            return False
+        if self.clock() - last_write >= self.read_your_writes_seconds:
+            del self._last_write[user_id]
+            return False
+        return True
+
+    def choose(self, user_id: int | None = None) -> int | None:
+        """
+        Picks the replica to serve a read.
+
+        Args:
+            user_id: The reading user, for the read-your-writes window.
+
+        Returns:
+            Index of the chosen replica, or None to read from the primary.
+        """
+        if not self.replicas or self.recently_wrote(user_id):
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self.breakers[index].allow():
+                return index
+        return None
+
+    @contextlib.asynccontextmanager
+    async def session(self, index: int):
+        """
+        Opens a session on a replica, reporting its health to the breaker.
+
+        Only connection errors count as failures. Any other exception
+        raised while the session is open (an ``HTTPException`` from the
+        route, a query error) says nothing about the replica, so it just
+        ends a half-open trial without changing the breaker state.
+        """
+        breaker = self.breakers[index]
+        try:
+            async with self.replicas[index].session() as session:
+                yield session
+        except (OperationalError, InterfaceError, OSError):
+            breaker.record_failure()
+            raise
+        except DBAPIError as e:
+            if e.connection_invalidated:
+                breaker.record_failure()
+            else:
+                breaker.release_trial()
+            raise
+        except BaseException:
+            breaker.release_trial()
+            raise
+        else:
+            breaker.record_success()
+
+
+def parse_replica_urls(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+replica_router = ReplicaRouter(
+    [DatabaseSessionManager(url) for url in parse_replica_urls(settings.DB_REPLICA_URLS)],
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.DB_REPLICA_RETRY_SECONDS,
+)
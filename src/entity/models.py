@@ -8,6 +8,8 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Boolean,
+    Integer,
+    Index,
     Enum as AlcEnum,
 )
 from sqlalchemy.orm import DeclarativeBase
@@ -19,6 +21,12 @@ class UserRole(str, Enum):
     ADMIN = "ADMIN"
 
 
+class EmailJobStatus(str, Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -43,6 +51,8 @@ class Contact(Base):
         "User", back_populates="contacts", lazy="joined"
     )
 
+    __table_args__ = (Index("ix_contacts_user_id", "user_id"),)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -61,7 +71,9 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(
         AlcEnum(UserRole), default=UserRole.USER, nullable=False
     )
-    reset_password_token: Mapped[str] = mapped_column(String, nullable=True)
+    reset_password_tokens: Mapped[list["PasswordResetToken"]] = relationship(
+        "PasswordResetToken", back_populates="user"
+    )
 
 
 class RefreshToken(Base):
@@ -81,3 +93,46 @@ class RefreshToken(Base):
     user_agent: Mapped[str] = mapped_column(Text, nullable=False)
 
     user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
+
+
+class PasswordResetToken(Base):
+    __tablename__ = "password_reset_tokens"
+    __table_args__ = (Index("ix_password_reset_tokens_expired_at", "expired_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # only a hash of the emailed token is kept; it is the lookup key
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+    expired_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    user: Mapped["User"] = relationship("User", back_populates="reset_password_tokens")
+
+
+class EmailJob(Base):
+    __tablename__ = "email_jobs"
+    __table_args__ = (Index("ix_email_jobs_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    context: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    # set while pending so repeated requests update one job; cleared once it finishes
+    dedupe_key: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True)
+    status: Mapped[EmailJobStatus] = mapped_column(
+        AlcEnum(EmailJobStatus), default=EmailJobStatus.PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), nullable=False
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
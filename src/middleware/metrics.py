@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import http_request_duration, http_requests_in_progress
+from src.utils.profiler import sampling_profiler
+
+
+class MetricsMiddleware:
+    """
+    Records request latency per route template and the number of requests in flight.
+
+    Routes are labelled by their template (``/api/v1/contacts/{contact_id}``)
+    rather than the raw path, which keeps label cardinality bounded. While a
+    sampling profile runs, the request task is registered with the profiler
+    so samples can be attributed to the route.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        task = asyncio.current_task() if sampling_profiler.active else None
+        sampling_profiler.track(task, scope)
+        http_requests_in_progress.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_progress.dec(method=method)
+            sampling_profiler.untrack(task)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=method,
+                route=route,
+                status=str(status_code),
+            )
@@ -0,0 +1,55 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.conf.config import settings
+from src.database.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class QueryStatsMiddleware:
+    """
+    Counts SQL statements and DB time per request.
+
+    The totals are reported in a ``Server-Timing`` header. Statement shapes
+    repeated ``QUERY_REPEAT_THRESHOLD`` or more times within one request are
+    logged as likely N+1 queries.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            repeated = stats.repeated(settings.QUERY_REPEAT_THRESHOLD)
+            if repeated:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                for shape, count in repeated.items():
+                    logger.warning(
+                        "Possible N+1 on %s %s: statement executed %d times: %s",
+                        scope["method"],
+                        route,
+                        count,
+                        shape,
+                    )
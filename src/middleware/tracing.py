@@ -0,0 +1,56 @@
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.log_config import request_id_var
+from src.utils.tracing import tracer
+
+
+class TracingMiddleware:
+    """
+    Opens a server span per request and continues incoming W3C trace context.
+
+    Spans are named and labelled by route template, never the raw path,
+    since paths such as ``/confirmed_email/{token}`` carry secrets.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in (b"traceparent", b"tracestate")
+        }
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            method, context=propagate.extract(carrier), kind=SpanKind.SERVER
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if span.is_recording():
+                    route = getattr(scope.get("route"), "path", None)
+                    if route:
+                        span.update_name(f"{method} {route}")
+                        span.set_attribute("http.route", route)
+                    span.set_attribute("http.request.method", method)
+                    span.set_attribute("http.response.status_code", status_code)
+                    request_id = request_id_var.get()
+                    if request_id:
+                        span.set_attribute("request.id", request_id)
+                    if status_code >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
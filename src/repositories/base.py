@@ -4,10 +4,12 @@ from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entity.models import Base
+from src.utils.tracing import traced_class
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+@traced_class
 class BaseRepository:
     def __init__(self, session: AsyncSession, model: Type[ModelType]):
         self.db = session
@@ -25,13 +27,15 @@ class BaseRepository:
 
     async def create(self, instance: ModelType) -> ModelType:
         self.db.add(instance)
-        await self.db.commit()
+        await self.db.flush()
         await self.db.refresh(instance)
+        await self.db.commit()
         return instance
 
     async def update(self, instance: ModelType) -> ModelType:
-        await self.db.commit()
+        await self.db.flush()
         await self.db.refresh(instance)
+        await self.db.commit()
         return instance
 
     async def delete(self, instance: ModelType) -> None:
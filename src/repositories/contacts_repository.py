@@ -1,19 +1,44 @@
+import calendar
 import logging
 
 from datetime import date, timedelta
 
 from typing import Sequence, Optional
 
-from sqlalchemy import select, or_, and_
+from sqlalchemy import Row, select, or_, and_, extract
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entity.models import Contact
 from src.schemas.contact import BaseContact, UpdateContact
 from src.entity.models import User
+from src.utils.tracing import traced_class
 
 logger = logging.getLogger("uvicorn.error")
 
 
+def birthday_window(today: date, days: int) -> dict[int, date]:
+    """
+    Maps ``month * 100 + day`` keys of the next ``days`` days to their dates.
+
+    Outside leap years, February 29 birthdays are celebrated on March 1.
+
+    Args:
+        today: First day of the window.
+        days: Days after ``today`` to include.
+
+    Returns:
+        Birthday key to the date it falls on within the window.
+    """
+    window = {}
+    for offset in range(days + 1):
+        day = today + timedelta(days=offset)
+        window[day.month * 100 + day.day] = day
+        if (day.month, day.day) == (3, 1) and not calendar.isleap(day.year):
+            window[229] = day
+    return window
+
+
+@traced_class
 class ContactsRepository:
     def __init__(self, session: AsyncSession):
         self.db = session
@@ -31,10 +56,11 @@ class ContactsRepository:
         return contact.scalar_one_or_none()
 
     async def create_contact(self, body: BaseContact, user: User) -> Contact:
-        contact = Contact(**body.model_dump(), user=user)
+        contact = Contact(**body.model_dump(), user_id=user.id)
         self.db.add(contact)
-        await self.db.commit()
+        await self.db.flush()
         await self.db.refresh(contact)
+        await self.db.commit()
         return contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Optional[Contact]:
@@ -52,8 +78,9 @@ class ContactsRepository:
             update_data = body.model_dump(exclude_unset=True)
             for key, val in update_data.items():
                 setattr(contact, key, val)
-            await self.db.commit()
+            await self.db.flush()
             await self.db.refresh(contact)
+            await self.db.commit()
         return contact
 
     async def search_contacts(
@@ -87,3 +114,34 @@ class ContactsRepository:
         )
         contacts = await self.db.execute(stmt)
         return contacts.scalars().all()
+
+    async def get_birthdays_for_users(
+        self, user_ids: Sequence[int], today: date, days: int = 7
+    ) -> Sequence[Row]:
+        """
+        Contacts of many users with a birthday in the next ``days`` days.
+
+        One set-based query for a whole batch of users, matching on month
+        and day so the birth year does not matter. Only the columns needed
+        for a digest are loaded.
+
+        Args:
+            user_ids: Owners whose contacts are searched.
+            today: First day of the window.
+            days: Days after ``today`` to include.
+
+        Returns:
+            Rows of ``(user_id, first_name, last_name, birthday)`` ordered by owner.
+        """
+        month_day = extract("month", Contact.birthday) * 100 + extract(
+            "day", Contact.birthday
+        )
+        stmt = (
+            select(Contact.user_id, Contact.first_name, Contact.last_name, Contact.birthday)
+            .where(
+                Contact.user_id.in_(user_ids),
+                month_day.in_(list(birthday_window(today, days))),
+            )
+            .order_by(Contact.user_id, Contact.id)
+        )
+        return (await self.db.execute(stmt)).all()
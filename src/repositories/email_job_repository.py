@@ -0,0 +1,212 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Collection
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entity.models import EmailJob, EmailJobStatus
+from src.repositories.base import BaseRepository
+from src.utils.tracing import traced_class
+
+logger = logging.getLogger("uvicorn.error")
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+@traced_class
+class EmailJobRepository(BaseRepository):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, EmailJob)
+
+    async def enqueue(
+        self,
+        kind: str,
+        recipient: str,
+        context: str,
+        dedupe_key: str | None,
+        now: datetime,
+    ) -> None:
+        """
+        Adds a pending job, or refreshes the due job with the same ``dedupe_key``.
+
+        A single ``INSERT ... ON CONFLICT DO UPDATE`` statement, so concurrent
+        duplicate requests collapse into one job without a read first.
+
+        Args:
+            kind: Email kind, which selects the subject and template.
+            recipient: Destination address.
+            context: JSON-encoded template variables.
+            dedupe_key: Key identifying equivalent pending jobs, or None.
+            now: Time the job becomes due.
+        """
+        await self.enqueue_many(
+            [
+                {
+                    "kind": kind,
+                    "recipient": recipient,
+                    "context": context,
+                    "dedupe_key": dedupe_key,
+                }
+            ],
+            now,
+        )
+
+    async def enqueue_many(
+        self, jobs: list[dict], now: datetime, refresh: bool = True
+    ) -> None:
+        """
+        Adds or refreshes many jobs with one multi-row upsert and one commit.
+
+        Args:
+            jobs: Dicts with ``kind``, ``recipient``, ``context`` and
+                ``dedupe_key`` keys, as for ``enqueue``.
+            now: Time the jobs become due.
+            refresh: Whether a due, unclaimed job with the same ``dedupe_key``
+                takes the new recipient and context and starts over; otherwise,
+                or when that job is claimed or backing off, the new job is
+                dropped in favour of it.
+        """
+        if not jobs:
+            return
+        values = [
+            {
+                **job,
+                "status": EmailJobStatus.PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            }
+            for job in jobs
+        ]
+        insert = _UPSERTS[self.db.get_bind().dialect.name]
+        stmt = insert(EmailJob).values(values)
+        if refresh:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EmailJob.dedupe_key],
+                set_={
+                    "recipient": stmt.excluded.recipient,
+                    "context": stmt.excluded.context,
+                    "next_attempt_at": now,
+                    "attempts": 0,
+                },
+                # A claimed job is already rendered and a job in retry backoff
+                # is not due; rewriting either would lose the new context
+                where=(EmailJob.status == EmailJobStatus.PENDING)
+                & (EmailJob.next_attempt_at <= now),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[EmailJob.dedupe_key])
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def claim_batch(
+        self, limit: int, now: datetime, lease_seconds: float
+    ) -> list[EmailJob]:
+        """
+        Claims up to ``limit`` due jobs for sending.
+
+        Claimed jobs stay pending with ``next_attempt_at`` pushed out by the
+        lease, so jobs held by a worker that dies are retried once it expires.
+        ``SKIP LOCKED`` lets several workers claim disjoint batches.
+
+        Args:
+            limit: Maximum number of jobs.
+            now: Current time.
+            lease_seconds: How long the claim lasts.
+
+        Returns:
+            The claimed jobs, oldest due first.
+        """
+        stmt = (
+            select(EmailJob)
+            .where(
+                EmailJob.status == EmailJobStatus.PENDING,
+                EmailJob.next_attempt_at <= now,
+            )
+            .order_by(EmailJob.next_attempt_at, EmailJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list((await self.db.execute(stmt)).scalars().all())
+        lease_until = now + timedelta(seconds=lease_seconds)
+        for job in jobs:
+            job.next_attempt_at = lease_until
+        await self.db.commit()
+        return jobs
+
+    async def finish_batch(
+        self,
+        sent: list[EmailJob],
+        failed: list[tuple[EmailJob, str]],
+        now: datetime,
+        max_attempts: int,
+        retry_delay,
+        keep_keys_for: Collection[str] = (),
+    ) -> None:
+        """
+        Records the outcome of a claimed batch in one commit.
+
+        Finished jobs release their ``dedupe_key`` so the same email can be
+        queued again, except for kinds in ``keep_keys_for``: those keep it
+        until the row is purged, so a key is delivered at most once.
+
+        Args:
+            sent: Jobs delivered successfully.
+            failed: Jobs that failed, with the error message.
+            now: Current time.
+            max_attempts: Attempts after which a job is marked failed.
+            retry_delay: Callable mapping the attempt count to a delay in seconds.
+            keep_keys_for: Kinds whose dedupe keys outlive the job.
+        """
+        for job in sent:
+            job.status = EmailJobStatus.SENT
+            job.sent_at = now
+            job.attempts += 1
+            if job.kind not in keep_keys_for:
+                job.dedupe_key = None
+            # the context may hold one-time tokens; finished jobs never need it
+            job.context = "{}"
+        for job, error in failed:
+            job.attempts += 1
+            job.last_error = error[:1000]
+            if job.attempts >= max_attempts:
+                job.status = EmailJobStatus.FAILED
+                if job.kind not in keep_keys_for:
+                    job.dedupe_key = None
+                job.context = "{}"
+                logger.error(
+                    "Email job %d (%s) failed permanently after %d attempts: %s",
+                    job.id,
+                    job.kind,
+                    job.attempts,
+                    error,
+                )
+            else:
+                job.next_attempt_at = now + timedelta(seconds=retry_delay(job.attempts))
+        await self.db.commit()
+
+    async def delete_finished(self, before: datetime, limit: int) -> int:
+        """
+        Deletes up to ``limit`` sent or failed jobs created before ``before``.
+
+        Returns:
+            The number of rows deleted.
+        """
+        batch = (
+            select(EmailJob.id)
+            .where(
+                EmailJob.status.in_([EmailJobStatus.SENT, EmailJobStatus.FAILED]),
+                EmailJob.created_at < before,
+            )
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(EmailJob)
+            .where(EmailJob.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
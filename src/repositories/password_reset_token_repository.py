@@ -0,0 +1,79 @@
+from datetime import datetime
+import logging
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.entity.models import PasswordResetToken
+from src.repositories.base import BaseRepository
+from src.utils.tracing import traced_class
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@traced_class
+class PasswordResetTokenRepository(BaseRepository):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, PasswordResetToken)
+
+    async def create_token(
+        self, user_id: int, token_hash: str, expired_at: datetime
+    ) -> None:
+        self.db.add(
+            PasswordResetToken(
+                user_id=user_id, token_hash=token_hash, expired_at=expired_at
+            )
+        )
+        await self.db.commit()
+
+    async def consume(self, token_hash: str, now: datetime) -> int | None:
+        """
+        Marks an unused, unexpired token as used.
+
+        The conditional UPDATE lets only one of several concurrent requests
+        claim a token. It is not committed here, so the caller commits it
+        together with the password change.
+
+        Args:
+            token_hash: Hash of the token from the reset link.
+            now: Current time.
+
+        Returns:
+            The id of the token's user, or None if the token is unknown,
+            expired or already used.
+        """
+        stmt = (
+            update(PasswordResetToken)
+            .where(
+                PasswordResetToken.token_hash == token_hash,
+                PasswordResetToken.used_at.is_(None),
+                PasswordResetToken.expired_at > now,
+            )
+            .values(used_at=now)
+            .returning(PasswordResetToken.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+
+    async def delete_expired(self, now: datetime, limit: int) -> int:
+        """
+        Deletes up to ``limit`` tokens that expired or were used.
+
+        Returns:
+            The number of rows deleted.
+        """
+        batch = (
+            select(PasswordResetToken.id)
+            .where(
+                (PasswordResetToken.expired_at < now)
+                | PasswordResetToken.used_at.is_not(None)
+            )
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(PasswordResetToken)
+            .where(PasswordResetToken.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
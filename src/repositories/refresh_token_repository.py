@@ -1,15 +1,17 @@
 from datetime import datetime
 import logging
 
-from sqlalchemy import select, and_
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entity.models import RefreshToken
 from src.repositories.base import BaseRepository
+from src.utils.tracing import traced_class
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_class
 class RefreshTokenRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(session, RefreshToken)
@@ -52,3 +54,30 @@ class RefreshTokenRepository(BaseRepository):
     async def revoke_token(self, refresh_token: RefreshToken) -> None:
         refresh_token.revoked_at = datetime.now()
         await self.db.commit()
+
+    async def delete_expired(
+        self, now: datetime, revoked_before: datetime, limit: int
+    ) -> int:
+        """
+        Deletes up to ``limit`` expired tokens or tokens revoked before a cutoff.
+
+        Returns:
+            The number of rows deleted.
+        """
+        batch = (
+            select(RefreshToken.id)
+            .where(
+                or_(
+                    RefreshToken.expired_at < now,
+                    RefreshToken.revoked_at < revoked_before,
+                )
+            )
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -1,15 +1,19 @@
 import logging
 
-from sqlalchemy import select
+from typing import Sequence
+
+from sqlalchemy import Row, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entity.models import User
 from src.schemas.user import UserCreate
 from src.repositories.base import BaseRepository
+from src.utils.tracing import traced_class
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_class
 class UserRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(session, User)
@@ -25,42 +29,87 @@ class UserRepository(BaseRepository):
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
+    async def get_confirmed_batch(self, after_id: int, limit: int) -> Sequence[Row]:
+        """
+        Next page of confirmed users by keyset on the primary key.
+
+        Args:
+            after_id: Last id of the previous page, 0 for the first.
+            limit: Page size.
+
+        Returns:
+            Rows of ``(id, username, email)`` ordered by id.
+        """
+        stmt = (
+            select(User.id, User.username, User.email)
+            .where(User.confirmed.is_(True), User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return (await self.db.execute(stmt)).all()
+
     async def create_user(
         self, user_data: UserCreate, hashed_password: str, avatar: str
-    ) -> User | None:
-        user = User(
-            **user_data.model_dump(exclude_unset=True, exclude={"password"}),
-            hashed_password=hashed_password,
-            avatar=avatar
-        )
-        return await self.create(user)
+    ) -> User:
+        """
+        Inserts a user in one ``INSERT ... RETURNING`` statement.
 
-    async def confirmed_email(self, email: str) -> None:
-        user = await self.get_by_email(email)
-        if not user:
-            return
-        user.confirmed = True
+        Raises:
+            IntegrityError: If the username or email is already taken.
+        """
+        stmt = (
+            insert(User)
+            .values(
+                **user_data.model_dump(exclude_unset=True, exclude={"password"}),
+                hashed_password=hashed_password,
+                avatar=avatar,
+            )
+            .returning(User)
+        )
+        user = (await self.db.execute(stmt)).scalar_one()
         await self.db.commit()
-
-    async def update_avatar_url(self, email: str, url: str) -> User:
-        user = await self.get_by_email(email)
-        if user:
-            user.avatar = url
-            await self.db.commit()
-            await self.db.refresh(user)
         return user
 
-    async def change_password(self, email: str, new_hashed_password: str) -> None:
-        user = await self.get_by_email(email)
-        if not user:
-            return
-        user.hashed_password = new_hashed_password
-        user.reset_password_token = None
+    async def _update(self, *criteria, **values) -> Row | None:
+        # One round trip: the WHERE clause decides whether anything changes,
+        # and RETURNING tells the caller who changed.
+        stmt = (
+            update(User)
+            .where(*criteria)
+            .values(**values)
+            .returning(User.id, User.username, User.email)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.db.execute(stmt)).one_or_none()
         await self.db.commit()
+        return row
 
-    async def add_reset_password_token(self, email: str, token: str) -> None:
-        user = await self.get_by_email(email)
-        if not user:
-            return
-        user.reset_password_token = token
-        await self.db.commit()
+    async def confirmed_email(self, email: str) -> Row | None:
+        """
+        Confirms the user's email in one conditional UPDATE.
+
+        Returns:
+            ``(id, username, email)`` of the user, or None when no user has
+            this email or it was already confirmed.
+        """
+        return await self._update(
+            User.email == email, User.confirmed.is_not(True), confirmed=True
+        )
+
+    async def update_avatar_url(self, email: str, url: str) -> Row | None:
+        """
+        Points the user's avatar at ``url``.
+
+        Returns:
+            ``(id, username, email)`` of the updated user, or None.
+        """
+        return await self._update(User.email == email, avatar=url)
+
+    async def change_password(self, user_id: int, new_hashed_password: str) -> Row | None:
+        """
+        Stores a new password hash, committing any pending changes with it.
+
+        Returns:
+            ``(id, username, email)`` of the updated user, or None.
+        """
+        return await self._update(User.id == user_id, hashed_password=new_hashed_password)
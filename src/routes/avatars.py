@@ -0,0 +1,56 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from src.services.avatar import AVATAR_CONTENT_TYPE, avatar_sizes
+from src.services.storage import DIGEST_PATTERN, LocalStorage, StorageBackend
+from src.utils.get_services import get_avatar_storage
+
+router = APIRouter(tags=["avatars"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@router.get("/avatars/{digest}.webp", response_class=FileResponse)
+async def get_avatar(
+    digest: str,
+    request: Request,
+    size: int | None = None,
+    storage: StorageBackend = Depends(get_avatar_storage),
+):
+    """
+    Serve an avatar from the local content-addressed store.
+
+    The URL names the image content, so responses never change and are
+    cacheable forever.
+
+    Args:
+        digest: Content digest from the user's avatar URL.
+        request: Incoming request, for ``If-None-Match``.
+        size: Edge length of one of the pre-generated sizes; the largest by default.
+        storage: Dependency-injected avatar storage.
+
+    Returns:
+        The WebP image, or 304 when the client already has it.
+
+    Raises:
+        HTTPException: 404 for unknown avatars or when avatars are not
+            stored locally, 422 for a size that is not pre-generated.
+    """
+    if not isinstance(storage, LocalStorage) or not DIGEST_PATTERN.match(digest):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Avatar not found")
+    sizes = avatar_sizes()
+    size = size or sizes[-1]
+    if size not in sizes:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Size must be one of {sizes}",
+        )
+    headers = {"Cache-Control": IMMUTABLE, "ETag": f'"{digest}-{size}"'}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    path = storage.path(digest, size)
+    if not await asyncio.to_thread(path.is_file):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Avatar not found")
+    return FileResponse(path, media_type=AVATAR_CONTENT_TYPE, headers=headers)
@@ -0,0 +1,91 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from src.utils.get_services import get_current_admin_user
+from src.services.cache import cache_client
+from src.database.db import sessionmanager
+from src.utils.loop_monitor import loop_monitor
+from src.utils.profiler import ProfilerBusyError, memory_diff, sampling_profiler
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin_user)]
+)
+
+
+@router.get("/cache")
+async def cache_stats():
+    """
+    Report cache backend gauges.
+
+    - Probes the backend, which lets a half-open circuit breaker reconnect.
+    - Returns pool usage and breaker state for the Redis backend.
+    """
+    healthy = await cache_client.ping()
+    return {"healthy": healthy, **cache_client.stats()}
+
+
+@router.get("/db-pool")
+async def db_pool_stats():
+    """
+    Report database connection pool gauges.
+
+    - Pool size, overflow and current checked-out connections.
+    - Cumulative checkouts, timeouts and checkout wait times.
+    """
+    return sessionmanager.pool_status()
+
+
+@router.get("/loop-stalls")
+async def loop_stalls():
+    """
+    Report recent event loop stalls.
+
+    - Empty unless the monitor is enabled with ``LOOP_MONITOR_ENABLED``.
+    - Each stall carries the blocked task and the loop thread's stack.
+    """
+    return {
+        "enabled": loop_monitor.running,
+        "threshold_ms": loop_monitor.threshold * 1000,
+        "stalls": [asdict(report) for report in reversed(loop_monitor.reports)],
+    }
+
+
+@router.post("/profile")
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+):
+    """
+    Sample this worker's stacks for a bounded time.
+
+    - ``collapsed`` returns plain text for flamegraph.pl or speedscope.
+    - ``json`` adds sample counts per route for the event loop thread.
+    - Only one profile runs at a time per worker.
+    """
+    try:
+        result = await sampling_profiler.run(seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if format == "collapsed":
+        return PlainTextResponse(result["collapsed"] + "\n")
+    return result
+
+
+@router.post("/profile/memory")
+async def profile_memory(
+    seconds: float = Query(10.0, gt=0, le=300),
+    limit: int = Query(25, ge=1, le=200),
+):
+    """
+    Diff ``tracemalloc`` snapshots taken ``seconds`` apart.
+
+    - Lists the allocation sites whose memory grew the most.
+    - Tracing slows the worker while the measurement runs.
+    """
+    try:
+        return await memory_diff(seconds, limit)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
@@ -1,18 +1,16 @@
 import logging
 
-from fastapi import APIRouter, Depends, Request, status, BackgroundTasks, HTTPException
+from fastapi import APIRouter, Depends, Request, status, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.utils.get_services import get_auth_service
 from src.services.auth import AuthService, oauth2_scheme
-from src.services.user import UserService
-from src.utils.get_services import get_user_service
+from src.utils.get_services import get_email_queue_service
 from src.schemas.token import TokenResponse, RefreshTokenRequest
 from src.schemas.password import ResetPasswordRequest
 from src.schemas.email import RequestEmail
-from src.utils.reset_password_token import create_reset_password_token
 from src.schemas.user import UserResponse, UserCreate
-from src.services.email import send_email, send_reset_password_email
+from src.services.email import EmailQueueService
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -25,8 +23,8 @@ logger = logging.getLogger("uvicorn.error")
 async def register(
     user_data: UserCreate,
     request: Request,
-    background_tasks: BackgroundTasks,
     auth_service: AuthService = Depends(get_auth_service),
+    email_queue: EmailQueueService = Depends(get_email_queue_service),
 ):
     """
     Register a new user.
@@ -34,15 +32,15 @@ async def register(
     Args:
         user_data: UserCreate object containing user registration details.
         request: FastAPI Request object to access request metadata.
-        background_tasks: BackgroundTasks instance to handle sending email in background.
         auth_service: Dependency-injected AuthService instance.
+        email_queue: Dependency-injected EmailQueueService for the confirmation email.
 
     Returns:
         UserResponse: Registered user data.
     """
     user = await auth_service.register_user(user_data)
-    background_tasks.add_task(
-        send_email, user.email, user.username, str(request.base_url)
+    await email_queue.enqueue_verification_email(
+        user.email, user.username, str(request.base_url)
     )
 
     return user
@@ -66,7 +64,7 @@ async def login(
         TokenResponse: Contains access token, refresh token and token type.
     """
     user = await auth_service.authenticate(form_data.username, form_data.password)
-    access_token = await auth_service.create_acces_token(form_data.username)
+    access_token = await auth_service.create_acces_token(user.username, user.id)
     refresh_token = await auth_service.create_refresh_token(
         user_id=user.id,
         ip_address=request.client.host if request else None,
@@ -95,53 +93,46 @@ async def refresh(
         TokenResponse: New access and refresh tokens.
     """
     user = await auth_service.validate_refresh_token(refresh_token.refresh_token)
-    access_token = await auth_service.create_acces_token(user.username)
-    refresh_token = await auth_service.create_refresh_token(
+    await auth_service.revoke_refresh_token(refresh_token.refresh_token)
+    access_token = await auth_service.create_acces_token(user.username, user.id)
+    new_refresh_token = await auth_service.create_refresh_token(
         user_id=user.id,
         ip_address=request.client.host if request else None,
         user_agent=request.headers.get("user-agent") if request else None,
     )
-
-    await auth_service.revoke_refresh_token(refresh_token)
     return TokenResponse(
-        access_token=access_token, token_type="bearer", refresh_token=refresh_token
+        access_token=access_token, token_type="bearer", refresh_token=new_refresh_token
     )
 
 
 @router.post("/request_reset_password")
 async def request_reset_password(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
-    user_service: UserService = Depends(get_user_service),
+    auth_service: AuthService = Depends(get_auth_service),
+    email_queue: EmailQueueService = Depends(get_email_queue_service),
 ):
     """
     Request password reset email.
 
     Args:
         body: RequestEmail containing the email address of the user.
-        background_tasks: BackgroundTasks instance to handle sending email asynchronously.
         request: FastAPI Request object for building the reset URL.
-        user_service: Dependency-injected UserService instance.
+        auth_service: Dependency-injected AuthService issuing the reset token.
+        email_queue: Dependency-injected EmailQueueService for the reset email.
 
     Returns:
         dict: Message indicating whether the reset email was sent.
     """
-    user = await user_service.get_by_email(body.email)
+    issued = await auth_service.create_reset_password_token(body.email)
 
-    if not user:
+    if not issued:
         return {"message": "Incorrect email"}
 
-    if user:
-        token = create_reset_password_token({"sub": body.email})
-        background_tasks.add_task(
-            send_reset_password_email,
-            user.email,
-            user.username,
-            str(request.base_url),
-            token,
-        )
-        await user_service.add_reset_password_token(body.email, token)
+    user, token = issued
+    await email_queue.enqueue_reset_password_email(
+        user.email, user.username, str(request.base_url), token
+    )
     return {"message": "Check your email address"}
 
 
@@ -162,10 +153,7 @@ async def reset_password(
     Returns:
         dict: Confirmation message after password is successfully changed.
     """
-
-    user = await auth_service.validate_reset_password_token(token)
-
-    await auth_service.change_password(user.email, body.new_password)
+    await auth_service.reset_password(token, body.new_password)
     return {"Message": "Password was changes"}
 
 
@@ -3,7 +3,11 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from src.schemas.contact import BaseContact, UpdateContact,ContactResponse
-from src.utils.get_services import get_contacts_service, get_current_user
+from src.utils.get_services import (
+    get_contacts_service,
+    get_read_contacts_service,
+    get_current_user,
+)
 from src.services.contacts import ContactsService
 from src.entity.models import User
 
@@ -15,7 +19,7 @@ logger = logging.getLogger("uvicorn.error")
 async def get_contacts(
     limit: int = Query(10, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    contacts_service: ContactsService = Depends(get_contacts_service),
+    contacts_service: ContactsService = Depends(get_read_contacts_service),
     user: User = Depends(get_current_user),
 ):
 
@@ -25,7 +29,7 @@ async def get_contacts(
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
-    contacts_service: ContactsService = Depends(get_contacts_service),
+    contacts_service: ContactsService = Depends(get_read_contacts_service),
     user: User = Depends(get_current_user),
 ):
     contact = await contacts_service.ge_contact_by_id(contact_id, user)
@@ -75,7 +79,7 @@ async def search_contacts(
     query: str,
     limit: int = Query(10, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    contacts_service: ContactsService = Depends(get_contacts_service),
+    contacts_service: ContactsService = Depends(get_read_contacts_service),
     user: User = Depends(get_current_user),
 ):
     return await contacts_service.search_contacts(query, limit, offset, user)
@@ -84,7 +88,7 @@ async def search_contacts(
 @router.get("/birthdays/", response_model=list[ContactResponse])
 async def get_upcoming_birthdays(
     days: int = Query(7, ge=1, le=30),
-    contacts_service: ContactsService = Depends(get_contacts_service),
+    contacts_service: ContactsService = Depends(get_read_contacts_service),
     user: User = Depends(get_current_user),
 ):
     return await contacts_service.get_upcoming_birthdays(days, user)
@@ -4,7 +4,6 @@ from fastapi import (
     Request,
     HTTPException,
     status,
-    BackgroundTasks,
     UploadFile,
     File,
 )
@@ -18,14 +17,23 @@ from src.utils.get_services import (
     get_user_service,
     get_current_user,
     get_current_admin_user,
+    get_email_queue_service,
+    get_avatar_pipeline,
+    get_avatar_storage,
 )
 from src.utils.email_token import get_email_from_token
 from src.services.auth import AuthService, oauth2_scheme
 from src.services.user import UserService
 from src.schemas.email import RequestEmail
-from src.services.email import send_email
+from src.services.email import EmailQueueService
 from src.conf.config import settings
-from src.services.upload_file import UploadFileService
+from src.services.avatar import (
+    AvatarPipeline,
+    allowed_content_types,
+    avatar_sizes,
+    read_upload,
+)
+from src.services.storage import StorageBackend
 
 router = APIRouter(prefix="/users", tags=["users"])
 Limiter = Limiter(key_func=get_remote_address)
@@ -37,10 +45,39 @@ Limiter = Limiter(key_func=get_remote_address)
 )
 async def me(
     request: Request,
+    avatar_size: int | None = None,
     token: str = Depends(oauth2_scheme),
     auth_service: AuthService = Depends(get_auth_service),
+    storage: StorageBackend = Depends(get_avatar_storage),
 ):
-    return await auth_service.get_current_user(token)
+    """
+    Current user's profile.
+
+    Args:
+        request: Incoming request, used by the rate limiter.
+        avatar_size: One of ``AVATAR_SIZES``; the avatar URL then points at
+            that pre-generated size instead of the largest.
+        token: Bearer access token.
+        auth_service: Dependency-injected AuthService instance.
+        storage: Dependency-injected avatar storage resolving size variants.
+
+    Returns:
+        The user's profile.
+    """
+    sizes = avatar_sizes()
+    if avatar_size is not None and avatar_size not in sizes:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Avatar size must be one of {sizes}",
+        )
+    user = await auth_service.get_current_user(token)
+    if avatar_size is None or not user.avatar:
+        return user
+    # The user object may be shared with concurrent requests; copy, don't mutate
+    profile = UserResponse.model_validate(user)
+    return profile.model_copy(
+        update={"avatar": storage.variant_url(user.avatar, avatar_size)}
+    )
 
 
 @router.get("/confirmed_email/{token}")
@@ -48,24 +85,23 @@ async def confirmed_email(
     token: str, user_service: UserService = Depends(get_user_service)
 ):
     email = get_email_from_token(token)
-    user = await user_service.get_by_email(email)
+    if await user_service.confirmed_email(email):
+        return {"message": "Your email confirmed"}
 
-    if user is None:
+    # Nothing changed: only now tell an unknown email from a repeat click
+    if await user_service.get_by_email(email) is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Veryfication error"
         )
-    if user.confirmed:
-        return {"message": "Your email has already confirmed"}
-    await user_service.confirmed_email(email)
-    return {"message": "Your email confirmed"}
+    return {"message": "Your email has already confirmed"}
 
 
 @router.post("/request_email")
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     user_service: UserService = Depends(get_user_service),
+    email_queue: EmailQueueService = Depends(get_email_queue_service),
 ):
     user = await user_service.get_by_email(body.email)
 
@@ -73,23 +109,43 @@ async def request_email(
         return {"message": "Your email has already confirmed"}
 
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, str(request.base_url)
+        await email_queue.enqueue_verification_email(
+            user.email, user.username, str(request.base_url)
         )
     return {"message": "Check your email address"}
 
 
-@router.patch("/avatar", response_model=UserResponse)
+@router.patch(
+    "/avatar", response_model=UserResponse, status_code=status.HTTP_202_ACCEPTED
+)
 async def update_avatar_user(
     file: UploadFile = File(),
     user: User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service),
+    pipeline: AvatarPipeline = Depends(get_avatar_pipeline),
     admin=Depends(get_current_admin_user),
 ):
+    """
+    Accepts a new avatar image for the current user.
+
+    The image is validated and resized to each of ``AVATAR_SIZES`` before
+    responding; the upload to storage and the avatar URL update finish in
+    the background.
+
+    Args:
+        file: JPEG, PNG, WebP or GIF image of at most ``AVATAR_MAX_BYTES``.
+        user: The authenticated user.
+        pipeline: Dependency-injected avatar pipeline.
+        admin: Ensures the caller is an admin.
+
+    Returns:
+        The user, still with the previous avatar URL.
 
-    avatar_url = UploadFileService(
-        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    ).upload_file(file, user.username)
-    user = await user_service.update_avatar_url(user.email, avatar_url)
+    Raises:
+        HTTPException: 413 for oversized files, 415 for unsupported types,
+            422 for unreadable images.
+    """
+    data = await read_upload(file, settings.AVATAR_MAX_BYTES, allowed_content_types())
+    avatar = await pipeline.process(data)
+    pipeline.schedule_upload(user, avatar)
     return user
 
@@ -1,35 +1,89 @@
 from datetime import datetime, timedelta, UTC, timezone
 import json
+import logging
 import secrets
+from functools import cached_property
 
 
-import redis.asyncio as redis
 import bcrypt
 import hashlib
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
-from libgravatar import Gravatar
 
 from src.entity.models import User
 from src.schemas.user import UserCreate
 from src.conf.config import settings
+from src.database.replicas import ReplicaRouter
 from src.repositories.user_repository import UserRepository
 from src.repositories.refresh_token_repository import RefreshTokenRepository
-from src.utils.reset_password_token import get_email_from_reset_password_token
+from src.repositories.password_reset_token_repository import (
+    PasswordResetTokenRepository,
+)
+from src.services.cache import cache_client, CacheUnavailableError
+from src.utils.gravatar import gravatar_url
+from src.utils.metrics import auth_cache_requests
+from src.utils.reset_password_token import create_reset_password_token
+from src.utils.single_flight import read_flights
+from src.utils.tracing import traced, traced_class
 
 
+logger = logging.getLogger("uvicorn.error")
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
-redis_client = redis.from_url(settings.REDIS_URL)
 
 
+USER_CONFLICTS = {
+    "username": "User aleready exists",
+    "email": "Email aleready exists",
+}
+
+
+def user_cache_key(username: str) -> str:
+    return f"user:{username}"
+
+
+def unique_violation_detail(error: IntegrityError) -> str | None:
+    """
+    Maps a unique violation on ``users`` to its 409 message.
+
+    PostgreSQL names the violated constraint (``users_email_key``); SQLite
+    only names the column in its message (``users.email``).
+
+    Returns:
+        The message for the violated column, or None for other errors.
+    """
+    cause = getattr(error.orig, "__cause__", None)
+    reason = getattr(cause, "constraint_name", None) or str(error.orig)
+    for column, detail in USER_CONFLICTS.items():
+        if f"users_{column}_key" in reason or f"users.{column}" in reason:
+            return detail
+    return None
+
+
+@traced_class
 class AuthService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, replicas: ReplicaRouter | None = None):
         self.db = db
-        self.user_repository = UserRepository(self.db)
-        self.refresh_token_repository = RefreshTokenRepository(self.db)
+        self.replicas = replicas
+
+    # Repositories are built on first use, so requests served from the
+    # user cache never touch them.
+    @cached_property
+    def user_repository(self) -> UserRepository:
+        return UserRepository(self.db)
 
+    @cached_property
+    def refresh_token_repository(self) -> RefreshTokenRepository:
+        return RefreshTokenRepository(self.db)
+
+    @cached_property
+    def password_reset_token_repository(self) -> PasswordResetTokenRepository:
+        return PasswordResetTokenRepository(self.db)
+
+    @traced("AuthService.hash_password")
     def _hash_password(self, password: str) -> str:
         """
         Hashes a plain-text password using bcrypt.
@@ -44,6 +98,7 @@ class AuthService:
         hashed_password = bcrypt.hashpw(password.encode(), salt)
         return hashed_password.decode()
 
+    @traced("AuthService.verify_password")
     def _verify_password(self, password: str, hashed_password: str) -> bool:
         """
         Verifies a plain-text password against a hashed password.
@@ -116,36 +171,35 @@ class AuthService:
         Raises:
             HTTPException: If username or email is already taken.
         """
-        if await self.user_repository.get_by_username(user_data.username):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail="User aleready exists"
+        hashed_password = self._hash_password(user_data.password)
+        try:
+            # The unique constraints decide, so concurrent signups cannot race
+            return await self.user_repository.create_user(
+                user_data=user_data,
+                hashed_password=hashed_password,
+                avatar=gravatar_url(user_data.email),
             )
-        if await self.user_repository.get_by_email(user_data.email):
+        except IntegrityError as e:
+            await self.db.rollback()
+            detail = unique_violation_detail(e)
+            if detail is None:
+                raise
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail="Email aleready exists"
-            )
-        avatar = None
-        try:
-            g = Gravatar(user_data.email)
-            avatar = g.get_image()
-        except Exception as e:
-            print(e)
-        hashed_password = self._hash_password(user_data.password)
-        user = await self.user_repository.create_user(
-            user_data=user_data, hashed_password=hashed_password, avatar=avatar
-        )
-
-        return user
+                status_code=status.HTTP_409_CONFLICT, detail=detail
+            ) from e
 
     async def create_acces_token(
         self,
         username: str,
+        user_id: int | None = None,
     ) -> str:
         """
         Creates an access token for a user.
 
         Args:
             username: The username of the user.
+            user_id: The user's id, carried as ``uid`` so user lookups can
+                honour the replica read-your-writes window.
 
         Returns:
             A JWT access token as a string.
@@ -154,6 +208,8 @@ class AuthService:
         expire = datetime.now(timezone.utc) + expires_delta
 
         to_encode = {"sub": username, "exp": expire}
+        if user_id is not None:
+            to_encode["uid"] = user_id
         encoded_jwt = jwt.encode(
             to_encode,
             settings.SECRET_KEY,
@@ -200,29 +256,74 @@ class AuthService:
         Raises:
             HTTPException: If the token is invalid, revoked, or user not found.
         """
-        if await redis_client.exists(f"bl:{token}"):
+        payload = self.decode_and_validate_access_token(token)
+        username = payload.get("sub")
+        if username is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        # Keyed by user rather than token, so writes to the user can evict it
+        cache_key = user_cache_key(username)
+        try:
+            # Blacklist check and user lookup share one round trip
+            revoked, cached_user = await cache_client.get_many(
+                [f"bl:{token}", cache_key]
+            )
+        except CacheUnavailableError:
+            revoked = None
+            # Degrade to a JWT-plus-DB check while the cache is unhealthy
+            cached_user = None
+        if revoked:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token revoked"
             )
-
-        cache_key = f"user:{token}"
-        cached_user = await redis_client.get(cache_key)
         if cached_user:
             try:
                 user_dict = json.loads(cached_user)
-                return User(**user_dict)
+                user = User(**user_dict)
+                auth_cache_requests.inc(result="hit")
+                return user
             except (json.JSONDecodeError, TypeError):
                 pass
-        payload = self.decode_and_validate_access_token(token)
-        username = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-
-        user = await self.user_repository.get_by_username(username)
+        auth_cache_requests.inc(result="miss")
+
+        # Parallel requests from one client share a single lookup on a miss.
+        # The flight carries plain data; each caller gets its own transient
+        # User, as on a cache hit, never another request's session-bound row
+        user_dict = await read_flights.do(
+            username,
+            "current_user",
+            (),
+            lambda: self._load_user(username, payload.get("uid"), cache_key),
+        )
+        return User(**user_dict)
+
+    async def _read_user(self, username: str, user_id: int | None) -> User | None:
+        # Tokens without a uid cannot be checked against the write window,
+        # so they read the primary
+        index = None
+        if self.replicas is not None and user_id is not None:
+            index = self.replicas.choose(user_id)
+        if index is not None:
+            try:
+                # Opened only on a cache miss, so routes that never look the
+                # user up never open a replica session
+                async with self.replicas.session(index) as session:
+                    user = await UserRepository(session).get_by_username(username)
+            except (OperationalError, InterfaceError, OSError):
+                # The breaker has recorded the failure; serve this read from the primary
+                user = None
+            if user is not None:
+                return user
+            # The replica may lag behind a fresh registration
+        return await self.user_repository.get_by_username(username)
+
+    async def _load_user(
+        self, username: str, user_id: int | None, cache_key: str
+    ) -> dict:
+        user = await self._read_user(username, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -237,9 +338,25 @@ class AuthService:
             "confirmed": user.confirmed,
             "role": user.role,
         }
-        await redis_client.set(cache_key, json.dumps(user_dict), ex=3600)
+        try:
+            await cache_client.set(cache_key, json.dumps(user_dict), ex=3600)
+        except CacheUnavailableError:
+            pass
 
-        return user
+        return user_dict
+
+    async def invalidate_cached_user(self, username: str) -> None:
+        """
+        Drops the cached copy of a user after their row changed.
+
+        Args:
+            username: The user whose cache entry is evicted.
+        """
+        read_flights.forget(username)
+        try:
+            await cache_client.delete(user_cache_key(username))
+        except CacheUnavailableError:
+            logger.warning("Could not evict cached user %s", username)
 
 
     def decode_and_validate_access_token(self, token: str) -> dict:
@@ -316,60 +433,86 @@ class AuthService:
 
     async def revoke_access_token(self, token: str) -> None:
         """
-        Revokes an access token by adding it to a blacklist in Redis.
+        Revokes an access token by adding it to the cache blacklist.
 
         Args:
             token: The JWT access token.
 
         Returns:
             None
+
+        Raises:
+            HTTPException: If the blacklist is unavailable.
         """
         payload = self.decode_and_validate_access_token(token)
         exp = payload.get("exp")
         if exp:
-            await redis_client.setex(
-                f"bl:{token}", int(exp - datetime.now(timezone.utc).timestamp()), "1"
-            )
+            try:
+                # A token in its last second would give 0, which Redis rejects
+                ttl = max(1, int(exp - datetime.now(timezone.utc).timestamp()))
+                await cache_client.setex(f"bl:{token}", ttl, "1")
+            except CacheUnavailableError:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Token blacklist is unavailable",
+                )
             return None
 
-    async def validate_reset_password_token(self, token: str) -> User:
+    async def create_reset_password_token(self, email: str) -> tuple[User, str] | None:
         """
-        Validates a reset password token and retrieves the user.
+        Issues a single-use password reset token for a user.
 
         Args:
-            token: The reset password token.
+            email: The email of the user requesting the reset.
 
         Returns:
-            The associated User object.
-
-        Raises:
-            HTTPException: If token is invalid or user not found.
+            The user and the token to email them, or None if no user has
+            this email.
         """
-
-        email = get_email_from_reset_password_token(token)
         user = await self.user_repository.get_by_email(email)
-        if not user or user.reset_password_token is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Token wrong"
-            )
-        return user
+        if not user:
+            return None
+        token = create_reset_password_token()
+        expired_at = datetime.now(timezone.utc) + timedelta(
+            minutes=settings.RESET_PASSWORD_TOKEN_EXPIRE_MINUTES
+        )
+        await self.password_reset_token_repository.create_token(
+            user.id, self.hash_token(token), expired_at
+        )
+        return user, token
 
-    async def change_password(self, email: str, new_password: str):
+    async def reset_password(self, token: str, new_password: str) -> None:
         """
-        Changes the password of a user.
+        Changes a user's password with a reset token.
+
+        The token is consumed and the password changed in one transaction,
+        so a token can be used once.
 
         Args:
-            email: The email of the user whose password is to be changed.
+            token: The reset token from the emailed link.
             new_password: The new password in plain-text.
 
         Returns:
             None
 
         Raises:
-            HTTPException: If the user is not found.
+            HTTPException: If the token is unknown, expired or already used.
         """
-        user = await self.user_repository.get_by_email(email)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+        # Hash before claiming the token so the row lock is not held during bcrypt
         hashed_password = self._hash_password(new_password)
-        await self.user_repository.change_password(email, hashed_password)
+        user_id = await self.password_reset_token_repository.consume(
+            self.hash_token(token), datetime.now(timezone.utc)
+        )
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Token wrong"
+            )
+        user = await self.user_repository.change_password(user_id, hashed_password)
+        if user is None:
+            # The user was deleted after the token was issued
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Token wrong"
+            )
+        if self.replicas is not None:
+            self.replicas.mark_write(user.id)
+        await self.invalidate_cached_user(user.username)
@@ -0,0 +1,257 @@
+"""
+Avatar upload pipeline.
+
+The request path only validates and resizes: the upload is read in chunks
+against a byte limit, its declared type and magic bytes are checked, and
+the image is decoded once, cropped to each of ``AVATAR_SIZES`` and
+re-encoded as WebP on a dedicated thread pool (Pillow releases the GIL
+while decoding, resampling and encoding). Pushing the result to storage
+and saving the new URL happen in a background task, so the route answers
+without waiting on the network.
+
+Avatars are keyed by a hash of the uploaded bytes and the size set, so
+storage backends can skip images they already hold.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence
+
+from fastapi import HTTPException, UploadFile, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.entity.models import User
+from src.services.storage import StorageBackend, create_storage_backend
+from src.services.user import UserService
+from src.utils.metrics import avatar_stage_duration, avatar_uploads
+
+logger = logging.getLogger("uvicorn.error")
+
+AVATAR_CONTENT_TYPE = "image/webp"
+CHUNK_SIZE = 64 * 1024
+
+_MAGIC = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    """Detects the image type from its first bytes."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, content_type in _MAGIC:
+        if head.startswith(magic):
+            return content_type
+    return None
+
+
+@dataclass(frozen=True)
+class AvatarImage:
+    digest: str
+    variants: dict[int, bytes]
+
+
+def avatar_sizes() -> list[int]:
+    return sorted(int(size) for size in settings.AVATAR_SIZES.split(",") if size.strip())
+
+
+def allowed_content_types() -> set[str]:
+    return {value.strip() for value in settings.AVATAR_CONTENT_TYPES.split(",") if value.strip()}
+
+
+async def read_upload(file: UploadFile, max_bytes: int, content_types: set[str]) -> bytes:
+    """
+    Reads an uploaded image in chunks, enforcing size and type limits.
+
+    Args:
+        file: The uploaded file.
+        max_bytes: Largest accepted file.
+        content_types: Accepted MIME types.
+
+    Returns:
+        The file content.
+
+    Raises:
+        HTTPException: 413 when the file is too large, 415 when its declared
+            or detected type is not accepted.
+    """
+    if file.content_type not in content_types:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported image type {file.content_type}",
+        )
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Image too large"
+        )
+    buffer = bytearray()
+    while chunk := await file.read(CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Image too large",
+            )
+    if sniff_content_type(buffer[:16]) not in content_types:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="File content is not a supported image",
+        )
+    return bytes(buffer)
+
+
+def resize_avatar(
+    data: bytes, sizes: Sequence[int] | None = None, max_pixels: int | None = None
+) -> dict[int, bytes]:
+    """
+    Center-crops an image to squares of each size, encoded as WebP.
+
+    The source is decoded once; smaller sizes are scaled down from the
+    largest crop. CPU-bound, so run it on the avatar thread pool.
+
+    Args:
+        data: Encoded source image.
+        sizes: Edge lengths in pixels; defaults to ``AVATAR_SIZES``.
+        max_pixels: Largest accepted source resolution.
+
+    Returns:
+        Encoded WebP image by edge length.
+
+    Raises:
+        ValueError: If the data is not a readable image or is too large.
+    """
+    sizes = sorted(sizes or avatar_sizes(), reverse=True)
+    largest = sizes[0]
+    max_pixels = max_pixels or settings.AVATAR_MAX_PIXELS
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > max_pixels:
+                raise ValueError(f"Image exceeds {max_pixels} pixels")
+            # JPEG can decode at a reduced scale directly, which is much cheaper
+            image.draft("RGB", (largest * 2, largest * 2))
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            crop = ImageOps.fit(image, (largest, largest), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValueError(f"Unreadable image: {e}") from e
+    variants = {}
+    for size in sizes:
+        resized = crop if size == largest else crop.resize((size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        resized.save(output, format="WEBP", quality=85, method=4)
+        variants[size] = output.getvalue()
+    return variants
+
+
+def build_avatar(data: bytes, sizes: Sequence[int] | None = None) -> AvatarImage:
+    """
+    Resizes an upload and derives its content address.
+
+    Returns:
+        The variants with a digest of the source bytes and the size set.
+    """
+    variants = resize_avatar(data, sizes)
+    digest = hashlib.sha256(data)
+    digest.update(",".join(map(str, sorted(variants))).encode())
+    return AvatarImage(digest=digest.hexdigest(), variants=variants)
+
+
+class AvatarPipeline:
+    """
+    Resizes avatars on a thread pool and uploads them in the background.
+
+    When a user uploads again before an earlier upload finished, only the
+    latest upload updates their avatar URL.
+
+    Args:
+        storage: Backend the processed images are pushed to.
+        session_factory: Async context manager factory yielding DB sessions
+            for the background URL update.
+        workers: Threads used for image processing.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        session_factory=sessionmanager.session,
+        workers: int = settings.AVATAR_WORKERS,
+    ):
+        self.storage = storage
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avatar")
+        self._tasks: set[asyncio.Task] = set()
+        self._latest: dict[int, asyncio.Task] = {}
+
+    async def process(self, data: bytes) -> AvatarImage:
+        """
+        Resizes an uploaded image off the event loop.
+
+        Raises:
+            HTTPException: 422 when the image cannot be decoded or is too large.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, build_avatar, data)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        finally:
+            avatar_stage_duration.observe(time.perf_counter() - start, stage="resize")
+
+    def schedule_upload(self, user: User, avatar: AvatarImage) -> asyncio.Task:
+        """
+        Starts pushing ``avatar`` to storage and saving its URL for ``user``.
+
+        Returns:
+            The background task; failures are logged, not raised.
+        """
+        task = asyncio.create_task(self._upload(user.id, user.email, avatar))
+        self._tasks.add(task)
+        self._latest[user.id] = task
+        task.add_done_callback(self._forget)
+        return task
+
+    def _forget(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        for user_id, latest in list(self._latest.items()):
+            if latest is task:
+                del self._latest[user_id]
+
+    async def _upload(self, user_id: int, email: str, avatar: AvatarImage) -> None:
+        start = time.perf_counter()
+        try:
+            url = await self.storage.put(avatar.digest, avatar.variants, AVATAR_CONTENT_TYPE)
+            if self._latest.get(user_id) is not asyncio.current_task():
+                avatar_uploads.inc(result="superseded")
+                return
+            async with self.session_factory() as session:
+                await UserService(session).update_avatar_url(email, url)
+            avatar_uploads.inc(result="ok")
+        except Exception:
+            avatar_uploads.inc(result="error")
+            logger.exception("Avatar upload for user %d failed", user_id)
+        finally:
+            avatar_stage_duration.observe(time.perf_counter() - start, stage="upload")
+
+    async def drain(self) -> None:
+        """Waits for the background uploads in flight."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        await self.drain()
+        self.executor.shutdown(wait=True)
+        await self.storage.close()
+
+
+avatar_pipeline = AvatarPipeline(create_storage_backend())
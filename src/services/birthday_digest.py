@@ -0,0 +1,186 @@
+"""
+Daily digest emailing each user their contacts' birthdays in the coming week.
+
+Users are streamed in keyset-ordered batches, so memory and per-query cost
+stay flat however many users there are. Each batch costs three statements:
+the next page of users, one set-based birthday query for all of them, and
+one multi-row insert into the email queue. Inserts are paced by a token
+bucket so a large run does not flood the queue or the database.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Callable, Sequence
+
+from sqlalchemy import Row
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repositories.contacts_repository import ContactsRepository
+from src.repositories.email_job_repository import EmailJobRepository
+from src.repositories.user_repository import UserRepository
+from src.services.email import BIRTHDAY_DIGEST
+from src.utils.metrics import (
+    birthday_digest_batch_duration,
+    birthday_digest_emails,
+    birthday_digest_last_user_id,
+    birthday_digest_users,
+)
+from src.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class DigestRun:
+    users: int = 0
+    emails: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        return self.users / self.seconds if self.seconds else 0.0
+
+
+def digest_jobs(
+    users: Sequence[Row], birthdays: Sequence[Row], today: date, host: str
+) -> list[dict]:
+    """
+    Builds one queued email per user who has upcoming birthdays.
+
+    Args:
+        users: ``(id, username, email)`` rows of the batch.
+        birthdays: ``(user_id, first_name, last_name, birthday)`` rows.
+        today: Day of the run; part of the dedupe key, so a rerun on the
+            same day, or a concurrent run, adds no second digest.
+        host: Base URL for links in the email.
+
+    Returns:
+        Job dicts for ``EmailJobRepository.enqueue_many``.
+    """
+    by_user: dict[int, list[Row]] = {}
+    for row in birthdays:
+        by_user.setdefault(row.user_id, []).append(row)
+    jobs = []
+    for user in users:
+        rows = by_user.get(user.id)
+        if not rows:
+            continue
+        rows.sort(key=lambda row: _next_birthday(row.birthday, today))
+        entries = [
+            {
+                "name": f"{row.first_name} {row.last_name}",
+                "date": _next_birthday(row.birthday, today).strftime("%a %d %b"),
+            }
+            for row in rows
+        ]
+        jobs.append(
+            {
+                "kind": BIRTHDAY_DIGEST,
+                "recipient": user.email,
+                "context": json.dumps(
+                    {"username": user.username, "host": host, "birthdays": entries}
+                ),
+                "dedupe_key": f"{BIRTHDAY_DIGEST}:{user.email}:{today.isoformat()}",
+            }
+        )
+    return jobs
+
+
+def _next_birthday(birthday: date, today: date) -> date:
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = birthday.replace(year=year)
+        except ValueError:  # February 29 outside a leap year
+            candidate = date(year, 3, 1)
+        if candidate >= today:
+            return candidate
+    return candidate
+
+
+class BirthdayDigestJob:
+    """
+    Enqueues the birthday digest for every confirmed user.
+
+    Args:
+        session_factory: Async context manager factory yielding DB sessions.
+        batch_size: Users per batch.
+        days: Days ahead covered by the digest.
+        limiter: Paces enqueued emails; defaults to ``BIRTHDAY_DIGEST_RATE`` per second.
+        clock: Returns the current UTC time, overridable in tests.
+    """
+
+    def __init__(
+        self,
+        session_factory=sessionmanager.session,
+        batch_size: int = settings.BIRTHDAY_DIGEST_BATCH_SIZE,
+        days: int = settings.BIRTHDAY_DIGEST_DAYS,
+        limiter: RateLimiter | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.days = days
+        self.limiter = limiter or RateLimiter(settings.BIRTHDAY_DIGEST_RATE)
+        self.clock = clock
+
+    async def run(self, today: date | None = None) -> DigestRun:
+        """
+        Processes all users once.
+
+        Args:
+            today: First day of the digest window; defaults to the current UTC date.
+
+        Returns:
+            Counts and duration of the run.
+        """
+        today = today or self.clock().date()
+        run = DigestRun()
+        start = time.perf_counter()
+        after_id = 0
+        while True:
+            batch_start = time.perf_counter()
+            async with self.session_factory() as session:
+                users = await UserRepository(session).get_confirmed_batch(
+                    after_id, self.batch_size
+                )
+                if not users:
+                    break
+                birthdays = await ContactsRepository(session).get_birthdays_for_users(
+                    [user.id for user in users], today, self.days
+                )
+            jobs = digest_jobs(users, birthdays, today, settings.APP_BASE_URL)
+            if jobs:
+                # paced outside the read session so no connection is held while waiting
+                await self.limiter.acquire(len(jobs))
+                async with self.session_factory() as session:
+                    # a digest already queued or sent today is kept, so reruns
+                    # and concurrent runs add nothing
+                    await EmailJobRepository(session).enqueue_many(
+                        jobs, self.clock(), refresh=False
+                    )
+
+            after_id = users[-1].id
+            run.users += len(users)
+            run.emails += len(jobs)
+            run.batches += 1
+            birthday_digest_users.inc(len(users))
+            birthday_digest_emails.inc(len(jobs))
+            birthday_digest_last_user_id.set(after_id)
+            birthday_digest_batch_duration.observe(time.perf_counter() - batch_start)
+
+        run.seconds = time.perf_counter() - start
+        logger.info(
+            "Birthday digest enqueued",
+            extra={
+                "users": run.users,
+                "emails": run.emails,
+                "batches": run.batches,
+                "users_per_second": round(run.users_per_second, 1),
+            },
+        )
+        return run
@@ -0,0 +1,281 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable
+
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, RedisError, TimeoutError
+
+from src.conf.config import settings
+from src.utils.circuit_breaker import BreakerState, CircuitBreaker
+from src.utils.metrics import cache_call_duration, registry
+from src.utils.tracing import tracer
+
+
+class CacheUnavailableError(Exception):
+    """Raised when the cache backend cannot serve a call."""
+
+
+class CacheBackend(ABC):
+    """
+    Key-value store used for the auth user cache and the access token blacklist.
+
+    Method names and signatures mirror the subset of the Redis client the
+    application relies on, so backends are interchangeable.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | str | None: ...
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> list[bytes | str | None]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ex: int | None = None) -> None: ...
+
+    @abstractmethod
+    async def setex(self, key: str, time: int, value: str) -> None: ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    async def ping(self) -> bool:
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis-backed cache guarded by a circuit breaker.
+
+    Connection, timeout and protocol errors are counted by the breaker and
+    surfaced as ``CacheUnavailableError``. While the breaker is open, calls
+    fail immediately without touching the network, so callers can fall back
+    to the database.
+
+    Args:
+        client: Configured asyncio Redis client.
+        breaker: Circuit breaker shared by all calls on this client.
+    """
+
+    def __init__(self, client: redis.Redis, breaker: CircuitBreaker | None = None):
+        self.client = client
+        self.breaker = breaker or CircuitBreaker()
+
+    async def _call(self, method: str, *args, **kwargs):
+        if not self.breaker.allow():
+            raise CacheUnavailableError("Redis circuit breaker is open")
+        start = time.perf_counter()
+        try:
+            with tracer.start_as_current_span(
+                f"redis {method}",
+                attributes={"db.system": "redis", "db.operation": method},
+            ):
+                result = await getattr(self.client, method)(*args, **kwargs)
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self.breaker.record_failure()
+            raise CacheUnavailableError(str(e)) from e
+        except BaseException:
+            # Cancellation or a non-Redis error says nothing about Redis health,
+            # but must still end a half-open trial
+            self.breaker.release_trial()
+            raise
+        finally:
+            cache_call_duration.observe(
+                time.perf_counter() - start, backend="redis", command=method
+            )
+        self.breaker.record_success()
+        return result
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._call("get", key)
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return await self._call("mget", keys)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        await self._call("set", key, value, ex=ex)
+
+    async def setex(self, key: str, time: int, value: str) -> None:
+        await self._call("setex", key, time, value)
+
+    async def exists(self, key: str) -> bool:
+        return bool(await self._call("exists", key))
+
+    async def delete(self, key: str) -> None:
+        await self._call("delete", key)
+
+    async def ping(self) -> bool:
+        """
+        Probes Redis through the breaker, letting a trial call reconnect once half-open.
+
+        Returns:
+            True if Redis answered, False otherwise.
+        """
+        try:
+            return bool(await self._call("ping"))
+        except CacheUnavailableError:
+            return False
+
+    def stats(self) -> dict[str, Any]:
+        pool = self.client.connection_pool
+        state = self.breaker.state
+        return {
+            "backend": type(self).__name__,
+            "pool_max_connections": pool.max_connections,
+            "pool_in_use": len(getattr(pool, "_in_use_connections", ())),
+            "pool_available": len(getattr(pool, "_available_connections", ())),
+            "breaker_state": state.value,
+            "breaker_open": int(state != BreakerState.CLOSED),
+            "breaker_failures": self.breaker.failures,
+        }
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class InMemoryCache(CacheBackend):
+    """
+    In-process cache with per-key TTL and least-recently-used eviction.
+
+    Intended for single-process deployments and the test suite, where a
+    network round trip to Redis is not wanted. Keys under ``pinned_prefixes``
+    (token revocations by default) are never evicted, only expired, so a
+    burst of cached users cannot un-revoke a token.
+
+    Args:
+        max_size: Maximum number of keys kept before the least recently used is evicted.
+        clock: Monotonic time source, overridable in tests.
+        pinned_prefixes: Key prefixes exempt from LRU eviction.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+        pinned_prefixes: tuple[str, ...] = ("bl:",),
+    ):
+        self.max_size = max_size
+        self.clock = clock
+        self.pinned_prefixes = pinned_prefixes
+        self._data: OrderedDict[str, tuple[str, float | None]] = OrderedDict()
+        self._pinned: dict[str, tuple[str, float | None]] = {}
+
+    def _lookup(self, key: str) -> str | None:
+        pinned = key.startswith(self.pinned_prefixes)
+        entries = self._pinned if pinned else self._data
+        item = entries.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= self.clock():
+            del entries[key]
+            return None
+        if not pinned:
+            self._data.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: str, ttl: int | None) -> None:
+        if ttl is not None and ttl <= 0:
+            # Same contract as Redis, which rejects a non-positive expire time
+            raise ValueError(f"invalid expire time {ttl} for {key!r}")
+        expires_at = self.clock() + ttl if ttl is not None else None
+        if key.startswith(self.pinned_prefixes):
+            self._pinned[key] = (value, expires_at)
+            if len(self._pinned) > self.max_size:
+                self._purge_expired_pinned()
+            return
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def _purge_expired_pinned(self) -> None:
+        now = self.clock()
+        self._pinned = {
+            key: item
+            for key, item in self._pinned.items()
+            if item[1] is None or item[1] > now
+        }
+
+    async def get(self, key: str) -> str | None:
+        return self._lookup(key)
+
+    async def get_many(self, keys: list[str]) -> list[str | None]:
+        return [self._lookup(key) for key in keys]
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self._store(key, value, ex)
+
+    async def setex(self, key: str, time: int, value: str) -> None:
+        self._store(key, value, time)
+
+    async def exists(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+        self._pinned.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "size": len(self._data),
+            "pinned": len(self._pinned),
+            "max_size": self.max_size,
+        }
+
+    async def close(self) -> None:
+        self._data.clear()
+        self._pinned.clear()
+
+
+def create_cache_backend() -> CacheBackend:
+    """
+    Builds the cache backend selected by ``settings.CACHE_BACKEND``.
+
+    Returns:
+        An ``InMemoryCache`` for ``"memory"``, otherwise a ``RedisCache``.
+    """
+    if settings.CACHE_BACKEND == "memory":
+        return InMemoryCache(max_size=settings.CACHE_MAX_SIZE)
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        retry=Retry(ExponentialBackoff(cap=0.5), settings.REDIS_RETRIES),
+        retry_on_error=[ConnectionError, TimeoutError],
+    )
+    breaker = CircuitBreaker(
+        failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.REDIS_BREAKER_RESET_TIMEOUT,
+    )
+    return RedisCache(redis.Redis(connection_pool=pool), breaker=breaker)
+
+
+cache_client = create_cache_backend()
+
+registry.gauge(
+    "cache_pool_connections_in_use",
+    "Redis connections currently checked out.",
+    callback=lambda: cache_client.stats().get("pool_in_use", 0),
+)
+registry.gauge(
+    "cache_breaker_open",
+    "1 while the Redis circuit breaker is open or half-open, 0 when closed.",
+    callback=lambda: cache_client.stats().get("breaker_open", 0),
+)
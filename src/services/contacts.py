@@ -1,28 +1,56 @@
+from typing import Awaitable, Sequence
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.repositories.contacts_repository import ContactsRepository
+from src.database.replicas import replica_router
+from src.utils.single_flight import read_flights
+
+from src.schemas.contact import BaseContact, ContactResponse, UpdateContact
+from src.entity.models import Contact, User
+from src.utils.tracing import traced_class
+
 
-from src.schemas.contact import BaseContact, UpdateContact
-from src.entity.models import User
+async def _detached(read: Awaitable[Sequence[Contact]]) -> list[ContactResponse]:
+    # Shared reads must not hand one request's ORM instances, bound to its
+    # session, to other requests
+    return [ContactResponse.model_validate(contact) for contact in await read]
 
 
+@traced_class
 class ContactsService:
     def __init__(self, db: AsyncSession):
         self.contacts_repository = ContactsRepository(db)
 
     async def create_contact(self, body: BaseContact, user: User):
-        return await self.contacts_repository.create_contact(body, user)
+        contact = await self.contacts_repository.create_contact(body, user)
+        replica_router.mark_write(user.id)
+        read_flights.forget(user.id)
+        return contact
 
     async def get_contacts(self, limit: int, offset: int, user: User):
-        return await self.contacts_repository.get_contacts(limit, offset, user)
+        # Identical reads in flight for this user share one query
+        contacts = await read_flights.do(
+            user.id,
+            "contacts",
+            (limit, offset),
+            lambda: _detached(self.contacts_repository.get_contacts(limit, offset, user)),
+        )
+        return [contact.model_copy() for contact in contacts]
 
     async def ge_contact_by_id(self, contact_id: int, user: User):
         return await self.contacts_repository.get_contact_by_id(contact_id, user)
 
     async def update_contact(self, contact_id: int, body: UpdateContact, user: User):
-        return await self.contacts_repository.update_contact(contact_id, body, user)
+        contact = await self.contacts_repository.update_contact(contact_id, body, user)
+        replica_router.mark_write(user.id)
+        read_flights.forget(user.id)
+        return contact
 
     async def remove_contact(self, contact_id: int, user: User):
-        return await self.contacts_repository.remove_contact(contact_id, user)
+        contact = await self.contacts_repository.remove_contact(contact_id, user)
+        replica_router.mark_write(user.id)
+        read_flights.forget(user.id)
+        return contact
 
     async def search_contacts(self, query: str, limit: int, offset: int, user: User):
         return await self.contacts_repository.search_contacts(
@@ -30,4 +58,10 @@ class ContactsService:
         )
 
     async def get_upcoming_birthdays(self, days: int, user: User):
-        return await self.contacts_repository.get_upcoming_birthdays(days, user)
+        contacts = await read_flights.do(
+            user.id,
+            "birthdays",
+            (days,),
+            lambda: _detached(self.contacts_repository.get_upcoming_birthdays(days, user)),
+        )
+        return [contact.model_copy() for contact in contacts]
@@ -1,61 +1,112 @@
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import formataddr
+from functools import cached_property
 from pathlib import Path
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
-from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.conf.config import settings
+from src.repositories.email_job_repository import EmailJobRepository
+from src.services.email_templates import TemplateRenderer
 from src.utils.email_token import create_email_token
+from src.utils.tracing import traced_class
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS,
-    TEMPLATE_FOLDER=Path(__file__).parent.parent / "templates",
+logger = logging.getLogger("uvicorn.error")
+
+TEMPLATE_FOLDER = Path(__file__).parent.parent / "templates"
+
+VERIFY_EMAIL = "verify_email"
+RESET_PASSWORD = "reset_password"
+BIRTHDAY_DIGEST = "birthday_digest"
+
+
+@dataclass(frozen=True)
+class EmailKind:
+    subject: str
+    template: str
+    # the dedupe key outlives delivery, so a key is sent at most once
+    once_per_key: bool = False
+
+
+EMAIL_KINDS = {
+    VERIFY_EMAIL: EmailKind(subject="Confirm your email", template="verify_email.html"),
+    RESET_PASSWORD: EmailKind(subject="Reset password", template="reset_password.html"),
+    BIRTHDAY_DIGEST: EmailKind(
+        subject="Upcoming birthdays", template="birthday_digest.html", once_per_key=True
+    ),
+}
+
+ONCE_PER_KEY_KINDS = frozenset(
+    kind for kind, email_kind in EMAIL_KINDS.items() if email_kind.once_per_key
 )
 
+templates = TemplateRenderer(
+    TEMPLATE_FOLDER, [email_kind.template for email_kind in EMAIL_KINDS.values()]
+)
 
-async def send_email(email: EmailStr, username: str, host: str):
-    try:
-        token_verification = create_email_token({"sub": email})
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
-        )
 
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        print(err)
-
-
-async def send_reset_password_email(email: EmailStr, username: str, host: str,token:str):
-    try:
-        message = MessageSchema(
-            subject="Reset password",
-            recipients=[email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token,
-            },
-            subtype=MessageType.html,
+def build_message(kind: str, recipient: str, context: dict) -> EmailMessage:
+    """
+    Renders a queued email into a MIME message.
+
+    Verification tokens are minted here, at send time, so a job that waits
+    in the queue still carries a token with its full lifetime.
+
+    Args:
+        kind: One of ``EMAIL_KINDS``.
+        recipient: Destination address.
+        context: Template variables stored with the job.
+
+    Returns:
+        The message, ready for ``SMTP.send_message``.
+    """
+    email_kind = EMAIL_KINDS[kind]
+    if kind == VERIFY_EMAIL:
+        context = {**context, "token": create_email_token({"sub": recipient})}
+    message = EmailMessage()
+    message["Subject"] = email_kind.subject
+    message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    message["To"] = recipient
+    message.set_content(templates.render(email_kind.template, context), subtype="html")
+    return message
+
+
+@traced_class
+class EmailQueueService:
+    """
+    Queues outbound emails in the ``email_jobs`` table for the email worker.
+
+    Repeated requests for the same email to the same address while one is
+    still pending update that job instead of queueing another.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @cached_property
+    def email_job_repository(self) -> EmailJobRepository:
+        return EmailJobRepository(self.db)
+
+    async def enqueue_verification_email(self, email: str, username: str, host: str) -> None:
+        await self.email_job_repository.enqueue(
+            kind=VERIFY_EMAIL,
+            recipient=email,
+            context=json.dumps({"username": username, "host": host}),
+            dedupe_key=f"{VERIFY_EMAIL}:{email}",
+            now=datetime.now(timezone.utc),
         )
 
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="reset_password.html")
-    except ConnectionErrors as err:
-        print(err)
+    async def enqueue_reset_password_email(
+        self, email: str, username: str, host: str, token: str
+    ) -> None:
+        await self.email_job_repository.enqueue(
+            kind=RESET_PASSWORD,
+            recipient=email,
+            context=json.dumps({"username": username, "host": host, "token": token}),
+            dedupe_key=f"{RESET_PASSWORD}:{email}",
+            now=datetime.now(timezone.utc),
+        )
@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from jinja2 import Environment, FileSystemLoader, Template, nodes, select_autoescape
+from markupsafe import escape
+
+
+class CompiledTemplate:
+    """
+    An email template compiled once and rendered without per-call lookups.
+
+    Templates that are plain HTML with ``{{ name }}`` placeholders, which is
+    what the email templates are, are split into their static text and the
+    variable names between them. Rendering then only escapes the variables
+    and joins the pieces, skipping Jinja's context and runtime machinery.
+    Templates using any other syntax are rendered by Jinja as usual.
+
+    Args:
+        environment: Environment the template is loaded from.
+        name: Template file name.
+    """
+
+    def __init__(self, environment: Environment, name: str):
+        self.name = name
+        self.template: Template = environment.get_template(name)
+        source, _, _ = environment.loader.get_source(environment, name)
+        self.parts = _split_placeholders(environment.parse(source))
+
+    def render(self, context: Mapping[str, object]) -> str:
+        if self.parts is None:
+            return self.template.render(context)
+        static, names = self.parts
+        pieces = [static[0]]
+        for name, text in zip(names, static[1:]):
+            # a missing variable renders empty, like Jinja's default Undefined
+            if name in context:
+                pieces.append(escape(context[name]))
+            pieces.append(text)
+        return "".join(pieces)
+
+
+def _split_placeholders(
+    template: nodes.Template,
+) -> tuple[list[str], list[str]] | None:
+    """
+    Splits a parsed template into static text and placeholder names.
+
+    Returns:
+        ``(static, names)`` with ``len(static) == len(names) + 1``, or None
+        when the template uses anything besides text and bare variables.
+    """
+    static = [""]
+    names = []
+    for node in template.body:
+        if not isinstance(node, nodes.Output):
+            return None
+        for child in node.nodes:
+            if isinstance(child, nodes.TemplateData):
+                static[-1] += child.data
+            elif isinstance(child, nodes.Name) and child.ctx == "load":
+                names.append(child.name)
+                static.append("")
+            else:
+                return None
+    return static, names
+
+
+class TemplateRenderer:
+    """
+    Renders the email templates from a folder, compiled once up front.
+
+    Args:
+        folder: Directory holding the templates.
+        names: Templates to compile eagerly; others compile on first use.
+    """
+
+    def __init__(self, folder: Path, names: Iterable[str] = ()):
+        # templates are read once; edits need a restart, as for code
+        self.environment = Environment(
+            loader=FileSystemLoader(folder),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        self._compiled: dict[str, CompiledTemplate] = {}
+        for name in names:
+            self.get(name)
+
+    def get(self, name: str) -> CompiledTemplate:
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            compiled = self._compiled[name] = CompiledTemplate(self.environment, name)
+        return compiled
+
+    def render(self, name: str, context: Mapping[str, object]) -> str:
+        return self.get(name).render(context)
+
+    def render_batch(
+        self, name: str, contexts: Iterable[Mapping[str, object]]
+    ) -> list[str]:
+        """
+        Renders one template for many recipients.
+
+        Args:
+            name: Template file name.
+            contexts: One template context per recipient.
+
+        Returns:
+            The rendered bodies, in the order of ``contexts``.
+        """
+        render = self.get(name).render
+        return [render(context) for context in contexts]
@@ -0,0 +1,157 @@
+"""
+Email worker: drains the ``email_jobs`` queue over pooled SMTP connections.
+
+Runs as its own process next to the API workers::
+
+    python -m src.services.email_worker
+"""
+
+import asyncio
+import json
+import logging
+import random
+import signal
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.entity.models import EmailJob, EmailJobStatus
+from src.repositories.email_job_repository import EmailJobRepository
+from src.services.email import ONCE_PER_KEY_KINDS, build_message
+from src.services.smtp_pool import SmtpPool, create_smtp_pool
+from src.utils.log_config import setup_logging
+from src.utils.metrics import email_jobs, email_send_duration
+from src.utils.tracing import setup_tracing
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff with jitter for the next attempt.
+
+    Args:
+        attempts: Attempts made so far, at least 1.
+
+    Returns:
+        Delay in seconds, capped at ``EMAIL_RETRY_MAX_SECONDS``.
+    """
+    delay = settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.EMAIL_RETRY_MAX_SECONDS) * random.uniform(0.8, 1.2)
+
+
+class EmailWorker:
+    """
+    Claims due jobs in batches and sends each batch concurrently.
+
+    Concurrency is bounded by the SMTP pool size. Outcomes of a batch are
+    written back in a single commit.
+
+    Args:
+        pool: SMTP connection pool.
+        session_factory: Async context manager factory yielding DB sessions.
+        batch_size: Jobs claimed per round.
+        poll_interval: Seconds to wait when the queue has no due jobs.
+        clock: Returns the current UTC time, overridable in tests.
+    """
+
+    def __init__(
+        self,
+        pool: SmtpPool,
+        session_factory=sessionmanager.session,
+        batch_size: int = settings.EMAIL_BATCH_SIZE,
+        poll_interval: float = settings.EMAIL_POLL_INTERVAL_SECONDS,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.pool = pool
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._stopping = asyncio.Event()
+
+    async def _send(self, job: EmailJob) -> str | None:
+        start = time.perf_counter()
+        try:
+            message = build_message(job.kind, job.recipient, json.loads(job.context))
+            await self.pool.send(message)
+        except Exception as e:
+            logger.warning("Email job %d (%s) attempt failed: %s", job.id, job.kind, e)
+            return f"{type(e).__name__}: {e}"
+        finally:
+            email_send_duration.observe(time.perf_counter() - start, kind=job.kind)
+        return None
+
+    async def run_once(self) -> int:
+        """
+        Claims and sends one batch.
+
+        Returns:
+            Number of jobs processed.
+        """
+        async with self.session_factory() as session:
+            repository = EmailJobRepository(session)
+            jobs = await repository.claim_batch(
+                self.batch_size, self.clock(), settings.EMAIL_LEASE_SECONDS
+            )
+            if not jobs:
+                return 0
+            errors = await asyncio.gather(*(self._send(job) for job in jobs))
+            sent = [job for job, error in zip(jobs, errors) if error is None]
+            failed = [(job, error) for job, error in zip(jobs, errors) if error is not None]
+            await repository.finish_batch(
+                sent,
+                failed,
+                self.clock(),
+                settings.EMAIL_MAX_ATTEMPTS,
+                retry_delay,
+                keep_keys_for=ONCE_PER_KEY_KINDS,
+            )
+        email_jobs.inc(len(sent), result="sent")
+        for job, _ in failed:
+            result = "failed" if job.status == EmailJobStatus.FAILED else "retry"
+            email_jobs.inc(result=result)
+        return len(jobs)
+
+    async def run(self) -> None:
+        """Processes batches until ``stop`` is called."""
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Email worker round failed")
+                processed = 0
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+async def main() -> None:
+    log_listener = setup_logging()
+    tracer_provider = setup_tracing()
+    pool = create_smtp_pool()
+    worker = EmailWorker(pool)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    logger.info("Email worker started")
+    try:
+        await worker.run()
+    finally:
+        await pool.close()
+        await sessionmanager.engine.dispose()
+        logger.info("Email worker stopped")
+        if tracer_provider is not None:
+            tracer_provider.shutdown()
+        log_listener.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+import asyncio
+import contextlib
+import time
+from email.message import EmailMessage
+from typing import Callable
+
+import aiosmtplib
+
+from src.conf.config import settings
+from src.utils.tracing import tracer
+
+
+class SmtpPool:
+    """
+    Pool of authenticated SMTP connections reused across messages.
+
+    Opening an SMTP session costs a TCP connect, a TLS handshake and AUTH;
+    reusing sessions amortizes that over many messages. At most ``size``
+    connections are open. A connection idle for longer than
+    ``max_idle_seconds`` is probed with NOOP before reuse, and a message that
+    fails because the server dropped the session is retried once on a fresh
+    connection.
+
+    Args:
+        connection_factory: Returns a new, unconnected ``aiosmtplib.SMTP``.
+        size: Maximum number of open connections.
+        username: Login user; no AUTH when empty.
+        password: Login password.
+        max_idle_seconds: Idle time after which a connection is probed.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], aiosmtplib.SMTP],
+        size: int = 2,
+        username: str | None = None,
+        password: str | None = None,
+        max_idle_seconds: float = 30.0,
+    ):
+        self.connection_factory = connection_factory
+        self.size = size
+        self.username = username
+        self.password = password
+        self.max_idle_seconds = max_idle_seconds
+        self._idle: asyncio.LifoQueue[tuple[aiosmtplib.SMTP, float]] = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+        self._open = 0
+
+    @property
+    def open_connections(self) -> int:
+        return self._open
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = self.connection_factory()
+        await smtp.connect()
+        if self.username:
+            await smtp.login(self.username, self.password)
+        self._open += 1
+        return smtp
+
+    async def _discard(self, smtp: aiosmtplib.SMTP) -> None:
+        self._open -= 1
+        with contextlib.suppress(aiosmtplib.SMTPException, OSError):
+            await smtp.quit()
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while not self._idle.empty():
+            smtp, idle_since = self._idle.get_nowait()
+            if not smtp.is_connected:
+                self._open -= 1
+                continue
+            if time.monotonic() - idle_since > self.max_idle_seconds:
+                try:
+                    await smtp.noop()
+                except (aiosmtplib.SMTPException, OSError):
+                    await self._discard(smtp)
+                    continue
+            return smtp
+        return await self._connect()
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        async with self._slots:
+            smtp = await self._checkout()
+            try:
+                yield smtp
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                # the server rejected this message; the session is still usable
+                self._idle.put_nowait((smtp, time.monotonic()))
+                raise
+            except BaseException:
+                await self._discard(smtp)
+                raise
+            else:
+                self._idle.put_nowait((smtp, time.monotonic()))
+
+    async def send(self, message: EmailMessage) -> None:
+        """
+        Sends one message on a pooled connection.
+
+        Raises:
+            aiosmtplib.SMTPException: If the server rejects the message.
+            OSError: If no connection can be established.
+        """
+        with tracer.start_as_current_span(
+            "smtp send", attributes={"peer.service": "smtp"}
+        ):
+            try:
+                async with self.connection() as smtp:
+                    await smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # the server closed an idle session; one retry on a new one
+                async with self.connection() as smtp:
+                    await smtp.send_message(message)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            smtp, _ = self._idle.get_nowait()
+            await self._discard(smtp)
+
+
+def create_smtp_pool() -> SmtpPool:
+    def connection_factory() -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS,
+            validate_certs=settings.VALIDATE_CERTS,
+            timeout=settings.SMTP_TIMEOUT,
+        )
+
+    return SmtpPool(
+        connection_factory,
+        size=settings.SMTP_POOL_SIZE,
+        username=settings.MAIL_USERNAME if settings.USE_CREDENTIALS else None,
+        password=settings.MAIL_PASSWORD,
+        max_idle_seconds=settings.SMTP_MAX_IDLE_SECONDS,
+    )
@@ -0,0 +1,199 @@
+import asyncio
+import os
+import re
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import cloudinary.utils
+import httpx
+
+from src.conf.config import settings
+from src.utils.tracing import traced
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class StorageBackend(ABC):
+    """
+    Stores processed avatar images and returns the URL they are served from.
+
+    Objects are content-addressed: the key is a digest of the image, so a
+    key that is already stored never needs to be written again.
+    """
+
+    @abstractmethod
+    async def put(self, key: str, variants: dict[int, bytes], content_type: str) -> str:
+        """
+        Stores every size of one avatar.
+
+        Args:
+            key: Content digest of the avatar.
+            variants: Encoded image by edge length in pixels.
+            content_type: MIME type of the variants.
+
+        Returns:
+            Public URL of the largest size.
+        """
+
+    @abstractmethod
+    def variant_url(self, url: str, size: int) -> str:
+        """
+        Turns the URL returned by ``put`` into the URL of another size.
+
+        URLs this backend did not produce, such as Gravatar defaults, are
+        returned unchanged.
+        """
+
+    async def close(self) -> None:
+        return None
+
+
+class CloudinaryStorage(StorageBackend):
+    """
+    Uploads to Cloudinary over its REST API with an async HTTP client.
+
+    Requests are signed per call, so no global ``cloudinary.config`` is
+    touched and uploads never block the event loop. The largest size is
+    uploaded with eager transformations for the smaller ones, so Cloudinary
+    pre-generates them; an already uploaded digest is not overwritten.
+
+    Args:
+        cloud_name: Cloudinary cloud name.
+        api_key: API key.
+        api_secret: API secret used to sign uploads.
+        folder: Prefix for public ids.
+        timeout: Seconds allowed for one upload.
+        client: HTTP client to use; one is created on first upload otherwise.
+    """
+
+    def __init__(
+        self,
+        cloud_name: str,
+        api_key: int | str,
+        api_secret: str,
+        folder: str = "RestApp",
+        timeout: float = 30.0,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.cloud_name = cloud_name
+        self.api_key = str(api_key)
+        self.api_secret = api_secret
+        self.folder = folder
+        self.timeout = timeout
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    @staticmethod
+    def _transformation(size: int) -> str:
+        return f"c_fill,w_{size},h_{size}"
+
+    @traced("cloudinary upload", **{"peer.service": "cloudinary"})
+    async def put(self, key: str, variants: dict[int, bytes], content_type: str) -> str:
+        largest = max(variants)
+        public_id = f"{self.folder}/{key}"
+        params = {
+            "public_id": public_id,
+            "overwrite": "false",
+            "timestamp": int(time.time()),
+        }
+        smaller = sorted(size for size in variants if size != largest)
+        if smaller:
+            params["eager"] = "|".join(self._transformation(size) for size in smaller)
+        params["signature"] = cloudinary.utils.api_sign_request(params, self.api_secret)
+        params["api_key"] = self.api_key
+        response = await self.client.post(
+            f"https://api.cloudinary.com/v1_1/{self.cloud_name}/image/upload",
+            data=params,
+            files={"file": (key, variants[largest], content_type)},
+        )
+        response.raise_for_status()
+        url, _ = cloudinary.utils.cloudinary_url(
+            public_id,
+            cloud_name=self.cloud_name,
+            secure=True,
+            version=response.json().get("version"),
+        )
+        return url
+
+    def variant_url(self, url: str, size: int) -> str:
+        prefix = f"https://res.cloudinary.com/{self.cloud_name}/image/upload/"
+        if not url.startswith(prefix):
+            return url
+        return f"{prefix}{self._transformation(size)}/{url[len(prefix):]}"
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class LocalStorage(StorageBackend):
+    """
+    Content-addressed avatar store on the local filesystem.
+
+    Each avatar lives in ``<root>/<digest[:2]>/<digest>/<size>.webp`` and is
+    served by ``GET /avatars/{digest}.webp?size=N``. Digests that are already
+    on disk are not rewritten, and new files are written to a temporary name
+    and renamed into place, so readers never see a partial image.
+
+    Args:
+        root: Directory holding the avatars.
+        base_url: Public URL prefix of the avatar route.
+    """
+
+    def __init__(self, root: Path | str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, key: str, size: int) -> Path:
+        return self.root / key[:2] / key / f"{size}.webp"
+
+    def _write(self, key: str, variants: dict[int, bytes]) -> None:
+        for size, data in variants.items():
+            path = self.path(key, size)
+            if path.exists():
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    async def put(self, key: str, variants: dict[int, bytes], content_type: str) -> str:
+        if not DIGEST_PATTERN.match(key):
+            raise ValueError(f"Invalid avatar key {key!r}")
+        await asyncio.to_thread(self._write, key, variants)
+        return f"{self.base_url}/avatars/{key}.webp"
+
+    def variant_url(self, url: str, size: int) -> str:
+        if not url.startswith(f"{self.base_url}/avatars/"):
+            return url
+        return f"{url.split('?', 1)[0]}?size={size}"
+
+
+def create_storage_backend() -> StorageBackend:
+    """
+    Builds the avatar storage selected by ``settings.STORAGE_BACKEND``.
+
+    Returns:
+        A ``LocalStorage`` for ``"local"``, otherwise a ``CloudinaryStorage``.
+    """
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.AVATAR_STORAGE_DIR, settings.APP_BASE_URL)
+    return CloudinaryStorage(
+        settings.CLD_NAME,
+        settings.CLD_API_KEY,
+        settings.CLD_API_SECRET,
+        timeout=settings.AVATAR_UPLOAD_TIMEOUT,
+    )
@@ -1,17 +1,21 @@
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from src.entity.models import User
 from src.repositories.user_repository import UserRepository
+from src.database.replicas import replica_router
 from src.services.auth import AuthService
 from src.schemas.user import UserCreate
+from src.utils.tracing import traced_class
 
 
+@traced_class
 class UserService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, auth_service: AuthService | None = None):
         self.db = db
         self.user_repository = UserRepository(self.db)
-        self.auth_service = AuthService(db)
+        self.auth_service = auth_service or AuthService(db)
 
     async def create_user(self, user_data: UserCreate) -> User:
         user = await self.auth_service.register_user(user_data)
@@ -25,12 +29,23 @@ class UserService:
         user = await self.user_repository.get_by_email(email)
         return user
 
-    async def confirmed_email(self, email: str) -> None:
-        await self.user_repository.confirmed_email(email)
-
-    async def update_avatar_url(self, email: str, url: str) -> User:
+    async def confirmed_email(self, email: str) -> bool:
+        """
+        Confirms a user's email and evicts their cached profile.
+
+        Returns:
+            True if the email was unconfirmed before this call.
+        """
+        user = await self.user_repository.confirmed_email(email)
+        if not user:
+            return False
+        replica_router.mark_write(user.id)
+        await self.auth_service.invalidate_cached_user(user.username)
+        return True
+
+    async def update_avatar_url(self, email: str, url: str) -> Row | None:
         user = await self.user_repository.update_avatar_url(email, url)
+        if user:
+            replica_router.mark_write(user.id)
+            await self.auth_service.invalidate_cached_user(user.username)
         return user
-
-    async def add_reset_password_token(self, email: str, token: str) -> None:
-        await self.user_repository.add_reset_password_token(email, token)
@@ -1,20 +1,43 @@
+import contextlib
+
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from src.database.db import get_db
+from src.database.replicas import replica_router
 from src.services.auth import AuthService, oauth2_scheme
 from src.services.user import UserService
 from src.services.contacts import ContactsService
+from src.services.avatar import AvatarPipeline, avatar_pipeline
+from src.services.storage import StorageBackend
+from src.services.email import EmailQueueService
 from src.entity.models import User, UserRole
 
 
 def get_auth_service(db: AsyncSession = Depends(get_db)):
-    return AuthService(db)
+    return AuthService(db, replica_router)
+
+
+def get_user_service(
+    db: AsyncSession = Depends(get_db),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    return UserService(db, auth_service)
+
+
+def get_avatar_pipeline() -> AvatarPipeline:
+    return avatar_pipeline
+
 
+def get_avatar_storage() -> StorageBackend:
+    return avatar_pipeline.storage
 
-def get_user_service(db: AsyncSession = Depends(get_db)):
-    return UserService(db)
+
+def get_email_queue_service(db: AsyncSession = Depends(get_db)):
+    return EmailQueueService(db)
 
 
 async def get_current_user(
@@ -29,6 +52,32 @@ def get_contacts_service(db: AsyncSession = Depends(get_db)):
     return ContactsService(db)
 
 
+async def get_read_db(
+    user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+):
+    index = replica_router.choose(user.id)
+    if index is None:
+        yield db
+        return
+    replica = contextlib.AsyncExitStack()
+    try:
+        session = await replica.enter_async_context(replica_router.session(index))
+        # Connect before handing the session to the route, so a dead replica
+        # costs this request a fallback rather than a 500
+        await session.execute(text("SELECT 1"))
+    except (OperationalError, InterfaceError, OSError) as e:
+        # Closing the stack with the error lets the breaker record it
+        await replica.__aexit__(type(e), e, e.__traceback__)
+        yield db
+        return
+    async with replica:
+        yield session
+
+
+def get_read_contacts_service(db: AsyncSession = Depends(get_read_db)):
+    return ContactsService(db)
+
+
 def get_current_admin_user(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -0,0 +1,24 @@
+import hashlib
+from functools import lru_cache
+
+GRAVATAR_URL = "https://www.gravatar.com/avatar/"
+
+
+@lru_cache(maxsize=4096)
+def gravatar_url(email: str) -> str:
+    """
+    Builds the Gravatar image URL for an email address.
+
+    A pure function of the address: Gravatar resolves the hash when the
+    image is requested, so no network call is needed here. Addresses are
+    normalized as Gravatar requires, and the URLs match what
+    ``libgravatar.Gravatar(email).get_image()`` produced.
+
+    Args:
+        email: The user's email address.
+
+    Returns:
+        The avatar URL.
+    """
+    normalized = email.strip().lower().encode()
+    return GRAVATAR_URL + hashlib.md5(normalized, usedforsecurity=False).hexdigest()
@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from sqlalchemy import text
@@ -5,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 
+logger = logging.getLogger("uvicorn.error")
+
 router = APIRouter(prefix="/health", tags=["HealthCheck"])
 
 
@@ -27,7 +31,7 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             )
         return {"message": "Welcome to FastAPI!!!!"}
     except Exception as e:
-        print(e)
+        logger.error("Health check failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
@@ -0,0 +1,175 @@
+"""
+Structured logging with a non-blocking queue handler.
+
+Application code keeps using ``logging.getLogger("uvicorn.error")``.
+``setup_logging`` routes every record through a ``QueueHandler``: the
+caller only stamps the record with the current request ID and enqueues
+it, while a ``QueueListener`` thread does the formatting and the blocking
+write to stdout.
+
+Debug records are sampled per request, so a sampled request keeps all of
+its debug lines and an unsampled one costs a single hash.
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from opentelemetry import trace
+
+from src.conf.config import settings
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "request_id",
+    "trace_id",
+    "color_message",  # uvicorn's ANSI-colored duplicate of the message
+}
+
+
+class RequestIdFilter(logging.Filter):
+    """Copies the request ID and trace ID from the caller's context onto the record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        span_context = trace.get_current_span().get_span_context()
+        record.trace_id = (
+            format(span_context.trace_id, "032x") if span_context.is_valid else None
+        )
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Keeps roughly ``rate`` of DEBUG records; other levels always pass.
+
+    The decision is a hash of the request ID, so all debug records of a
+    request are kept or dropped together. Records outside a request are
+    dropped unless ``rate`` is 1.
+
+    Args:
+        rate: Share of requests whose debug records are kept, 0 to 1.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self._cutoff = int(rate * 0xFFFFFFFF)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
+        if request_id is None:
+            return False
+        return zlib.crc32(request_id.encode()) <= self._cutoff
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that keeps records structured.
+
+    The stock handler flattens each record into a preformatted string in
+    the calling thread. This one only resolves the message and traceback
+    text, leaving JSON formatting to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: str | None = None,
+    fmt: str | None = None,
+    debug_sample_rate: float | None = None,
+    stream=None,
+) -> logging.handlers.QueueListener:
+    """
+    Routes the root and uvicorn loggers through a background queue listener.
+
+    Args:
+        level: Root log level; defaults to ``LOG_LEVEL``.
+        fmt: ``json`` or ``text``; defaults to ``LOG_FORMAT``.
+        debug_sample_rate: Share of requests whose debug records are kept;
+            defaults to ``LOG_DEBUG_SAMPLE_RATE``.
+        stream: Output stream; defaults to stdout.
+
+    Returns:
+        The started listener. Call ``stop()`` on shutdown to flush it.
+    """
+    level = level or settings.LOG_LEVEL
+    fmt = fmt or settings.LOG_FORMAT
+    if debug_sample_rate is None:
+        debug_sample_rate = settings.LOG_DEBUG_SAMPLE_RATE
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+        )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = StructuredQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, StructuredQueueHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    # uvicorn installs its own stream handlers; send its records to the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    return listener
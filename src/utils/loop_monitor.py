@@ -0,0 +1,146 @@
+"""
+Opt-in event loop lag monitor.
+
+A sampler coroutine sleeps for ``interval`` and records how late it woke
+up; that scheduling delay is the time some other callback held the loop.
+A watchdog thread notices when the sampler has not run for longer than
+``threshold`` and captures the loop thread's stack while it is still
+blocked, which points at the synchronous call responsible.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from src.conf.config import settings
+from src.utils.metrics import event_loop_lag, event_loop_stalls
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class StallReport:
+    detected_at: datetime
+    lag_ms: float
+    task: str | None
+    stack: list[str] = field(default_factory=list)
+
+
+class LoopLagMonitor:
+    """
+    Samples event loop scheduling delay and captures stacks of long stalls.
+
+    Args:
+        interval: Seconds between lag samples.
+        threshold: Lag in seconds above which a stall is reported.
+        max_reports: Number of recent stall reports kept in memory.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, max_reports: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.reports: deque[StallReport] = deque(maxlen=max_reports)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._heartbeat = time.monotonic()
+        # report captured by the watchdog for the stall in progress
+        self._pending: StallReport | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Starts sampling on the running loop. Must be called from a coroutine."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._sample(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join()
+        self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self._record_lag(max(now - expected, 0.0))
+
+    def _record_lag(self, lag: float) -> None:
+        event_loop_lag.observe(lag)
+        if lag < self.threshold:
+            self._pending = None
+            return
+        event_loop_stalls.inc()
+        report, self._pending = self._pending, None
+        if report is None:
+            # The stall ended before the watchdog looked; no stack to show
+            report = StallReport(datetime.now(timezone.utc), 0.0, None)
+            self.reports.append(report)
+        report.lag_ms = round(lag * 1000, 1)
+        logger.warning(
+            "Event loop blocked for %.1f ms%s%s",
+            report.lag_ms,
+            f" in task {report.task}" if report.task else "",
+            "\n" + "".join(report.stack) if report.stack else "",
+        )
+
+    def _watch(self) -> None:
+        period = min(self.interval, self.threshold) / 2
+        while not self._stopped.wait(period):
+            overdue = time.monotonic() - self._heartbeat - self.interval
+            if overdue >= self.threshold and self._pending is None:
+                self._pending = self._capture(overdue)
+
+    def _capture(self, overdue: float) -> StallReport:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        task_name = None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is not None:
+            task_name = f"{task.get_name()} ({task.get_coro().__qualname__})"
+        report = StallReport(
+            detected_at=datetime.now(timezone.utc),
+            lag_ms=round(overdue * 1000, 1),
+            task=task_name,
+            stack=stack,
+        )
+        self.reports.append(report)
+        return report
+
+
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_LAG_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_LAG_THRESHOLD_MS / 1000,
+)
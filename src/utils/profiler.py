@@ -0,0 +1,205 @@
+"""
+On-demand profilers for a live worker.
+
+``SamplingProfiler`` walks every thread's stack from a background thread
+at a fixed interval and aggregates the samples into collapsed stacks, the
+input format of flamegraph.pl and speedscope. Samples taken on the event
+loop thread are attributed to the route of the request whose task was
+running, using the task-to-scope map filled in by ``MetricsMiddleware``.
+
+``memory_diff`` compares two ``tracemalloc`` snapshots taken some seconds
+apart to show where allocations grew.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from types import FrameType
+
+IDLE = "(idle)"
+UNATTRIBUTED = "(unattributed)"
+
+_memory_lock = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType) -> list[str]:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+class SamplingProfiler:
+    """
+    Time-bounded statistical profiler sampling all thread stacks.
+
+    Only one profile runs at a time; ``run`` raises ``ProfilerBusyError``
+    while another is in progress.
+    """
+
+    def __init__(self):
+        self.active = False
+        # request task -> ASGI scope, filled in only while a profile runs
+        self.tasks: weakref.WeakKeyDictionary[asyncio.Task, dict] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def track(self, task: asyncio.Task | None, scope: dict) -> None:
+        if task is not None:
+            self.tasks[task] = scope
+
+    def untrack(self, task: asyncio.Task | None) -> None:
+        if task is not None:
+            self.tasks.pop(task, None)
+
+    def _route_of(self, loop: asyncio.AbstractEventLoop) -> str:
+        try:
+            task = asyncio.current_task(loop)
+        except RuntimeError:
+            return UNATTRIBUTED
+        if task is None:
+            return IDLE
+        scope = self.tasks.get(task)
+        if scope is None:
+            return UNATTRIBUTED
+        route = scope.get("route")
+        return f"{scope['method']} {getattr(route, 'path', 'unmatched')}"
+
+    async def run(self, seconds: float, interval: float) -> dict:
+        """
+        Samples all threads for ``seconds``, every ``interval`` seconds.
+
+        Must be awaited on the event loop being profiled. Sampling happens
+        in a separate thread, so the loop keeps serving requests meanwhile.
+
+        Args:
+            seconds: Profile duration.
+            interval: Time between samples.
+
+        Returns:
+            Sample count, collapsed stacks and per-route sample counts.
+
+        Raises:
+            ProfilerBusyError: If another profile is running.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        loop = asyncio.get_running_loop()
+        try:
+            self.active = True
+            return await asyncio.to_thread(
+                self._sample, loop, threading.get_ident(), seconds, interval
+            )
+        finally:
+            self.active = False
+            self.tasks.clear()
+            self._lock.release()
+
+    def _sample(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        loop_thread_id: int,
+        seconds: float,
+        interval: float,
+    ) -> dict:
+        own_id = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        routes: Counter[str] = Counter()
+        samples = 0
+        start = time.monotonic()
+        deadline = start + seconds
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id))
+                if thread_id == loop_thread_id:
+                    route = self._route_of(loop)
+                    routes[route] += 1
+                    prefix = [thread_name, route]
+                else:
+                    prefix = [thread_name]
+                stacks[";".join(prefix + _collapse(frame))] += 1
+            samples += 1
+            time.sleep(interval)
+
+        return {
+            "duration_s": round(time.monotonic() - start, 3),
+            "interval_ms": interval * 1000,
+            "samples": samples,
+            "routes": dict(routes.most_common()),
+            "collapsed": "\n".join(
+                f"{stack} {count}" for stack, count in stacks.most_common()
+            ),
+        }
+
+
+async def memory_diff(seconds: float, limit: int = 25, frames: int = 5) -> dict:
+    """
+    Reports allocation growth between two ``tracemalloc`` snapshots.
+
+    Tracing is started for the measurement when it is not already on and
+    stopped afterwards, since it slows allocations noticeably.
+
+    Args:
+        seconds: Time between the snapshots.
+        limit: Number of top allocation sites to return.
+        frames: Traceback depth recorded per allocation.
+
+    Returns:
+        Total growth and the allocation sites that grew the most.
+
+    Raises:
+        ProfilerBusyError: If another memory profile is running.
+    """
+    if not _memory_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A memory profile is already running")
+    started = not tracemalloc.is_tracing()
+    try:
+        if started:
+            tracemalloc.start(frames)
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+        _memory_lock.release()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), "traceback"
+    )
+    return {
+        "duration_s": seconds,
+        "size_diff_bytes": sum(stat.size_diff for stat in stats),
+        "count_diff": sum(stat.count_diff for stat in stats),
+        "top": [
+            {
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+                "traceback": stat.traceback.format(),
+            }
+            for stat in stats[:limit]
+        ],
+    }
+
+
+sampling_profiler = SamplingProfiler()
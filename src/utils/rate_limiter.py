@@ -0,0 +1,50 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+
+class RateLimiter:
+    """
+    Token bucket pacing a producer to ``rate`` items per second.
+
+    Up to ``burst`` items pass immediately; beyond that ``acquire`` sleeps
+    until enough tokens have accumulated.
+
+    Args:
+        rate: Sustained items per second.
+        burst: Bucket capacity; defaults to one second's worth.
+        clock: Monotonic time source, overridable in tests.
+        sleep: Coroutine used to wait, overridable in tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.burst
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """
+        Waits until ``amount`` items may proceed.
+
+        Amounts larger than the burst are allowed and simply wait longer.
+        """
+        self._refill()
+        self.tokens -= amount
+        if self.tokens < 0:
+            await self.sleep(-self.tokens / self.rate)
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from src.utils.metrics import single_flight_requests
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent reads within one process.
+
+    The first caller for a key runs the read; callers arriving while it is
+    in flight await the same result instead of running their own. Nothing
+    is cached: the key is released as soon as the read finishes.
+
+    Keys are ``(owner, name, params)`` tuples. ``forget(owner)`` detaches the
+    owner's in-flight reads, so a read issued after the owner's write never
+    joins one that started before it.
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, asyncio.Future] = {}
+
+    async def do(
+        self, owner: Hashable, name: str, params: tuple, read: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Runs ``read`` unless an identical read is already in flight.
+
+        Args:
+            owner: Whose data is read, usually the user id.
+            name: The read, e.g. the route or service method.
+            params: Arguments that change the result; must be hashable.
+            read: Coroutine function performing the read.
+
+        Returns:
+            The result of ``read``, possibly shared with concurrent callers.
+        """
+        key = (owner, name, params)
+        call = self._calls.get(key)
+        if call is not None:
+            single_flight_requests.inc(name=name, result="shared")
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling() or not call.cancelled():
+                    raise
+                # The leader's request was cancelled, not ours: read again
+                return await self.do(owner, name, params, read)
+
+        single_flight_requests.inc(name=name, result="leader")
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await read()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            # Followers re-raise it; mark it retrieved so a lone leader is not logged
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def forget(self, owner: Hashable) -> None:
+        """Lets reads issued from now on for ``owner`` start fresh."""
+        for key in [key for key in self._calls if key[0] == owner]:
+            del self._calls[key]
+
+
+read_flights = SingleFlight()
@@ -0,0 +1,176 @@
+"""
+OpenTelemetry tracing for routes, services, repositories and external calls.
+
+Instrumented code only uses the OpenTelemetry API, which is a no-op until
+``setup_tracing`` installs an SDK tracer provider. Spans are exported over
+OTLP/HTTP to ``TRACING_OTLP_ENDPOINT`` (a local collector by default), or
+to any exporter passed in, such as ``InMemorySpanExporter`` in tests.
+
+Scalar call arguments are recorded as ``arg.<name>`` span attributes after
+scrubbing: arguments named in ``TRACING_SCRUB_KEYS`` and values that look
+like emails or JWTs are replaced with ``[REDACTED]``.
+"""
+
+import functools
+import inspect
+import re
+from typing import Any, Callable
+
+from opentelemetry import trace
+from opentelemetry.trace import Span
+
+from src.conf.config import settings
+
+REDACTED = "[REDACTED]"
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_JWT = re.compile(r"^[\w-]+\.[\w-]+\.[\w-]+$")
+_SCALARS = (str, int, float, bool)
+
+tracer = trace.get_tracer("contacts-api")
+
+
+def _scrub_keys() -> set[str]:
+    return {key.strip().lower() for key in settings.TRACING_SCRUB_KEYS.split(",") if key.strip()}
+
+
+_scrubbed_keys = _scrub_keys()
+
+
+def scrub(key: str, value: Any) -> Any:
+    """
+    Redacts sensitive attribute values.
+
+    Args:
+        key: Attribute or argument name.
+        value: Attribute value.
+
+    Returns:
+        ``REDACTED`` for sensitive keys, emails and JWT-shaped strings;
+        otherwise the value unchanged.
+    """
+    name = key.rsplit(".", 1)[-1].lower()
+    if name in _scrubbed_keys or any(part in _scrubbed_keys for part in name.split("_")):
+        return REDACTED
+    if isinstance(value, str) and (_EMAIL.search(value) or _JWT.match(value)):
+        return REDACTED
+    return value
+
+
+def set_attributes(span: Span, attributes: dict[str, Any]) -> None:
+    if not span.is_recording():
+        return
+    for key, value in attributes.items():
+        if isinstance(value, _SCALARS):
+            span.set_attribute(key, scrub(key, value))
+
+
+def _argument_attributes(signature: inspect.Signature, args, kwargs) -> dict[str, Any]:
+    try:
+        bound = signature.bind_partial(*args, **kwargs)
+    except TypeError:
+        return {}
+    return {
+        f"arg.{name}": value
+        for name, value in bound.arguments.items()
+        if name != "self" and isinstance(value, _SCALARS)
+    }
+
+
+def traced(name: str | None = None, **attributes: Any):
+    """
+    Decorator running a sync or async function inside a span.
+
+    Args:
+        name: Span name; defaults to ``<Class>.<method>`` for methods
+            (using the runtime class) or the function's qualified name.
+        **attributes: Static attributes added to every span, e.g.
+            ``peer.service="smtp"``.
+    """
+
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+        takes_self = next(iter(signature.parameters), None) == "self"
+
+        def span_name(args) -> str:
+            if name:
+                return name
+            if takes_self and args:
+                return f"{type(args[0]).__name__}.{func.__name__}"
+            return func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(span_name(args)) as span:
+                    if span.is_recording():
+                        set_attributes(span, attributes)
+                        set_attributes(span, _argument_attributes(signature, args, kwargs))
+                    return await func(*args, **kwargs)
+
+            async_wrapper.__traced__ = True
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name(args)) as span:
+                if span.is_recording():
+                    set_attributes(span, attributes)
+                    set_attributes(span, _argument_attributes(signature, args, kwargs))
+                return func(*args, **kwargs)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    return decorator
+
+
+def traced_class(cls: type) -> type:
+    """
+    Class decorator tracing every public coroutine method defined on ``cls``.
+
+    Inherited methods are traced by decorating the base class; span names
+    use the runtime class, e.g. ``UserRepository.get_by_id``.
+    """
+    for attr, value in list(vars(cls).items()):
+        if (
+            not attr.startswith("_")
+            and inspect.iscoroutinefunction(value)
+            and not getattr(value, "__traced__", False)
+        ):
+            setattr(cls, attr, traced()(value))
+    return cls
+
+
+def setup_tracing(exporter=None):
+    """
+    Installs the global tracer provider when tracing is enabled.
+
+    Args:
+        exporter: Span exporter to use instead of OTLP/HTTP. Exports go
+            through a batching processor either way.
+
+    Returns:
+        The SDK tracer provider, or None when ``TRACING_ENABLED`` is off.
+        Call ``shutdown()`` on it to flush pending spans.
+    """
+    if not settings.TRACING_ENABLED and exporter is None:
+        return None
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if exporter is None:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return provider
@@ -1,22 +1,33 @@
 import asyncio
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 from main import app
 from src.entity.models import Base, User, UserRole
 from src.database.db import get_db
+from src.database.instrumentation import instrument_engine
 from src.services.auth import AuthService
+from src.services.cache import cache_client
 
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}"
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+instrument_engine(engine.sync_engine)
 
 TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
@@ -74,3 +85,49 @@ async def get_token():
         auth_service = AuthService(session)
         token = await auth_service.create_acces_token(test_user["username"])
     return token
+
+
+class RoundTripRecorder:
+    """Records SQL statements and cache commands issued while recording."""
+
+    CACHE_COMMANDS = ("get", "get_many", "set", "setex", "exists", "delete")
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.cache_commands: list[str] = []
+        self.active = False
+
+    def on_statement(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.statements.append(statement)
+
+    def wrap_cache_command(self, command, original):
+        async def wrapper(*args, **kwargs):
+            if self.active:
+                self.cache_commands.append(command)
+            return await original(*args, **kwargs)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def recording(self):
+        self.statements.clear()
+        self.cache_commands.clear()
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+
+
+@pytest.fixture
+def round_trips(monkeypatch):
+    recorder = RoundTripRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder.on_statement)
+    for command in RoundTripRecorder.CACHE_COMMANDS:
+        original = getattr(cache_client, command)
+        monkeypatch.setattr(
+            cache_client, command, recorder.wrap_cache_command(command, original)
+        )
+    yield recorder
+    event.remove(engine.sync_engine, "before_cursor_execute", recorder.on_statement)
@@ -0,0 +1,121 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import select
+
+from conftest import TestingSessionLocal, test_user
+from src.entity.models import User
+from src.middleware.body_limit import BodySizeLimitMiddleware
+from src.services.avatar import AvatarPipeline, resize_avatar, sniff_content_type
+from src.services.storage import StorageBackend
+
+
+def encode(image: Image.Image, format: str, **params) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format=format, **params)
+    return output.getvalue()
+
+
+class MemoryStorage(StorageBackend):
+    def __init__(self, delays: list[float] | None = None):
+        self.objects = {}
+        self.delays = delays or []
+
+    async def put(self, key: str, variants: dict[int, bytes], content_type: str) -> str:
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        version = len(self.objects) + 1
+        self.objects[f"{key}/v{version}"] = variants
+        return f"https://cdn.example.com/v{version}/{key}.webp"
+
+    def variant_url(self, url: str, size: int) -> str:
+        return url
+
+
+@pytest.mark.parametrize(
+    "format, mode", [("JPEG", "RGB"), ("PNG", "RGBA"), ("WEBP", "RGB"), ("GIF", "P")]
+)
+def test_resize_avatar_produces_square_webp(format, mode):
+    source = encode(Image.new(mode, (1200, 800)), format)
+
+    assert sniff_content_type(source[:16]) == f"image/{format.lower()}"
+    variants = resize_avatar(source, sizes=[250, 64])
+    assert sorted(variants) == [64, 250]
+    for size, data in variants.items():
+        with Image.open(io.BytesIO(data)) as avatar:
+            assert (avatar.format, avatar.size) == ("WEBP", (size, size))
+
+
+def test_resize_avatar_applies_exif_orientation():
+    image = Image.new("RGB", (600, 300), "white")
+    image.paste("black", (0, 0, 300, 300))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees clockwise when displayed
+    source = encode(image, "JPEG", exif=exif)
+
+    with Image.open(io.BytesIO(resize_avatar(source, sizes=[100])[100])) as avatar:
+        top, bottom = avatar.getpixel((50, 10)), avatar.getpixel((50, 90))
+    assert sum(top) < 100 and sum(bottom) > 600
+
+
+def test_resize_avatar_rejects_oversized_and_invalid_images():
+    with pytest.raises(ValueError):
+        resize_avatar(encode(Image.new("RGB", (2000, 2000)), "PNG"), max_pixels=1_000_000)
+    with pytest.raises(ValueError):
+        resize_avatar(b"\x89PNG\r\n\x1a\n" + b"0" * 64)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_uploads_and_keeps_latest_url():
+    storage = MemoryStorage(delays=[0.05, 0])
+    pipeline = AvatarPipeline(storage, session_factory=TestingSessionLocal, workers=1)
+    async with TestingSessionLocal() as session:
+        user = (
+            await session.execute(select(User).filter_by(username=test_user["username"]))
+        ).scalar_one()
+
+    avatar = await pipeline.process(encode(Image.new("RGB", (300, 300)), "PNG"))
+    first = pipeline.schedule_upload(user, avatar)
+    second = pipeline.schedule_upload(user, avatar)
+    await pipeline.close()
+
+    assert first.done() and second.done()
+    assert len(storage.objects) == 2
+    async with TestingSessionLocal() as session:
+        url = (
+            await session.execute(select(User.avatar).filter_by(id=user.id))
+        ).scalar_one()
+    # the first upload finished last but was superseded by the second
+    assert url == f"https://cdn.example.com/v1/{avatar.digest}.webp"
+    assert pipeline._latest == {}
+
+
+def body_limited_app(limit: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File()):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": limit})
+    return app
+
+
+def test_body_limit_rejects_declared_and_streamed_bodies():
+    client = TestClient(body_limited_app(limit=1000))
+
+    small = client.post("/upload", files={"file": ("a.bin", b"x" * 100)})
+    declared = client.post("/upload", files={"file": ("a.bin", b"x" * 5000)})
+    streamed = client.post(
+        "/upload",
+        content=(b"x" * 400 for _ in range(5)),
+        headers={"Content-Type": "multipart/form-data; boundary=b"},
+    )
+
+    assert small.json() == {"size": 100}
+    assert declared.status_code == 413
+    assert streamed.status_code == 413
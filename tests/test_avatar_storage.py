@@ -0,0 +1,133 @@
+import io
+
+import httpx
+import pytest
+from PIL import Image
+
+from conftest import TestingSessionLocal, test_user
+from main import app
+from src.routes.v1.users import Limiter
+from src.services.avatar import build_avatar
+from src.services.storage import CloudinaryStorage, LocalStorage
+from src.services.user import UserService
+from src.utils.get_services import get_avatar_storage
+
+
+@pytest.fixture(scope="module")
+def avatar():
+    source = io.BytesIO()
+    Image.new("RGB", (400, 400), "navy").save(source, format="PNG")
+    return build_avatar(source.getvalue(), sizes=[64, 128, 250])
+
+
+@pytest.mark.asyncio
+async def test_local_storage_is_content_addressed(tmp_path, avatar):
+    storage = LocalStorage(tmp_path, "http://testserver/")
+
+    url = await storage.put(avatar.digest, avatar.variants, "image/webp")
+    mtime = storage.path(avatar.digest, 64).stat().st_mtime_ns
+    again = await storage.put(avatar.digest, avatar.variants, "image/webp")
+
+    assert url == again == f"http://testserver/avatars/{avatar.digest}.webp"
+    assert storage.variant_url(url, 64) == f"{url}?size=64"
+    assert storage.variant_url("https://gravatar.com/a", 64) == "https://gravatar.com/a"
+    for size, data in avatar.variants.items():
+        assert storage.path(avatar.digest, size).read_bytes() == data
+    # the second put found the digest on disk and wrote nothing
+    assert storage.path(avatar.digest, 64).stat().st_mtime_ns == mtime
+    assert not list(tmp_path.rglob("*.tmp"))
+    with pytest.raises(ValueError):
+        await storage.put("../../etc", avatar.variants, "image/webp")
+
+
+def test_build_avatar_digest_depends_on_content_and_sizes(avatar):
+    source = io.BytesIO()
+    Image.new("RGB", (400, 400), "navy").save(source, format="PNG")
+
+    assert build_avatar(source.getvalue(), sizes=[64, 128, 250]).digest == avatar.digest
+    assert build_avatar(source.getvalue(), sizes=[250]).digest != avatar.digest
+
+
+@pytest.mark.asyncio
+async def test_cloudinary_storage_signs_upload_with_eager_sizes(avatar):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"version": 1700000000})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    storage = CloudinaryStorage("demo", 123, "secret", client=client)
+
+    url = await storage.put(avatar.digest, avatar.variants, "image/webp")
+    await storage.close()
+
+    [request] = requests
+    assert request.url == "https://api.cloudinary.com/v1_1/demo/image/upload"
+    body = request.content
+    fields = {
+        name: body.split(f'name="{name}"\r\n\r\n'.encode())[1].split(b"\r\n")[0].decode()
+        for name in ("public_id", "overwrite", "eager", "api_key", "signature")
+    }
+    assert fields["public_id"] == f"RestApp/{avatar.digest}"
+    assert fields["overwrite"] == "false"
+    assert fields["eager"] == "c_fill,w_64,h_64|c_fill,w_128,h_128"
+    assert fields["api_key"] == "123"
+    assert len(fields["signature"]) == 40
+    assert url == f"https://res.cloudinary.com/demo/image/upload/v1700000000/RestApp/{avatar.digest}"
+    assert storage.variant_url(url, 64) == (
+        f"https://res.cloudinary.com/demo/image/upload/c_fill,w_64,h_64/v1700000000/RestApp/{avatar.digest}"
+    )
+    assert storage.variant_url("https://gravatar.com/a", 64) == "https://gravatar.com/a"
+
+
+@pytest.mark.asyncio
+async def test_avatar_route_serves_immutable_variants(client, tmp_path, avatar):
+    storage = LocalStorage(tmp_path, "http://testserver/")
+    await storage.put(avatar.digest, avatar.variants, "image/webp")
+    app.dependency_overrides[get_avatar_storage] = lambda: storage
+    try:
+        default = client.get(f"/avatars/{avatar.digest}.webp")
+        small = client.get(f"/avatars/{avatar.digest}.webp?size=64")
+        cached = client.get(
+            f"/avatars/{avatar.digest}.webp?size=64",
+            headers={"If-None-Match": small.headers["etag"]},
+        )
+        bad_size = client.get(f"/avatars/{avatar.digest}.webp?size=65")
+        missing = client.get(f"/avatars/{'0' * 64}.webp")
+    finally:
+        del app.dependency_overrides[get_avatar_storage]
+
+    assert default.status_code == 200
+    assert default.content == avatar.variants[250]
+    assert small.content == avatar.variants[64]
+    assert small.headers["content-type"] == "image/webp"
+    assert small.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert small.headers["etag"] == f'"{avatar.digest}-64"'
+    assert cached.status_code == 304
+    assert bad_size.status_code == 422
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_me_resolves_requested_avatar_size(client, get_token, tmp_path, avatar, monkeypatch):
+    monkeypatch.setattr(Limiter, "enabled", False)
+    storage = LocalStorage(tmp_path, "http://testserver/")
+    url = await storage.put(avatar.digest, avatar.variants, "image/webp")
+    headers = {"Authorization": f"Bearer {get_token}"}
+    async with TestingSessionLocal() as session:
+        before = (await UserService(session).get_by_email(test_user["email"])).avatar
+        await UserService(session).update_avatar_url(test_user["email"], url)
+    app.dependency_overrides[get_avatar_storage] = lambda: storage
+    try:
+        default = client.get("/api/v1/users/me", headers=headers)
+        small = client.get("/api/v1/users/me?avatar_size=64", headers=headers)
+        bad_size = client.get("/api/v1/users/me?avatar_size=65", headers=headers)
+    finally:
+        del app.dependency_overrides[get_avatar_storage]
+        async with TestingSessionLocal() as session:
+            await UserService(session).update_avatar_url(test_user["email"], before)
+
+    assert default.json()["avatar"] == url
+    assert small.json()["avatar"] == f"{url}?size=64"
+    assert bad_size.status_code == 422
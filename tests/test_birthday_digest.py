@@ -0,0 +1,144 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from conftest import TestingSessionLocal
+from src.entity.models import Contact, EmailJob, EmailJobStatus, User
+from src.repositories.contacts_repository import birthday_window
+from src.repositories.email_job_repository import EmailJobRepository
+from src.services.birthday_digest import BirthdayDigestJob
+from src.services.email import BIRTHDAY_DIGEST, ONCE_PER_KEY_KINDS, build_message
+from src.utils.metrics import birthday_digest_last_user_id
+from src.utils.rate_limiter import RateLimiter
+
+TODAY = date(2026, 2, 25)
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_birthday_window_covers_days_and_leap_day():
+    window = birthday_window(TODAY, 7)
+
+    assert window[225] == date(2026, 2, 25)
+    assert window[304] == date(2026, 3, 4)
+    # 2026 is not a leap year: February 29 birthdays fall on March 1
+    assert window[229] == date(2026, 3, 1)
+    assert 305 not in window
+    assert 229 not in birthday_window(date(2028, 2, 20), 7)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_after_burst():
+    fake = FakeTime()
+    limiter = RateLimiter(10, burst=5, clock=fake.clock, sleep=fake.sleep)
+
+    await limiter.acquire(5)
+    assert fake.sleeps == []
+    await limiter.acquire(10)
+    assert fake.sleeps == [pytest.approx(1.0)]
+
+
+@pytest_asyncio.fixture
+async def users():
+    async with TestingSessionLocal() as session:
+        owners = [
+            User(
+                username=f"digest{n}",
+                email=f"digest{n}@example.com",
+                hashed_password="x",
+                confirmed=n != 3,
+            )
+            for n in range(5)
+        ]
+        session.add_all(owners)
+        await session.flush()
+        birthdays = {
+            0: [date(1990, 2, 27), date(1985, 3, 1)],
+            1: [date(1970, 6, 1)],
+            2: [date(1992, 2, 29)],
+            3: [date(1990, 2, 26)],
+        }
+        for n, days in birthdays.items():
+            for i, birthday in enumerate(days):
+                session.add(
+                    Contact(
+                        first_name=f"First{n}{i}",
+                        last_name="Last",
+                        email=f"digest-contact{n}{i}@example.com",
+                        birthday=birthday,
+                        user_id=owners[n].id,
+                    )
+                )
+        await session.commit()
+        return owners
+
+
+async def digest_jobs_by_recipient() -> dict[str, EmailJob]:
+    async with TestingSessionLocal() as session:
+        jobs = (
+            await session.execute(select(EmailJob).where(EmailJob.kind == BIRTHDAY_DIGEST))
+        ).scalars()
+        return {job.recipient: job for job in jobs}
+
+
+@pytest.mark.asyncio
+async def test_digest_enqueues_one_email_per_user_with_birthdays(users):
+    fake = FakeTime()
+    job = BirthdayDigestJob(
+        session_factory=TestingSessionLocal,
+        batch_size=2,
+        days=7,
+        limiter=RateLimiter(1, clock=fake.clock, sleep=fake.sleep),
+        clock=lambda: datetime(2026, 2, 25, 8, tzinfo=timezone.utc),
+    )
+
+    run = await job.run(TODAY)
+
+    jobs = await digest_jobs_by_recipient()
+    # unconfirmed digest3 is skipped, digest1 and digest4 have nothing upcoming
+    assert set(jobs) == {"digest0@example.com", "digest2@example.com"}
+    context = json.loads(jobs["digest0@example.com"].context)
+    assert context["birthdays"] == [
+        {"name": "First00 Last", "date": "Fri 27 Feb"},
+        {"name": "First01 Last", "date": "Sun 01 Mar"},
+    ]
+    assert json.loads(jobs["digest2@example.com"].context)["birthdays"][0]["date"] == "Sun 01 Mar"
+    # the seeded admin plus four confirmed digest users, two per batch
+    assert (run.users, run.emails, run.batches) == (5, 2, 3)
+    assert birthday_digest_last_user_id.get() == users[-1].id
+    assert fake.sleeps, "enqueueing above the rate should have been paced"
+
+    body = build_message(BIRTHDAY_DIGEST, "digest0@example.com", context).get_content()
+    assert "First00 Last" in body and "Fri 27 Feb" in body
+
+    # a rerun on the same day adds nothing, even once the digests were sent
+    await job.run(TODAY)
+    assert set(await digest_jobs_by_recipient()) == set(jobs)
+    async with TestingSessionLocal() as session:
+        sent = list((await session.execute(select(EmailJob))).scalars())
+        await EmailJobRepository(session).finish_batch(
+            sent,
+            [],
+            datetime(2026, 2, 25, 9, tzinfo=timezone.utc),
+            3,
+            lambda attempts: 0,
+            keep_keys_for=ONCE_PER_KEY_KINDS,
+        )
+    await job.run(TODAY)
+    async with TestingSessionLocal() as session:
+        statuses = (await session.execute(select(EmailJob.status))).scalars().all()
+    assert statuses == [EmailJobStatus.SENT] * len(jobs)
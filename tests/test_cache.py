@@ -0,0 +1,209 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from conftest import test_user
+from src.services.cache import CacheUnavailableError, InMemoryCache, RedisCache
+from src.utils.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return InMemoryCache(max_size=3, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_set_and_get(cache):
+    await cache.set("user:1", "data")
+
+    assert await cache.get("user:1") == "data"
+    assert await cache.exists("user:1") is True
+    assert await cache.get("missing") is None
+    assert await cache.exists("missing") is False
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(cache, clock):
+    await cache.set("user:1", "data", ex=10)
+    await cache.setex("bl:token", 5, "1")
+
+    clock.now = 5
+    assert await cache.exists("bl:token") is False
+    assert await cache.get("user:1") == "data"
+
+    clock.now = 10
+    assert await cache.get("user:1") is None
+
+
+@pytest.mark.asyncio
+async def test_revocations_are_not_evicted(cache, clock):
+    await cache.setex("bl:token", 5, "1")
+    for i in range(10):
+        await cache.set(f"user:{i}", "data")
+
+    assert await cache.exists("bl:token") is True
+    assert cache.stats()["size"] == 3
+
+    clock.now = 5
+    assert await cache.exists("bl:token") is False
+    assert cache.stats()["pinned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_non_positive_ttl_is_rejected(cache):
+    with pytest.raises(ValueError):
+        await cache.setex("bl:token", 0, "1")
+    assert await cache.exists("bl:token") is False
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(cache):
+    await cache.set("a", "1")
+    await cache.set("b", "2")
+    await cache.set("c", "3")
+    await cache.get("a")
+
+    await cache.set("d", "4")
+
+    assert await cache.exists("b") is False
+    assert await cache.get("a") == "1"
+    assert await cache.get("c") == "3"
+    assert await cache.get("d") == "4"
+
+
+@pytest.mark.asyncio
+async def test_get_many(cache):
+    await cache.set("a", "1")
+
+    assert await cache.get_many(["a", "b"]) == ["1", None]
+
+
+@pytest.mark.asyncio
+async def test_delete(cache):
+    await cache.set("a", "1")
+    await cache.delete("a")
+    await cache.delete("not-there")
+
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_delegates_to_client():
+    client = AsyncMock()
+    client.exists.return_value = 1
+    cache = RedisCache(client)
+
+    await cache.setex("bl:token", 60, "1")
+
+    assert await cache.exists("bl:token") is True
+    client.setex.assert_awaited_once_with("bl:token", 60, "1")
+
+
+@pytest.mark.asyncio
+async def test_redis_get_many_is_one_round_trip():
+    client = AsyncMock()
+    client.mget.return_value = [None, b"{}"]
+    cache = RedisCache(client)
+
+    assert await cache.get_many(["bl:token", "user:token"]) == [None, b"{}"]
+    client.mget.assert_awaited_once_with(["bl:token", "user:token"])
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_opens_breaker_on_errors(clock):
+    client = AsyncMock()
+    client.get.side_effect = RedisConnectionError("connection refused")
+    cache = RedisCache(
+        client, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=clock)
+    )
+
+    for _ in range(2):
+        with pytest.raises(CacheUnavailableError):
+            await cache.get("user:1")
+    with pytest.raises(CacheUnavailableError):
+        await cache.get("user:1")
+
+    assert client.get.await_count == 2
+    assert cache.stats()["breaker_state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_reconnects_after_reset_timeout(clock):
+    client = AsyncMock()
+    client.ping.side_effect = [RedisConnectionError("down"), True]
+    cache = RedisCache(
+        client, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    )
+
+    assert await cache.ping() is False
+    assert await cache.ping() is False
+
+    clock.now = 5
+    assert await cache.ping() is True
+    assert cache.stats()["breaker_state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_does_not_wedge_breaker(clock):
+    client = AsyncMock()
+    client.get.side_effect = [RedisConnectionError("down"), asyncio.CancelledError(), b"ok"]
+    cache = RedisCache(
+        client, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    )
+    with pytest.raises(CacheUnavailableError):
+        await cache.get("user:1")
+
+    clock.now = 5
+    with pytest.raises(asyncio.CancelledError):
+        await cache.get("user:1")
+    assert cache.stats()["breaker_state"] == "half_open"
+
+    assert await cache.get("user:1") == b"ok"
+    assert cache.stats()["breaker_state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_do_not_open_breaker(clock):
+    client = AsyncMock()
+    client.get.side_effect = [asyncio.CancelledError(), ValueError("bad key"), b"ok"]
+    cache = RedisCache(
+        client, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await cache.get("user:1")
+    with pytest.raises(ValueError):
+        await cache.get("user:1")
+
+    assert cache.stats()["breaker_state"] == "closed"
+    assert await cache.get("user:1") == b"ok"
+
+
+def test_me_degrades_to_database_when_cache_is_down(client, get_token, clock):
+    redis_mock = AsyncMock()
+    redis_mock.mget.side_effect = RedisConnectionError("down")
+    redis_mock.set.side_effect = RedisConnectionError("down")
+    cache = RedisCache(redis_mock, breaker=CircuitBreaker(clock=clock))
+
+    with patch("src.services.auth.cache_client", cache):
+        response = client.get(
+            "api/v1/users/me", headers={"Authorization": f"Bearer {get_token}"}
+        )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["username"] == test_user["username"]
@@ -0,0 +1,73 @@
+from src.utils.circuit_breaker import BreakerState, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=FakeClock())
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.allow() is True
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.allow() is False
+
+
+def test_half_open_allows_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+
+def test_trial_success_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.failures == 0
+
+
+def test_trial_failure_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == BreakerState.OPEN
+    clock.now = 19
+    assert breaker.allow() is False
+
+
+def test_abandoned_trial_expires_after_reset_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow() is True
+
+    clock.now = 15
+    assert breaker.allow() is False
+    clock.now = 20
+    assert breaker.allow() is True
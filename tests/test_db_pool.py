@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+
+from src.database.db import DatabaseSessionManager
+from src.database.pool import MonitoredAsyncQueuePool
+
+
+POOL_SIZE = 2
+MAX_OVERFLOW = 1
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=0.2,
+    )
+
+
+async def hold_connection(manager: DatabaseSessionManager, seconds: float) -> None:
+    async with manager.session() as session:
+        await session.execute(text("SELECT 1"))
+        await asyncio.sleep(seconds)
+
+
+async def run_load(manager: DatabaseSessionManager, concurrency: int) -> list:
+    return await asyncio.gather(
+        *(hold_connection(manager, 0.4) for _ in range(concurrency)),
+        return_exceptions=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_uses_configured_options(manager):
+    pool = manager.engine.pool
+
+    assert isinstance(pool, MonitoredAsyncQueuePool)
+    assert pool.size() == POOL_SIZE
+    assert pool.timeout() == 0.2
+    await manager.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_load_finds_pool_exhaustion(manager):
+    """Ramp concurrency until checkouts start timing out."""
+    exhausted_at = None
+    for concurrency in range(1, POOL_SIZE + MAX_OVERFLOW + 3):
+        results = await run_load(manager, concurrency)
+        if any(isinstance(r, exc.TimeoutError) for r in results):
+            exhausted_at = concurrency
+            break
+
+    status = manager.pool_status()
+    assert exhausted_at == POOL_SIZE + MAX_OVERFLOW + 1
+    assert status["timeouts"] >= 1
+    assert status["in_use_peak"] == POOL_SIZE + MAX_OVERFLOW
+    assert status["overflow_peak"] == MAX_OVERFLOW
+    assert status["wait_time_max_ms"] >= 200
+    assert status["checked_out"] == 0
+    await manager.engine.dispose()
@@ -0,0 +1,234 @@
+import json
+import socket
+from datetime import datetime, timedelta, timezone
+
+import aiosmtplib
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+from sqlalchemy import delete, select
+
+from conftest import TestingSessionLocal
+from main import cleanup_expired_tokens
+from src.repositories.email_job_repository import EmailJobRepository
+from src.entity.models import EmailJob, EmailJobStatus
+from src.services.email import (
+    EmailQueueService,
+    RESET_PASSWORD,
+    VERIFY_EMAIL,
+    build_message,
+)
+from src.services.email_worker import EmailWorker, retry_delay
+from src.services.smtp_pool import SmtpPool
+
+# jobs are enqueued at the real current time; the worker clock runs just ahead
+NOW = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+
+class Inbox:
+    def __init__(self, reject: bool = False):
+        self.messages = []
+        self.reject = reject
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.reject:
+            return "451 Try again later"
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def inbox():
+    handler = Inbox()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield handler, controller
+    controller.stop()
+
+
+@pytest.fixture
+def pool(inbox):
+    _, controller = inbox
+    connections = []
+
+    def connection_factory():
+        smtp = aiosmtplib.SMTP(
+            hostname=controller.hostname, port=controller.port, start_tls=False
+        )
+        connections.append(smtp)
+        return smtp
+
+    smtp_pool = SmtpPool(connection_factory, size=2)
+    smtp_pool.connections = connections
+    return smtp_pool
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def empty_queue():
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(EmailJob))
+        await session.commit()
+
+
+async def all_jobs() -> list[EmailJob]:
+    async with TestingSessionLocal() as session:
+        return list((await session.execute(select(EmailJob).order_by(EmailJob.id))).scalars())
+
+
+def make_worker(pool: SmtpPool, clock=lambda: NOW) -> EmailWorker:
+    return EmailWorker(pool, session_factory=TestingSessionLocal, batch_size=10, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_deduplicates_pending_jobs():
+    async with TestingSessionLocal() as session:
+        service = EmailQueueService(session)
+        await service.enqueue_reset_password_email("a@example.com", "a", "http://h/", "t1")
+        await service.enqueue_reset_password_email("a@example.com", "a", "http://h/", "t2")
+        await service.enqueue_verification_email("a@example.com", "a", "http://h/")
+
+    jobs = await all_jobs()
+    assert [job.kind for job in jobs] == [RESET_PASSWORD, VERIFY_EMAIL]
+    assert json.loads(jobs[0].context)["token"] == "t2"
+    assert all(job.status == EmailJobStatus.PENDING for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_leaves_claimed_jobs_alone():
+    async with TestingSessionLocal() as session:
+        await EmailQueueService(session).enqueue_reset_password_email(
+            "a@example.com", "a", "http://h/", "t1"
+        )
+    async with TestingSessionLocal() as session:
+        await EmailJobRepository(session).claim_batch(10, NOW, 60)
+    async with TestingSessionLocal() as session:
+        await EmailQueueService(session).enqueue_reset_password_email(
+            "a@example.com", "a", "http://h/", "t2"
+        )
+    [claimed] = await all_jobs()
+
+    # the lease ran out after a failed attempt: the job is due again
+    async with TestingSessionLocal() as session:
+        job = await session.get(EmailJob, claimed.id)
+        job.attempts = 2
+        job.next_attempt_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        await session.commit()
+    async with TestingSessionLocal() as session:
+        await EmailQueueService(session).enqueue_reset_password_email(
+            "a@example.com", "a", "http://h/", "t3"
+        )
+    [refreshed] = await all_jobs()
+
+    assert json.loads(claimed.context)["token"] == "t1"
+    assert json.loads(refreshed.context)["token"] == "t3"
+    assert refreshed.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_sends_batch_over_pooled_connections(inbox, pool):
+    handler, _ = inbox
+    async with TestingSessionLocal() as session:
+        service = EmailQueueService(session)
+        for i in range(5):
+            await service.enqueue_verification_email(f"user{i}@example.com", f"user{i}", "http://h/")
+
+    worker = make_worker(pool)
+    assert await worker.run_once() == 5
+    assert await worker.run_once() == 0
+    await pool.close()
+
+    assert len(handler.messages) == 5
+    assert len(pool.connections) <= pool.size
+    jobs = await all_jobs()
+    assert {job.status for job in jobs} == {EmailJobStatus.SENT}
+    assert all(job.context == "{}" and job.dedupe_key is None for job in jobs)
+    assert all(job.attempts == 1 for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connection(pool, inbox):
+    handler, _ = inbox
+    async with TestingSessionLocal() as session:
+        await EmailQueueService(session).enqueue_verification_email(
+            "x@example.com", "x", "http://h/"
+        )
+    message = (await all_jobs())[0]
+    for _ in range(3):
+        await pool.send(build_message(message.kind, message.recipient, json.loads(message.context)))
+    await pool.close()
+
+    assert len(handler.messages) == 3
+    assert len(pool.connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_back_off_then_fail(inbox, pool, monkeypatch):
+    handler, _ = inbox
+    handler.reject = True
+    monkeypatch.setattr("src.services.email_worker.settings.EMAIL_MAX_ATTEMPTS", 2)
+    async with TestingSessionLocal() as session:
+        await EmailQueueService(session).enqueue_verification_email(
+            "late@example.com", "late", "http://h/"
+        )
+
+    clock = [NOW]
+    worker = make_worker(pool, clock=lambda: clock[0])
+    assert await worker.run_once() == 1
+    job = (await all_jobs())[0]
+    assert job.status == EmailJobStatus.PENDING
+    assert job.attempts == 1
+    assert "451" in job.last_error
+    # not due again until the backoff has elapsed
+    assert await worker.run_once() == 0
+
+    clock[0] = NOW + timedelta(hours=2)
+    assert await worker.run_once() == 1
+    await pool.close()
+    job = (await all_jobs())[0]
+    assert job.status == EmailJobStatus.FAILED
+    assert job.attempts == 2
+    assert job.context == "{}"
+    assert handler.messages == []
+
+
+def test_retry_delay_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr("src.services.email_worker.settings.EMAIL_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr("src.services.email_worker.settings.EMAIL_RETRY_MAX_SECONDS", 100)
+    assert 8 <= retry_delay(1) <= 12
+    assert 16 <= retry_delay(2) <= 24
+    assert 80 <= retry_delay(10) <= 120
+
+
+@pytest.mark.asyncio
+async def test_cleanup_purges_old_finished_jobs_in_batches(monkeypatch):
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            [
+                EmailJob(
+                    kind=VERIFY_EMAIL,
+                    recipient=f"{status.value}@x",
+                    status=status,
+                    created_at=old,
+                )
+                for status in EmailJobStatus
+            ]
+            + [
+                EmailJob(
+                    kind=VERIFY_EMAIL, recipient="recent@x", status=EmailJobStatus.SENT
+                )
+            ]
+        )
+        await session.commit()
+
+    monkeypatch.setattr("main.sessionmanager.session", TestingSessionLocal)
+    monkeypatch.setattr("main.settings.TOKEN_CLEANUP_BATCH_SIZE", 1)
+    await cleanup_expired_tokens()
+
+    assert sorted(job.recipient for job in await all_jobs()) == ["PENDING@x", "recent@x"]
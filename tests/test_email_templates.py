@@ -0,0 +1,51 @@
+import pytest
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from src.services.email import TEMPLATE_FOLDER
+from src.services.email_templates import TemplateRenderer
+
+TEMPLATES = ["verify_email.html", "reset_password.html"]
+
+
+@pytest.fixture
+def jinja():
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER), autoescape=select_autoescape(["html"])
+    )
+
+
+@pytest.mark.parametrize("name", TEMPLATES)
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"username": "Yurii", "host": "http://testserver/", "token": "abc.def.ghi"},
+        {"username": "<b>O'Neil & co</b>", "host": "http://h/?a=1&b=2", "token": 42},
+        {"username": None, "host": "http://h/"},
+    ],
+)
+def test_compiled_render_matches_jinja(jinja, name, context):
+    renderer = TemplateRenderer(TEMPLATE_FOLDER, TEMPLATES)
+
+    assert renderer.get(name).parts is not None
+    assert renderer.render(name, context) == jinja.get_template(name).render(**context)
+
+
+def test_render_batch_keeps_order():
+    renderer = TemplateRenderer(TEMPLATE_FOLDER, TEMPLATES)
+    contexts = [{"username": f"user{n}", "host": "h/", "token": "t"} for n in range(3)]
+
+    bodies = renderer.render_batch("verify_email.html", contexts)
+
+    assert [f"Hi user{n}," in body for n, body in enumerate(bodies)] == [True] * 3
+
+
+def test_templates_with_logic_fall_back_to_jinja(tmp_path):
+    (tmp_path / "digest.html").write_text(
+        "{% for name in names %}<p>{{ name|upper }}</p>{% endfor %}"
+    )
+    renderer = TemplateRenderer(tmp_path)
+
+    assert renderer.get("digest.html").parts is None
+    assert renderer.render("digest.html", {"names": ["a", "<b>"]}) == (
+        "<p>A</p><p>&lt;B&gt;</p>"
+    )
@@ -0,0 +1,17 @@
+from src.utils.gravatar import gravatar_url
+
+
+def test_gravatar_url_is_normalized_md5():
+    # reference value from the Gravatar and libgravatar documentation
+    expected = "https://www.gravatar.com/avatar/0bc83cb571cd1c50ba6f3e8a78ef1346"
+
+    assert gravatar_url("myemailaddress@example.com") == expected
+    assert gravatar_url("  MyEmailAddress@Example.com ") == expected
+
+
+def test_gravatar_url_is_cached():
+    gravatar_url.cache_clear()
+    gravatar_url("cached@example.com")
+    gravatar_url("cached@example.com")
+
+    assert gravatar_url.cache_info().hits == 1
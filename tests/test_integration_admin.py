@@ -0,0 +1,49 @@
+def test_cache_stats(client, get_token):
+    response = client.get(
+        "api/v1/admin/cache", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["healthy"] is True
+    assert data["backend"] == "InMemoryCache"
+
+
+def test_cache_stats_requires_auth(client):
+    response = client.get("api/v1/admin/cache")
+    assert response.status_code == 401
+
+
+def test_db_pool_stats(client, get_token):
+    response = client.get(
+        "api/v1/admin/db-pool", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert "checkouts" in data
+    assert "wait_time_max_ms" in data
+
+
+def test_loop_stalls_disabled_by_default(client, get_token):
+    response = client.get(
+        "api/v1/admin/loop-stalls", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"enabled": False, "threshold_ms": 100.0, "stalls": []}
+
+
+def test_profile_collapsed_output(client, get_token):
+    response = client.post(
+        "api/v1/admin/profile?seconds=0.1&format=collapsed",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text.strip()
+
+
+def test_profile_duration_is_bounded(client, get_token):
+    response = client.post(
+        "api/v1/admin/profile?seconds=600",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 422
@@ -2,9 +2,11 @@ import pytest
 import pytest_asyncio
 from unittest.mock import Mock, AsyncMock, patch
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
-from src.entity.models import User
-from tests.conftest import TestingSessionLocal
+from src.entity.models import User, EmailJob, EmailJobStatus
+from src.services.auth import unique_violation_detail
+from conftest import TestingSessionLocal
 
 # Тестові дані для нового користувача
 new_user_data = {
@@ -29,13 +31,9 @@ duplicate_email_data = {
 
 
 @pytest.mark.asyncio
-async def test_register_success(client, monkeypatch):
+async def test_register_success(client):
     """Успішна реєстрація"""
-    mock_send_email = AsyncMock()
-    monkeypatch.setattr("src.services.email.send_email", mock_send_email)
-
     response = client.post("/api/v1/auth/register", json=new_user_data)
-    await mock_send_email("test@example.com", "testuser", "http://testserver/")
 
     assert response.status_code == 201, response.text
     data = response.json()
@@ -44,18 +42,20 @@ async def test_register_success(client, monkeypatch):
     assert "hash_password" not in data
     assert "id" in data
 
-    mock_send_email.assert_called_once_with(
-        "test@example.com", "testuser", "http://testserver/"
-    )
-    mock_send_email.assert_called_once()
+    async with TestingSessionLocal() as session:
+        jobs = (
+            await session.execute(
+                select(EmailJob).where(EmailJob.recipient == new_user_data["email"])
+            )
+        ).scalars().all()
+    assert len(jobs) == 1
+    assert jobs[0].kind == "verify_email"
+    assert jobs[0].status == EmailJobStatus.PENDING
 
 
 @pytest.mark.asyncio
-async def test_register_duplicate_username(client, monkeypatch):
+async def test_register_duplicate_username(client):
     """Реєстрація з уже існуючим ім’ям користувача"""
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.services.email.send_email", mock_send_email)
-
     response = client.post("/api/v1/auth/register", json=duplicate_username_data)
 
     assert response.status_code == 409, response.text
@@ -63,17 +63,32 @@ async def test_register_duplicate_username(client, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_register_duplicate_email(client, monkeypatch):
+async def test_register_duplicate_email(client):
     """Реєстрація з уже існуючою електронною поштою"""
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.services.email.send_email", mock_send_email)
-
     response = client.post("/api/v1/auth/register", json=duplicate_email_data)
 
     assert response.status_code == 409, response.text
     assert "Email aleready exists" in response.json().get("detail", "")
 
 
+def postgres_unique_violation(constraint_name: str) -> IntegrityError:
+    cause = Exception("duplicate key value violates unique constraint")
+    cause.constraint_name = constraint_name
+    orig = Exception("IntegrityError")
+    orig.__cause__ = cause
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+def test_unique_violation_detail_maps_constraint_names():
+    assert unique_violation_detail(postgres_unique_violation("users_username_key")) == (
+        "User aleready exists"
+    )
+    assert unique_violation_detail(postgres_unique_violation("users_email_key")) == (
+        "Email aleready exists"
+    )
+    assert unique_violation_detail(postgres_unique_violation("users_pkey")) is None
+
+
 @pytest.mark.asyncio
 async def test_login_with_unconfirmed_email(client):
     """Спроба входу без підтвердженої пошти"""
@@ -158,9 +173,9 @@ def test_refresh_token(client):
 
 
 def test_logout(client):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.post("api/v1/auth/login",
                                data={"username": new_user_data.get("username"), "password": new_user_data.get("password")})
@@ -170,4 +185,19 @@ def test_logout(client):
         refresh_token = data.get("refresh_token")
         response = client.post("api/v1/auth/logout", json={"refresh_token": refresh_token},
                                headers={"Authorization": f"Bearer {access_token}"})
-        assert response.status_code == 204, response.text
\ No newline at end of file
+        assert response.status_code == 204, response.text
+
+def test_refresh_token_rotation(client):
+    response = client.post("api/v1/auth/login",
+                           data={"username": new_user_data.get("username"), "password": new_user_data.get("password")})
+    old_refresh_token = response.json().get("refresh_token")
+
+    response = client.post("api/v1/auth/refresh", json={"refresh_token": old_refresh_token})
+    assert response.status_code == 200, response.text
+    new_refresh_token = response.json().get("refresh_token")
+
+    response = client.post("api/v1/auth/refresh", json={"refresh_token": old_refresh_token})
+    assert response.status_code == 401, response.text
+
+    response = client.post("api/v1/auth/refresh", json={"refresh_token": new_refresh_token})
+    assert response.status_code == 200, response.text
@@ -1,10 +1,10 @@
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 
 def test_create_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
         contact_data = {
             "first_name": "John",
             "last_name": "Doe",
@@ -27,9 +27,9 @@ def test_create_contact(client, get_token):
 
 
 def test_get_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.get(
             "api/v1/contacts/1",
@@ -43,9 +43,9 @@ def test_get_contact(client, get_token):
 
 
 def test_get_contact_not_found(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.get(
             "/api/v1/contacts/999",
@@ -56,9 +56,9 @@ def test_get_contact_not_found(client, get_token):
 
 
 def test_get_contacts_list(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.get(
             "/api/v1/contacts/",
@@ -71,9 +71,9 @@ def test_get_contacts_list(client, get_token):
 
 
 def test_update_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         update_data = {
             "first_name": "Updated",
@@ -94,9 +94,9 @@ def test_update_contact(client, get_token):
 
 
 def test_update_contact_not_found(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.put(
             "/api/v1/contacts/999",
@@ -108,9 +108,9 @@ def test_update_contact_not_found(client, get_token):
 
 
 def test_delete_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.delete(
             f"/api/v1/contacts/1",
@@ -120,9 +120,9 @@ def test_delete_contact(client, get_token):
 
 
 def test_search_contacts(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.get(
             "/api/v1/contacts/search/?query=Test",
@@ -134,9 +134,9 @@ def test_search_contacts(client, get_token):
 
 
 def test_get_birthdays(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
+        cache_mock.setex.return_value = True
 
         response = client.get(
             "/api/v1/contacts/birthdays/?days=7",
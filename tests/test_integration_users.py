@@ -1,13 +1,22 @@
+import io
+
 import pytest
-from unittest.mock import patch
-from conftest import test_user
+from unittest.mock import AsyncMock, patch
+from PIL import Image
+from sqlalchemy import event
+
+from conftest import test_user, engine, TestingSessionLocal
+from main import app
+from src.services.avatar import AvatarPipeline
+from src.services.user import UserService
+from src.utils.email_token import create_email_token
+from src.utils.get_services import get_auth_service, get_user_service, get_avatar_pipeline
 
 
 
 def test_me(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
+    with patch("src.services.auth.cache_client", new_callable=AsyncMock) as cache_mock:
+        cache_mock.get_many.return_value = [None, None]
 
         response = client.get(
             "api/v1/users/me", headers={"Authorization": f"Bearer {get_token}"}
@@ -20,25 +29,127 @@ def test_me(client, get_token):
         assert data["username"] == test_user["username"]
 
 
-@patch("src.services.upload_file.UploadFileService.upload_file")
-def test_update_avatar_user(mock_upload_file, client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        fake_url = "http://example.com/avatar.jpg"
-        mock_upload_file.return_value = fake_url
+def png_bytes(width: int = 400, height: int = 300) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(output, format="PNG")
+    return output.getvalue()
 
-        
-        headers = {"Authorization": f"Bearer {get_token}"}
 
-        file_data = {"file": ("avatar.jpg", b"fake image content", "image/jpeg")}
+class RecordingPipeline(AvatarPipeline):
+    def __init__(self):
+        super().__init__(storage=None, workers=1)
+        self.scheduled = []
 
-        response = client.patch("/api/v1/users/avatar", headers=headers, files=file_data)
+    def schedule_upload(self, user, avatar):
+        self.scheduled.append((user.username, avatar))
 
-        assert response.status_code == 200, response.text
 
-        data = response.json()
-        assert data["username"] == test_user["username"]
-        assert data["email"] == test_user["email"]
-        assert data["avatar"] == fake_url
+@pytest.fixture
+def avatar_pipeline():
+    pipeline = RecordingPipeline()
+    app.dependency_overrides[get_avatar_pipeline] = lambda: pipeline
+    yield pipeline
+    del app.dependency_overrides[get_avatar_pipeline]
+    pipeline.executor.shutdown()
+
+
+def test_update_avatar_user(avatar_pipeline, client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    file_data = {"file": ("avatar.png", png_bytes(), "image/png")}
+
+    response = client.patch("/api/v1/users/avatar", headers=headers, files=file_data)
+
+    assert response.status_code == 202, response.text
+    data = response.json()
+    assert data["username"] == test_user["username"]
+    assert data["email"] == test_user["email"]
+    [(username, avatar)] = avatar_pipeline.scheduled
+    assert username == test_user["username"]
+    assert sorted(avatar.variants) == [64, 128, 250]
+    with Image.open(io.BytesIO(avatar.variants[250])) as image:
+        assert (image.format, image.size) == ("WEBP", (250, 250))
+
+
+@pytest.mark.parametrize(
+    "file_data, status_code",
+    [
+        (("avatar.txt", b"hello", "text/plain"), 415),
+        (("avatar.png", b"not really a png", "image/png"), 415),
+        (("avatar.png", b"\x89PNG\r\n\x1a\n" + b"0" * 100, "image/png"), 422),
+    ],
+)
+def test_update_avatar_rejects_bad_files(
+    avatar_pipeline, client, get_token, file_data, status_code
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.patch(
+        "/api/v1/users/avatar", headers=headers, files={"file": file_data}
+    )
+
+    assert response.status_code == status_code, response.text
+    assert avatar_pipeline.scheduled == []
+
+
+def test_update_avatar_rejects_oversized_body(avatar_pipeline, client, get_token, monkeypatch):
+    monkeypatch.setattr("src.routes.v1.users.settings.AVATAR_MAX_BYTES", 1000)
+    headers = {"Authorization": f"Bearer {get_token}"}
+    file_data = {"file": ("avatar.png", png_bytes(), "image/png")}
+
+    response = client.patch("/api/v1/users/avatar", headers=headers, files=file_data)
+
+    assert response.status_code == 413, response.text
+    assert avatar_pipeline.scheduled == []
+
+
+def test_me_warm_cache_checks_out_no_connection(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.get("api/v1/users/me", headers=headers)
+    checkouts = []
+    listener = lambda *args: checkouts.append(args)
+    event.listen(engine.sync_engine, "checkout", listener)
+    try:
+        response = client.get("api/v1/users/me", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "checkout", listener)
+
+    assert response.status_code == 200, response.text
+    assert checkouts == []
+
+
+def test_user_service_reuses_request_auth_service():
+    session = AsyncMock()
+    auth_service = get_auth_service(session)
+
+    user_service = get_user_service(session, auth_service)
+
+    assert user_service.auth_service is auth_service
+
+
+@pytest.mark.asyncio
+async def test_avatar_update_evicts_cached_user(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    before = client.get("api/v1/users/me", headers=headers).json()["avatar"]
+
+    async with TestingSessionLocal() as session:
+        updated = await UserService(session).update_avatar_url(
+            test_user["email"], "https://cdn.example.com/new.webp"
+        )
+    after = client.get("api/v1/users/me", headers=headers).json()["avatar"]
+    async with TestingSessionLocal() as session:
+        await UserService(session).update_avatar_url(test_user["email"], before)
+
+    assert updated.username == test_user["username"]
+    assert after == "https://cdn.example.com/new.webp"
+
+
+def test_confirmed_email_repeat_and_unknown(client):
+    repeat = client.get(
+        f"api/v1/users/confirmed_email/{create_email_token({'sub': test_user['email']})}"
+    )
+    unknown = client.get(
+        f"api/v1/users/confirmed_email/{create_email_token({'sub': 'nobody@example.com'})}"
+    )
 
-        mock_upload_file.assert_called_once()
\ No newline at end of file
+    assert repeat.json() == {"message": "Your email has already confirmed"}
+    assert unknown.status_code == 400
@@ -0,0 +1,29 @@
+from benchmarks.load_test import compare, percentile
+
+BASELINE = {
+    "list": {"requests": 100, "errors": 0, "rps": 50.0, "p50_ms": 5.0, "p95_ms": 10.0, "p99_ms": 20.0},
+}
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_within_tolerance():
+    report = {"list": {**BASELINE["list"], "rps": 45.0, "p95_ms": 11.5}}
+
+    assert compare(report, BASELINE, tolerance=0.2) == []
+
+
+def test_compare_flags_regressions():
+    report = {"list": {**BASELINE["list"], "rps": 30.0, "p95_ms": 15.0, "errors": 2}}
+
+    regressions = compare(report, BASELINE, tolerance=0.2)
+
+    assert len(regressions) == 3
+    assert compare({}, BASELINE, tolerance=0.2) == ["list: missing from this run"]
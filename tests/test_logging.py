@@ -0,0 +1,82 @@
+import io
+import json
+import logging
+
+import pytest
+
+from src.utils.log_config import (
+    DebugSamplingFilter,
+    JsonFormatter,
+    request_id_var,
+    setup_logging,
+)
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("uvicorn.error", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_request_id_and_extra():
+    record = make_record(request_id="abc123", deleted=3)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc123"
+    assert entry["deleted"] == 3
+
+
+def test_debug_sampling_is_consistent_per_request():
+    sampler = DebugSamplingFilter(0.5)
+    decisions = {}
+    for n in range(200):
+        request_id = f"request-{n}"
+        first = sampler.filter(make_record(logging.DEBUG, request_id=request_id))
+        second = sampler.filter(make_record(logging.DEBUG, request_id=request_id))
+        assert first == second
+        decisions[request_id] = first
+
+    assert 50 < sum(decisions.values()) < 150
+    assert sampler.filter(make_record(logging.WARNING, request_id="request-0"))
+    assert not DebugSamplingFilter(0.0).filter(make_record(logging.DEBUG, request_id="x"))
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_setup_logging_writes_json_off_thread(restore_root_logger):
+    stream = io.StringIO()
+    listener = setup_logging(level="INFO", fmt="json", debug_sample_rate=1.0, stream=stream)
+    token = request_id_var.set("req-42")
+    try:
+        logging.getLogger("uvicorn.error").info("Saved %d contacts", 2)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("uvicorn.error").exception("Failed")
+    finally:
+        request_id_var.reset(token)
+        listener.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["message"] == "Saved 2 contacts"
+    assert lines[0]["request_id"] == "req-42"
+    assert "ValueError: boom" in lines[1]["exc_info"]
+
+
+def test_request_id_header(client):
+    response = client.get("/api/v1/health/", headers={"X-Request-ID": "trace-1"})
+    assert response.headers["X-Request-ID"] == "trace-1"
+
+    response = client.get("/api/v1/health/", headers={"X-Request-ID": "bad id\n"})
+    assert response.headers["X-Request-ID"] != "bad id\n"
+    assert len(response.headers["X-Request-ID"]) == 32
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from src.utils.loop_monitor import LoopLagMonitor
+from src.utils.metrics import event_loop_lag
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+async def handler():
+    blocking_call()
+
+
+@pytest.mark.asyncio
+async def test_captures_stack_of_blocking_call():
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    samples_before = event_loop_lag.count()
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        await asyncio.create_task(handler(), name="slow-handler")
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert not monitor.running
+    assert event_loop_lag.count() > samples_before
+    assert len(monitor.reports) == 1
+    report = monitor.reports[0]
+    assert report.lag_ms >= 200
+    assert report.task == "slow-handler (handler)"
+    assert any("blocking_call" in line for line in report.stack)
+
+
+@pytest.mark.asyncio
+async def test_no_reports_without_stalls():
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.2)
+    monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    assert list(monitor.reports) == []
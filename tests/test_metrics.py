@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import text
+
+from src.database.db import DatabaseSessionManager
+from src.database.instrumentation import statement_operation
+from src.utils.metrics import (
+    MetricsRegistry,
+    db_query_duration,
+    scheduler_job_duration,
+    track_job,
+)
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("result",))
+    registry.gauge("queue_depth", "Depth.", callback=lambda: 3)
+
+    counter.inc(result="hit")
+    counter.inc(2, result="miss")
+
+    output = registry.render()
+    assert "# TYPE requests_total counter" in output
+    assert 'requests_total{result="hit"} 1' in output
+    assert 'requests_total{result="miss"} 2' in output
+    assert "queue_depth 3" in output
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.1, route="/a")
+    histogram.observe(5, route="/a")
+
+    output = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'latency_seconds_count{route="/a"} 3' in output
+    assert 'latency_seconds_sum{route="/a"} 5.15' in output
+
+
+def test_duplicate_registration_fails():
+    registry = MetricsRegistry()
+    registry.counter("x_total", "X.")
+
+    with pytest.raises(ValueError):
+        registry.counter("x_total", "X.")
+
+
+def test_statement_operation():
+    assert statement_operation("  select 1") == "SELECT"
+    assert statement_operation("DELETE FROM t") == "DELETE"
+    assert statement_operation("PRAGMA foreign_keys") == "OTHER"
+
+
+@pytest.mark.asyncio
+async def test_track_job_records_duration():
+    @track_job("test_job")
+    async def job():
+        return 42
+
+    assert await job() == 42
+    assert scheduler_job_duration.count(job="test_job", status="ok") == 1
+
+
+def test_metrics_endpoint(client, get_token):
+    client.get("/api/v1/contacts/", headers={"Authorization": f"Bearer {get_token}"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/contacts/",status="200"}'
+        in body
+    )
+    assert "auth_cache_requests_total" in body
+    assert "http_requests_in_progress" in body
+
+
+@pytest.mark.asyncio
+async def test_db_queries_are_timed(tmp_path):
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'm.db'}")
+    before = db_query_duration.count(operation="SELECT")
+
+    async with manager.session() as session:
+        await session.execute(text("SELECT 1"))
+
+    assert db_query_duration.count(operation="SELECT") == before + 1
+    await manager.engine.dispose()
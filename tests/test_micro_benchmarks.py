@@ -0,0 +1,15 @@
+from benchmarks.micro import cases, run_case
+
+
+def test_run_case_reports_throughput_and_allocations():
+    result = run_case("alloc", lambda: bytearray(10_000), min_time=0.01)
+
+    assert result.ops_per_sec > 0
+    assert result.alloc_bytes_per_op >= 10_000
+    assert result.blocks_per_op < 1
+
+
+def test_every_case_runs():
+    for name, func in cases().items():
+        if name != "verify_password":
+            assert func() is not None, name
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from conftest import TestingSessionLocal
+from src.entity.models import PasswordResetToken, User
+from src.repositories.password_reset_token_repository import (
+    PasswordResetTokenRepository,
+)
+from src.services.auth import AuthService
+
+reset_user = {
+    "username": "reset_user",
+    "email": "reset_user@example.com",
+    "password": "old-password",
+}
+
+
+@pytest.fixture(scope="module")
+def registered(client):
+    response = client.post("/api/v1/auth/register", json=reset_user)
+    assert response.status_code == 201, response.text
+
+
+def request_reset(client, token: str):
+    with patch("src.services.auth.create_reset_password_token", return_value=token):
+        return client.post(
+            "/api/v1/auth/request_reset_password", json={"email": reset_user["email"]}
+        )
+
+
+@pytest.mark.asyncio
+async def test_reset_token_is_stored_hashed_and_single_use(client, registered):
+    response = request_reset(client, "raw-reset-token")
+    assert response.json() == {"message": "Check your email address"}
+
+    async with TestingSessionLocal() as session:
+        stored = (
+            await session.execute(
+                select(PasswordResetToken.token_hash).join(User).filter(
+                    User.email == reset_user["email"]
+                )
+            )
+        ).scalar_one()
+    assert stored == AuthService(None).hash_token("raw-reset-token")
+
+    first = client.post(
+        "/api/v1/auth/reset_password/?token=raw-reset-token",
+        json={"new_password": "new-password"},
+    )
+    second = client.post(
+        "/api/v1/auth/reset_password/?token=raw-reset-token",
+        json={"new_password": "other-password"},
+    )
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 400
+    async with TestingSessionLocal() as session:
+        user = (
+            await session.execute(select(User).filter_by(email=reset_user["email"]))
+        ).scalar_one()
+        assert AuthService(session)._verify_password("new-password", user.hashed_password)
+
+
+def test_reset_password_rejects_unknown_token(client, registered):
+    response = client.post(
+        "/api/v1/auth/reset_password/?token=never-issued",
+        json={"new_password": "new-password"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Token wrong"
+
+
+@pytest.mark.asyncio
+async def test_reset_password_for_deleted_user_is_rejected():
+    async with TestingSessionLocal() as session:
+        auth_service = AuthService(session)
+        with patch.object(
+            auth_service.password_reset_token_repository, "consume", return_value=999999
+        ):
+            with pytest.raises(HTTPException) as exc:
+                await auth_service.reset_password("orphaned-token", "new-password")
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Token wrong"
+
+
+def test_request_reset_for_unknown_email(client):
+    response = client.post(
+        "/api/v1/auth/request_reset_password", json={"email": "nobody@example.com"}
+    )
+
+    assert response.json() == {"message": "Incorrect email"}
+
+
+@pytest.mark.asyncio
+async def test_expired_and_used_tokens_are_purged_in_batches(client, registered):
+    now = datetime.now(timezone.utc)
+    async with TestingSessionLocal() as session:
+        await session.execute(PasswordResetToken.__table__.delete())
+        user_id = (
+            await session.execute(select(User.id).filter_by(email=reset_user["email"]))
+        ).scalar_one()
+        session.add_all(
+            [
+                PasswordResetToken(
+                    user_id=user_id,
+                    token_hash=f"expired-{i}",
+                    expired_at=now - timedelta(minutes=1),
+                )
+                for i in range(3)
+            ]
+            + [
+                PasswordResetToken(
+                    user_id=user_id,
+                    token_hash="used",
+                    expired_at=now + timedelta(hours=1),
+                    used_at=now,
+                ),
+                PasswordResetToken(
+                    user_id=user_id, token_hash="live", expired_at=now + timedelta(hours=1)
+                ),
+            ]
+        )
+        await session.commit()
+
+        repository = PasswordResetTokenRepository(session)
+        assert await repository.consume("expired-0", now) is None
+        assert await repository.delete_expired(now, limit=3) == 3
+        assert await repository.delete_expired(now, limit=3) == 1
+        assert await repository.delete_expired(now, limit=3) == 0
+        remaining = (
+            await session.execute(select(PasswordResetToken.token_hash))
+        ).scalars().all()
+
+    assert remaining == ["live"]
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.profiler import IDLE, ProfilerBusyError, SamplingProfiler, memory_diff
+
+
+def spin(seconds: float):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_samples_threads_into_collapsed_stacks():
+    profiler = SamplingProfiler()
+    worker = threading.Thread(target=spin, args=(0.3,), name="spinner")
+    worker.start()
+    result = await profiler.run(0.1, 0.005)
+    worker.join()
+
+    assert result["samples"] > 5
+    assert result["routes"].get(IDLE, 0) > 0
+    lines = result["collapsed"].splitlines()
+    assert any(line.startswith("spinner;") and "spin (test_profiler.py" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert not profiler.active
+
+
+@pytest.mark.asyncio
+async def test_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    running = asyncio.create_task(profiler.run(0.1, 0.01))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ProfilerBusyError):
+        await profiler.run(0.1, 0.01)
+    await running
+
+
+@pytest.mark.asyncio
+async def test_memory_diff_reports_growth():
+    retained = []
+
+    async def allocate():
+        await asyncio.sleep(0.01)
+        retained.extend(bytearray(1000) for _ in range(500))
+
+    task = asyncio.create_task(allocate())
+    result = await memory_diff(0.1, limit=5)
+    await task
+
+    assert result["size_diff_bytes"] >= 500_000
+    assert result["top"][0]["size_diff_bytes"] >= 500_000
+    assert any("test_profiler.py" in line for line in result["top"][0]["traceback"])
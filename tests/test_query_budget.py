@@ -0,0 +1,272 @@
+"""
+Round-trip budgets for every endpoint in ``src/routes/v1``.
+
+Each test runs one request against a warm auth cache and checks the SQL
+statements and cache commands it issued against ``BUDGETS``. A change that
+adds a round trip fails here and has to update the budget deliberately.
+"""
+
+import io
+from typing import NamedTuple
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi.routing import APIRoute
+from PIL import Image
+
+from conftest import test_user
+from main import app
+from src.routes.v1.users import Limiter
+from src.utils.email_token import create_email_token
+from src.utils.get_services import get_avatar_pipeline
+
+
+class Budget(NamedTuple):
+    sql: int
+    cache: int
+
+
+BUDGETS = {
+    "POST /api/v1/auth/register": Budget(sql=2, cache=0),
+    "POST /api/v1/auth/login": Budget(sql=3, cache=0),
+    "POST /api/v1/auth/refresh": Budget(sql=6, cache=0),
+    "POST /api/v1/auth/request_reset_password": Budget(sql=3, cache=0),
+    "POST /api/v1/auth/reset_password/": Budget(sql=2, cache=1),
+    "POST /api/v1/auth/logout": Budget(sql=2, cache=1),
+    "GET /api/v1/users/me": Budget(sql=0, cache=1),
+    "GET /api/v1/users/confirmed_email/{token}": Budget(sql=1, cache=1),
+    "POST /api/v1/users/request_email": Budget(sql=2, cache=0),
+    "PATCH /api/v1/users/avatar": Budget(sql=0, cache=1),
+    "GET /api/v1/contacts/": Budget(sql=1, cache=1),
+    "GET /api/v1/contacts/{contact_id}": Budget(sql=1, cache=1),
+    "POST /api/v1/contacts/": Budget(sql=2, cache=1),
+    "PUT /api/v1/contacts/{contact_id}": Budget(sql=3, cache=1),
+    "DELETE /api/v1/contacts/{contact_id}": Budget(sql=2, cache=1),
+    "GET /api/v1/contacts/search/": Budget(sql=1, cache=1),
+    "GET /api/v1/contacts/birthdays/": Budget(sql=1, cache=1),
+    "GET /api/v1/admin/cache": Budget(sql=0, cache=1),
+    "GET /api/v1/admin/db-pool": Budget(sql=0, cache=1),
+    "GET /api/v1/admin/loop-stalls": Budget(sql=0, cache=1),
+    "POST /api/v1/admin/profile": Budget(sql=0, cache=1),
+    "POST /api/v1/admin/profile/memory": Budget(sql=0, cache=1),
+}
+
+new_user = {
+    "username": "budget_user",
+    "email": "budget_user@example.com",
+    "password": "budget-password",
+}
+contact = {
+    "first_name": "Budget",
+    "last_name": "Contact",
+    "email": "budget_contact@example.com",
+    "phone": "+380991112233",
+    "birthday": "1990-01-01",
+}
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch):
+    monkeypatch.setattr(Limiter, "enabled", False)
+
+
+@pytest.fixture
+def headers(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # warm the auth user cache
+    assert client.get("/api/v1/contacts/", headers=headers).status_code == 200
+    return headers
+
+
+def assert_within_budget(recorder, endpoint: str) -> None:
+    budget = BUDGETS[endpoint]
+    statements = "\n".join(recorder.statements)
+    assert len(recorder.statements) <= budget.sql, (
+        f"{endpoint} issued {len(recorder.statements)} SQL statements, "
+        f"budget is {budget.sql}:\n{statements}"
+    )
+    assert len(recorder.cache_commands) <= budget.cache, (
+        f"{endpoint} issued {len(recorder.cache_commands)} cache commands, "
+        f"budget is {budget.cache}: {recorder.cache_commands}"
+    )
+
+
+def test_every_route_has_a_budget():
+    routes = {
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path.startswith("/api/v1/")
+        and not route.path.startswith("/api/v1/health")
+        for method in route.methods
+    }
+
+    assert routes - BUDGETS.keys() == set()
+
+
+def test_register(client, round_trips):
+    with round_trips.recording():
+        response = client.post("/api/v1/auth/register", json=new_user)
+    assert response.status_code == 201, response.text
+    assert_within_budget(round_trips, "POST /api/v1/auth/register")
+
+
+def test_confirmed_email(client, round_trips):
+    token = create_email_token({"sub": new_user["email"]})
+    with round_trips.recording():
+        response = client.get(f"/api/v1/users/confirmed_email/{token}")
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "GET /api/v1/users/confirmed_email/{token}")
+
+
+def test_request_email(client, round_trips):
+    with round_trips.recording():
+        response = client.post(
+            "/api/v1/users/request_email", json={"email": new_user["email"]}
+        )
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "POST /api/v1/users/request_email")
+
+
+def login(client) -> dict:
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": new_user["username"], "password": new_user["password"]},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_login(client, round_trips):
+    with round_trips.recording():
+        login(client)
+    assert_within_budget(round_trips, "POST /api/v1/auth/login")
+
+
+def test_refresh(client, round_trips):
+    tokens = login(client)
+    with round_trips.recording():
+        response = client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "POST /api/v1/auth/refresh")
+
+
+def test_logout(client, round_trips):
+    tokens = login(client)
+    with round_trips.recording():
+        response = client.post(
+            "/api/v1/auth/logout",
+            json={"refresh_token": tokens["refresh_token"]},
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+    assert response.status_code == 204, response.text
+    assert_within_budget(round_trips, "POST /api/v1/auth/logout")
+
+
+def test_request_reset_password(client, round_trips):
+    with round_trips.recording():
+        response = client.post(
+            "/api/v1/auth/request_reset_password", json={"email": new_user["email"]}
+        )
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "POST /api/v1/auth/request_reset_password")
+
+
+def test_reset_password(client, round_trips):
+    token = "budget-reset-token"
+    with patch("src.services.auth.create_reset_password_token", return_value=token):
+        client.post(
+            "/api/v1/auth/request_reset_password", json={"email": new_user["email"]}
+        )
+    with round_trips.recording():
+        response = client.post(
+            f"/api/v1/auth/reset_password/?token={token}",
+            json={"new_password": new_user["password"]},
+        )
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "POST /api/v1/auth/reset_password/")
+
+
+def test_me(client, headers, round_trips):
+    with round_trips.recording():
+        response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "GET /api/v1/users/me")
+
+
+def test_create_contact(client, headers, round_trips):
+    with round_trips.recording():
+        response = client.post("/api/v1/contacts/", json=contact, headers=headers)
+    assert response.status_code == 201, response.text
+    assert_within_budget(round_trips, "POST /api/v1/contacts/")
+
+
+@pytest.mark.parametrize(
+    "endpoint, url",
+    [
+        ("GET /api/v1/contacts/", "/api/v1/contacts/"),
+        ("GET /api/v1/contacts/{contact_id}", "/api/v1/contacts/1"),
+        ("GET /api/v1/contacts/search/", "/api/v1/contacts/search/?query=Budget"),
+        ("GET /api/v1/contacts/birthdays/", "/api/v1/contacts/birthdays/?days=7"),
+        ("GET /api/v1/admin/cache", "/api/v1/admin/cache"),
+        ("GET /api/v1/admin/db-pool", "/api/v1/admin/db-pool"),
+        ("GET /api/v1/admin/loop-stalls", "/api/v1/admin/loop-stalls"),
+    ],
+)
+def test_read_endpoints(client, headers, round_trips, endpoint, url):
+    with round_trips.recording():
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, endpoint)
+
+
+@pytest.mark.parametrize(
+    "endpoint, url",
+    [
+        ("POST /api/v1/admin/profile", "/api/v1/admin/profile?seconds=0.05"),
+        ("POST /api/v1/admin/profile/memory", "/api/v1/admin/profile/memory?seconds=0.05"),
+    ],
+)
+def test_profile_endpoints(client, headers, round_trips, endpoint, url):
+    with round_trips.recording():
+        response = client.post(url, headers=headers)
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, endpoint)
+
+
+def test_update_contact(client, headers, round_trips):
+    with round_trips.recording():
+        response = client.put(
+            "/api/v1/contacts/1", json={"phone": "+380990000000"}, headers=headers
+        )
+    assert response.status_code == 200, response.text
+    assert_within_budget(round_trips, "PUT /api/v1/contacts/{contact_id}")
+
+
+def test_update_avatar(client, headers, round_trips):
+    image = io.BytesIO()
+    Image.new("RGB", (300, 300)).save(image, format="JPEG")
+    pipeline = Mock(process=AsyncMock(return_value=b"webp"))
+    app.dependency_overrides[get_avatar_pipeline] = lambda: pipeline
+    try:
+        with round_trips.recording():
+            response = client.patch(
+                "/api/v1/users/avatar",
+                headers=headers,
+                files={"file": ("avatar.jpg", image.getvalue(), "image/jpeg")},
+            )
+    finally:
+        del app.dependency_overrides[get_avatar_pipeline]
+    assert response.status_code == 202, response.text
+    pipeline.schedule_upload.assert_called_once()
+    assert response.json()["username"] == test_user["username"]
+    assert_within_budget(round_trips, "PATCH /api/v1/users/avatar")
+
+
+def test_delete_contact(client, headers, round_trips):
+    with round_trips.recording():
+        response = client.delete("/api/v1/contacts/1", headers=headers)
+    assert response.status_code == 204, response.text
+    assert_within_budget(round_trips, "DELETE /api/v1/contacts/{contact_id}")
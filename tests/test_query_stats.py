@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from src.database.db import DatabaseSessionManager
+from src.database.query_stats import QueryStats, current_query_stats, statement_shape
+
+
+def test_statement_shape_strips_values():
+    assert statement_shape("SELECT * FROM users WHERE email = 'a@b.c' AND id = 42") == (
+        "SELECT * FROM users WHERE email = ? AND id = ?"
+    )
+    assert statement_shape("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT ? FROM t WHERE id IN (?)"
+    )
+    assert statement_shape("SELECT id FROM t WHERE id IN ($1, $2)") == (
+        "SELECT id FROM t WHERE id IN (?)"
+    )
+
+
+def test_repeated_shapes_are_flagged():
+    stats = QueryStats()
+    for contact_id in range(3):
+        stats.record(f"SELECT * FROM contacts WHERE id = {contact_id}", 0.001)
+    stats.record("SELECT * FROM users WHERE id = ?", 0.001)
+
+    assert stats.count == 4
+    assert stats.repeated(3) == {"SELECT * FROM contacts WHERE id = ?": 3}
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_redacted(tmp_path, caplog, monkeypatch):
+    monkeypatch.setattr("src.database.instrumentation.settings.SLOW_QUERY_THRESHOLD_MS", 0)
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'q.db'}")
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        async with manager.session() as session:
+            await session.execute(text("SELECT 'secret-value'"))
+
+    current_query_stats.reset(token)
+    await manager.engine.dispose()
+    assert stats.count == 1
+    assert "Slow query" in caplog.text
+    assert "secret-value" not in caplog.text
+
+
+def test_server_timing_header(client, get_token):
+    response = client.get(
+        "/api/v1/contacts/", headers={"Authorization": f"Bearer {get_token}"}
+    )
+
+    assert response.status_code == 200
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("db;dur=")
+    assert "queries" in server_timing
+    assert 'desc="0 queries"' not in server_timing
+
+
+def test_n_plus_one_is_logged(client, get_token, caplog, monkeypatch):
+    monkeypatch.setattr("src.middleware.query_stats.settings.QUERY_REPEAT_THRESHOLD", 1)
+
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        client.get("/api/v1/contacts/", headers={"Authorization": f"Bearer {get_token}"})
+
+    assert "Possible N+1 on GET /api/v1/contacts/" in caplog.text
@@ -0,0 +1,191 @@
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from conftest import TestingSessionLocal, test_user
+from src.database.db import DatabaseSessionManager
+from src.database.replicas import ReplicaRouter, parse_replica_urls
+from src.entity.models import Base, Contact, User
+from src.services.auth import AuthService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_replica(path) -> DatabaseSessionManager:
+    return DatabaseSessionManager(f"sqlite+aiosqlite:///{path}")
+
+
+@pytest.fixture
+def replica_db(tmp_path):
+    manager = make_replica(tmp_path / "replica.db")
+
+    async def init():
+        async with manager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with manager.session() as session:
+            user = User(id=1, username="replica", email="r@example.com", hashed_password="x")
+            session.add(user)
+            session.add(
+                Contact(
+                    first_name="Replica",
+                    last_name="Only",
+                    email="replica@example.com",
+                    phone="123",
+                    birthday=date(1990, 1, 1),
+                    user_id=1,
+                )
+            )
+            await session.commit()
+
+    asyncio.run(init())
+    yield manager
+    asyncio.run(manager.engine.dispose())
+
+
+def test_parse_replica_urls():
+    assert parse_replica_urls("") == []
+    assert parse_replica_urls(" a, b ,") == ["a", "b"]
+
+
+def test_round_robin(tmp_path):
+    router = ReplicaRouter([make_replica(tmp_path / "a.db"), make_replica(tmp_path / "b.db")])
+
+    assert [router.choose() for _ in range(4)] == [0, 1, 0, 1]
+
+
+def test_read_your_writes_window(tmp_path):
+    clock = FakeClock()
+    router = ReplicaRouter(
+        [make_replica(tmp_path / "a.db")], read_your_writes_seconds=5, clock=clock
+    )
+
+    router.mark_write(7)
+
+    assert router.choose(7) is None
+    assert router.choose(8) == 0
+    clock.now = 5
+    assert router.choose(7) == 0
+
+
+def test_no_replicas_reads_primary():
+    assert ReplicaRouter([]).choose(1) is None
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary(tmp_path):
+    clock = FakeClock()
+    router = ReplicaRouter(
+        [make_replica(tmp_path / "missing" / "a.db")], retry_seconds=30, clock=clock
+    )
+
+    index = router.choose()
+    with pytest.raises(Exception):
+        async with router.session(index) as session:
+            await session.execute(text("SELECT 1"))
+
+    assert router.choose() is None
+    clock.now = 30
+    assert router.choose() == 0
+
+
+@pytest.mark.asyncio
+async def test_route_error_during_trial_does_not_wedge_replica(replica_db):
+    clock = FakeClock()
+    router = ReplicaRouter([replica_db], retry_seconds=30, clock=clock)
+    router.breakers[0].record_failure()
+    clock.now = 30
+
+    index = router.choose()
+    with pytest.raises(HTTPException):
+        async with router.session(index):
+            raise HTTPException(status_code=404)
+    assert router.choose() == 0
+
+    async with router.session(0) as session:
+        await session.execute(text("SELECT 1"))
+    assert router.breakers[0].state.value == "closed"
+
+
+def test_get_routes_read_from_replica(client, get_token, replica_db):
+    router = ReplicaRouter([replica_db], read_your_writes_seconds=60)
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    with patch("src.utils.get_services.replica_router", router), patch(
+        "src.services.contacts.replica_router", router
+    ):
+        response = client.get("/api/v1/contacts/", headers=headers)
+        assert response.status_code == 200, response.text
+        assert [c["first_name"] for c in response.json()] == ["Replica"]
+
+        response = client.post(
+            "/api/v1/contacts/",
+            json={
+                "first_name": "Primary",
+                "last_name": "Write",
+                "email": "primary@example.com",
+                "phone": "456",
+                "birthday": "1991-02-02",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+
+        response = client.get("/api/v1/contacts/", headers=headers)
+        assert response.status_code == 200, response.text
+        assert "Primary" in [c["first_name"] for c in response.json()]
+        assert "Replica" not in [c["first_name"] for c in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_user_lookup_reads_primary_within_write_window(replica_db):
+    router = ReplicaRouter([replica_db], read_your_writes_seconds=60)
+    async with TestingSessionLocal() as session:
+        auth_service = AuthService(session, router)
+        token = await auth_service.create_acces_token("replica", user_id=1)
+
+        # only the replica has this user
+        user = await auth_service.get_current_user(token)
+        assert user.email == "r@example.com"
+
+        await auth_service.invalidate_cached_user("replica")
+        router.mark_write(1)
+        with pytest.raises(HTTPException) as exc:
+            await auth_service.get_current_user(token)
+    assert exc.value.status_code == 401
+
+
+def test_dead_replica_read_is_served_by_primary(client, get_token, tmp_path):
+    router = ReplicaRouter([make_replica(tmp_path / "missing" / "dead.db")])
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    with patch("src.utils.get_services.replica_router", router):
+        response = client.get("/api/v1/contacts/", headers=headers)
+
+    assert response.status_code == 200, response.text
+    # the failed connection was reported, so the replica is now skipped
+    assert router.choose() is None
+
+
+@pytest.mark.asyncio
+async def test_user_lookup_falls_back_when_replica_is_dead(tmp_path):
+    router = ReplicaRouter([make_replica(tmp_path / "missing" / "dead.db")])
+    async with TestingSessionLocal() as session:
+        auth_service = AuthService(session, router)
+        user = await auth_service.user_repository.get_by_username(test_user["username"])
+        token = await auth_service.create_acces_token(user.username, user_id=user.id)
+        await auth_service.invalidate_cached_user(user.username)
+
+        current = await auth_service.get_current_user(token)
+
+    assert current.email == test_user["email"]
+    assert router.choose() is None
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from benchmarks.seed_data import DatasetGenerator, seed
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_generator_is_deterministic_by_seed():
+    first = DatasetGenerator(7, NOW)
+    second = DatasetGenerator(7, NOW)
+    other = DatasetGenerator(8, NOW)
+
+    assert list(first.contacts([1, 2], 5)) == list(second.contacts([1, 2], 5))
+    assert list(first.refresh_tokens([1], 5)) == list(second.refresh_tokens([1], 5))
+    assert list(first.contacts([1], 5)) != list(other.contacts([1], 5))
+
+
+def test_refresh_tokens_mix_active_expired_and_revoked():
+    tokens = list(DatasetGenerator(1, NOW).refresh_tokens([1], 1000))
+
+    active = [t for t in tokens if t["expired_at"] > NOW and t["revoked_at"] is None]
+    expired = [t for t in tokens if t["expired_at"] <= NOW]
+    revoked = [t for t in tokens if t["revoked_at"] is not None]
+
+    assert active and expired and revoked
+    assert len({t["token_hash"] for t in tokens}) == len(tokens)
+
+
+@pytest.mark.asyncio
+async def test_seed_inserts_requested_rows(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'seed.db'}"
+
+    counts = await seed(
+        url,
+        users=3,
+        contacts_per_user=4,
+        tokens_per_user=2,
+        seed_value=1,
+        now=NOW,
+        batch_size=5,
+        create_tables=True,
+    )
+
+    assert counts == {"users": 3, "contacts": 12, "refresh_tokens": 6}
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, inspect, select
+
+from conftest import TestingSessionLocal, engine, test_user
+from src.entity.models import Contact, User
+from src.schemas.contact import BaseContact
+from src.services.auth import AuthService
+from src.services.contacts import ContactsService
+from src.utils.single_flight import SingleFlight, read_flights
+
+
+class SlowRead:
+    def __init__(self, results=None):
+        self.calls = 0
+        self.results = results or []
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return self.results.pop(0) if self.results else call
+
+
+@pytest.mark.asyncio
+async def test_identical_reads_share_one_execution():
+    flights = SingleFlight()
+    read = SlowRead()
+
+    tasks = [
+        asyncio.create_task(flights.do(1, "contacts", (10, 0), read)) for _ in range(5)
+    ]
+    other = asyncio.create_task(flights.do(1, "contacts", (20, 0), read))
+    await asyncio.sleep(0)
+    read.release.set()
+
+    assert await asyncio.gather(*tasks) == [1] * 5
+    assert await other == 2
+    assert read.calls == 2
+    assert flights._calls == {}
+
+
+@pytest.mark.asyncio
+async def test_forget_detaches_reads_started_before_a_write():
+    flights = SingleFlight()
+    read = SlowRead(results=["before", "after"])
+
+    stale = asyncio.create_task(flights.do(1, "contacts", (), read))
+    await asyncio.sleep(0)
+    flights.forget(1)
+    fresh = asyncio.create_task(flights.do(1, "contacts", (), read))
+    await asyncio.sleep(0)
+    read.release.set()
+
+    assert await stale == "before"
+    assert await fresh == "after"
+    assert flights._calls == {}
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_followers_and_cancelled_leader_is_replaced():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flights.do(1, "me", (), failing),
+        flights.do(1, "me", (), failing),
+        return_exceptions=True,
+    )
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+    read = SlowRead()
+    leader = asyncio.create_task(flights.do(1, "me", (), read))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do(1, "me", (), read))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    read.release.set()
+
+    assert await follower == 2
+    assert leader.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_parallel_contact_lists_issue_one_query_until_a_write():
+    async with TestingSessionLocal() as session:
+        user = (
+            await session.execute(select(User).filter_by(username=test_user["username"]))
+        ).scalar_one()
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+
+    async def list_contacts():
+        async with TestingSessionLocal() as session:
+            return await ContactsService(session).get_contacts(10, 0, user)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        results = await asyncio.gather(*(list_contacts() for _ in range(5)))
+        selects = len(statements)
+        async with TestingSessionLocal() as session:
+            await ContactsService(session).create_contact(
+                BaseContact(
+                    first_name="Single",
+                    last_name="Flight",
+                    email="single_flight@example.com",
+                    phone="+380991112200",
+                    birthday="1990-05-05",
+                ),
+                user,
+            )
+        after_write, shared = await asyncio.gather(list_contacts(), list_contacts())
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+    assert selects == 1
+    assert all(result == results[0] for result in results)
+    # Each request gets its own detached copies, not the leader's ORM rows
+    assert after_write == shared
+    assert after_write[0] is not shared[0]
+    assert not any(isinstance(contact, Contact) for contact in after_write)
+    assert "single_flight@example.com" in [contact.email for contact in after_write]
+    assert read_flights._calls == {}
+
+
+@pytest.mark.asyncio
+async def test_parallel_user_lookups_get_their_own_transient_user():
+    async with TestingSessionLocal() as session:
+        auth_service = AuthService(session)
+        token = await auth_service.create_acces_token(test_user["username"])
+        await auth_service.invalidate_cached_user(test_user["username"])
+
+    async def current_user():
+        async with TestingSessionLocal() as session:
+            return await AuthService(session).get_current_user(token)
+
+    first, second = await asyncio.gather(current_user(), current_user())
+
+    assert first.username == second.username == test_user["username"]
+    assert first is not second
+    assert inspect(first).transient and inspect(second).transient
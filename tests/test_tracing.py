@@ -0,0 +1,78 @@
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from conftest import test_user
+from src.utils.tracing import REDACTED, scrub
+
+exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tracer_provider():
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    yield provider
+
+
+@pytest.fixture
+def spans():
+    exporter.clear()
+    yield exporter
+    exporter.clear()
+
+
+def test_scrub():
+    assert scrub("arg.email", "user@example.com") == REDACTED
+    assert scrub("arg.token_hash", "abc") == REDACTED
+    assert scrub("arg.refresh_token", "abc") == REDACTED
+    assert scrub("arg.query", "ping me at user@example.com") == REDACTED
+    assert scrub("arg.query", "aaa.bbb.ccc") == REDACTED
+    assert scrub("arg.contact_id", 5) == 5
+    assert scrub("arg.query", "Anna") == "Anna"
+
+
+def test_request_spans_cover_auth_service_and_repository(client, get_token, spans):
+    trace_id = "0af7651916cd43dd8448eb211c80319c"
+    response = client.get(
+        "/api/v1/contacts/?limit=7",
+        headers={
+            "Authorization": f"Bearer {get_token}",
+            "traceparent": f"00-{trace_id}-b7ad6b7169203331-01",
+        },
+    )
+    assert response.status_code == 200, response.text
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    server = finished["GET /api/v1/contacts/"]
+    assert format(server.context.trace_id, "032x") == trace_id
+    assert server.attributes["http.route"] == "/api/v1/contacts/"
+    assert server.attributes["http.response.status_code"] == 200
+    assert "AuthService.get_current_user" in finished
+    assert finished["ContactsService.get_contacts"].attributes["arg.limit"] == 7
+    repository = finished["ContactsRepository.get_contacts"]
+    assert repository.parent.span_id == finished["ContactsService.get_contacts"].context.span_id
+    assert all(
+        format(span.context.trace_id, "032x") == trace_id for span in finished.values()
+    )
+
+
+def test_span_attributes_are_scrubbed(client, spans):
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user["username"], "password": test_user["password"]},
+    )
+    assert response.status_code == 200, response.text
+
+    finished = spans.get_finished_spans()
+    names = {span.name for span in finished}
+    assert {"AuthService.authenticate", "AuthService.verify_password"} <= names
+    lookup = next(span for span in finished if span.name == "UserRepository.get_by_username")
+    assert lookup.attributes["arg.username"] == REDACTED
+    for span in finished:
+        for value in span.attributes.values():
+            assert test_user["password"] != value
+            assert test_user["email"] != value
@@ -60,30 +60,48 @@ async def test_create_user(user_repository, mock_session):
         avatar=avatar
     )
 
-    user_repository.create = AsyncMock(return_value=mock_user)
+    mock_result = MagicMock()
+    mock_result.scalar_one.return_value = mock_user
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     result = await user_repository.create_user(user_data, hashed_password, avatar)
 
     assert result == mock_user
-    user_repository.create.assert_called_once()
+    [stmt], _ = mock_session.execute.call_args
+    assert str(stmt).startswith("INSERT INTO users") and "RETURNING" in str(stmt)
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_confirmed_email(user_repository, mock_session, test_user):
-    user_repository.get_by_email = AsyncMock(return_value=test_user)
+async def test_confirmed_email(user_repository, mock_session):
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = (1, "testuser", "test@example.com")
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
-    await user_repository.confirmed_email(test_user.email)
+    result = await user_repository.confirmed_email("test@example.com")
 
-    assert test_user.confirmed is True
+    assert result == (1, "testuser", "test@example.com")
+    [stmt], _ = mock_session.execute.call_args
+    sql = str(stmt)
+    assert sql.startswith("UPDATE users SET confirmed=")
+    assert "users.confirmed IS NOT" in sql and "RETURNING" in sql
+    mock_session.execute.assert_called_once()
     mock_session.commit.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_change_password(user_repository, mock_session, test_user):
-    user_repository.get_by_email = AsyncMock(return_value=test_user)
+async def test_change_password(user_repository, mock_session):
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = None
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
-    await user_repository.change_password(test_user.email, "new_hashed_pwd")
+    result = await user_repository.change_password(42, "new_hashed_pwd")
 
-    assert test_user.hashed_password == "new_hashed_pwd"
-    assert test_user.reset_password_token is None
+    assert result is None
+    [stmt], _ = mock_session.execute.call_args
+    params = stmt.compile().params
+    assert params["hashed_password"] == "new_hashed_pwd"
+    assert params["id_1"] == 42
+    mock_session.execute.assert_called_once()
     mock_session.commit.assert_called_once()